@@ -31,6 +31,9 @@ setup(
     long_description_content_type='text/markdown',
     install_requires=requirements(filename="requirements.txt"),
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['trendet = trendet.cli:main']
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Programming Language :: Python :: 3 :: Only",
@@ -51,7 +54,10 @@ setup(
     python_requires='>=3',
     extras_require={
         "tests": requirements(filename='tests/requirements.txt'),
-        "docs": requirements(filename='docs/requirements.txt')
+        "docs": requirements(filename='docs/requirements.txt'),
+        "dask": ["dask[dataframe]"],
+        "arrow": ["pyarrow"],
+        "numba": ["numba"]
     },
     project_urls={
         'Bug Reports': 'https://github.com/alvarobartt/trendet/issues',
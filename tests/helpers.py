@@ -0,0 +1,17 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+import pandas as pd
+
+
+def random_walk(size, seed=0):
+    """
+    This function generates a random walk `pandas.DataFrame` with a daily `DatetimeIndex` for offline testing.
+    """
+
+    rng = np.random.RandomState(seed)
+
+    values = 100 + np.cumsum(rng.normal(size=size))
+
+    return pd.DataFrame({'Close': values}, index=pd.date_range('2000-01-01', periods=size, freq='D'))
@@ -0,0 +1,334 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+from trendet.identification import _identify
+from trendet.utils import select_trends
+
+
+def test_array_trends(tmp_path):
+    """
+    This function checks that trends identified from memory-mapped arrays match the `pandas.DataFrame` ones.
+    """
+
+    rng = np.random.RandomState(1)
+
+    values = 100 + np.cumsum(rng.normal(size=2000))
+    dates = pd.date_range('2000-01-01', periods=values.size, freq='D').to_numpy()
+
+    np.save(tmp_path / 'close.npy', values)
+
+    mapped = np.load(tmp_path / 'close.npy', mmap_mode='r')
+
+    df = trendet.identify_df_trends(df=pd.DataFrame({'Close': values}, index=dates),
+                                    column='Close',
+                                    window_size=5,
+                                    identify='both')
+
+    for params in [{'dates': dates}, {'dates': None}]:
+        trends = trendet.identify_array_trends(mapped, window_size=5, identify='both', **params)
+
+        for name in ['Up Trend', 'Down Trend']:
+            assert trends[name].shape[1] == 2
+            assert len(trends[name]) > 0
+
+        if params['dates'] is not None:
+            for name in ['Up Trend', 'Down Trend']:
+                labeled = np.flatnonzero(df[name].notna().to_numpy())
+                expected = np.concatenate([np.arange(start, end + 1) for start, end in trends[name]])
+
+                assert np.array_equal(labeled, expected)
+
+    trends = trendet.identify_array_trends(mapped, identify='up')
+
+    assert list(trends.keys()) == ['Up Trend']
+
+
+def test_array_trends_ends():
+    """
+    This function checks that the ends of the trends which the scan places beyond the values are clamped to the last
+    value, both by `identify_array_trends` and by the rest of the functions returning trend positions.
+    """
+
+    values = np.cumsum(np.random.RandomState(0).randint(-2, 3, size=120)).astype(np.int64)
+
+    expected = trendet.identify_array_trends(values, window_size=7)
+
+    assert np.array_equal(expected['Down Trend'][-1], [102, 119])
+    assert all((positions < len(values)).all() for positions in expected.values())
+
+    df = trendet.identify_df_trends(df=pd.DataFrame({'Close': values}), column='Close', window_size=7)
+
+    for name in expected:
+        labeled = np.flatnonzero(df[name].notna().to_numpy())
+
+        assert np.array_equal(labeled, np.concatenate([np.arange(start, end + 1) for start, end in expected[name]]))
+
+    results = [
+        trendet.identify_chunked_trends(values, window_size=7, chunk_size=50, processes=1),
+        trendet.identify_panel_trends(pd.DataFrame({'Close': values}), window_size=7, workers=1)['Close'],
+    ]
+
+    for result in results:
+        for name in expected:
+            assert np.array_equal(result[name], expected[name])
+
+    for rank_by in ['length', 'move', 'percentage']:
+        df = _identify(pd.DataFrame({'Close': values}), 'Close', window_size=7, identify='down', trend_limit=1,
+                       rank_by=rank_by)
+
+        (start, end), = select_trends(expected['Down Trend'].tolist(), values, limit=1, rank_by=rank_by)
+
+        assert np.array_equal(np.flatnonzero(df['Down Trend'].notna().to_numpy()), np.arange(start, end + 1))
+
+    df = pd.DataFrame({'Close': values}, index=pd.date_range('2000-01-01', periods=len(values), freq='h'))
+    df = trendet.identify_timeframe_trends(df=df, column='Close', timeframes=['1h'], window_size=7, identify='down')
+
+    assert df['1h Down Trend'].iloc[-1] == 'B'
+
+
+def test_array_trends_overlaps():
+    """
+    This function checks that trends ending beyond the values are clamped before removing the overlapping ones, so
+    that their durations can be measured in days and every function returning trend positions agrees on them.
+    """
+
+    values = np.array([-0., -2, -4, -3, -3, -2, -2, -2, -3, -3, -3, -4, -4, -3, -3, -3, -2, -4, -4])
+    dates = pd.date_range('2000-01-01', periods=len(values), freq='D')
+
+    expected = {'Up Trend': [[4, 6], [12, 16]], 'Down Trend': [[1, 3]]}
+
+    results = [
+        trendet.identify_array_trends(values, window_size=3),
+        trendet.identify_array_trends(values, dates=dates.to_numpy(), window_size=3),
+        trendet.identify_chunked_trends(values, dates=dates.to_numpy(), window_size=3, chunk_size=5, processes=1),
+    ]
+
+    for result in results:
+        assert {name: positions.tolist() for name, positions in result.items()} == expected
+
+    for index in [pd.RangeIndex(len(values)), dates]:
+        df = trendet.identify_df_trends(df=pd.DataFrame({'Close': values}, index=index), column='Close',
+                                        window_size=3)
+
+        for name in expected:
+            labeled = np.flatnonzero(df[name].notna().to_numpy())
+
+            assert labeled.tolist() == [position for start, end in expected[name] for position in range(start, end + 1)]
+
+    df = trendet.identify_walk_forward_trends(values, len(values), dates=dates.to_numpy(), window_size=3)
+
+    for name in expected:
+        assert df[df['trend'] == name][['from', 'to']].to_numpy().tolist() == expected[name]
+
+
+def test_array_trends_unsigned():
+    """
+    This function checks that unsigned values identify the same trends as the same signed ones, since negating them
+    to identify the up trends must not wrap them around.
+    """
+
+    values = 1000 + np.cumsum(np.random.RandomState(0).randint(-2, 3, size=300))
+
+    expected = trendet.identify_array_trends(values.astype(np.int64))
+
+    assert len(expected['Up Trend']) > 0
+
+    for dtype in [np.uint16, np.uint32, np.uint64]:
+        unsigned = values.astype(dtype)
+
+        results = [
+            trendet.identify_array_trends(unsigned),
+            trendet.identify_chunked_trends(unsigned, chunk_size=64, processes=1),
+        ]
+
+        for result in results:
+            for name in expected:
+                assert np.array_equal(result[name], expected[name])
+
+        assert list(trendet.iter_trends(unsigned)) == list(trendet.iter_trends(values.astype(np.int64)))
+
+
+def test_array_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    params = [
+        {'values': None},
+        {'values': [1., 2., 3.]},
+        {'values': np.zeros((3, 3))},
+        {'values': np.array(['error'])},
+        {'values': np.zeros(3), 'dates': np.zeros(3)},
+        {'values': np.zeros(3), 'dates': np.array(['2000-01-01'], dtype='datetime64[D]')},
+        {'values': np.zeros(3), 'window_size': 1},
+        {'values': np.zeros(3), 'window_size': 'error'},
+        {'values': np.zeros(3), 'identify': 'error'},
+        {'values': np.zeros(3), 'output': 'error'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.identify_array_trends(**param)
+
+
+def test_arrow_trends():
+    """
+    This function checks that trends identified from Arrow arrays, Polars series and Arrow-backed or nullable
+    `pandas.Series` match the `numpy.ndarray` ones, and that they can be returned as a `pyarrow.Table`.
+    """
+
+    pa = pytest.importorskip('pyarrow')
+
+    rng = np.random.RandomState(4)
+
+    values = 100 + np.cumsum(rng.normal(size=1000))
+    dates = pd.date_range('2000-01-01', periods=values.size, freq='D').to_numpy()
+
+    expected = trendet.identify_array_trends(values, dates=dates)
+
+    inputs = [
+        pa.array(values),
+        pa.chunked_array([values[:300], values[300:]]),
+        pd.Series(values, dtype='float64[pyarrow]'),
+        pd.Series(values, dtype='Float64'),
+    ]
+
+    try:
+        import polars as pl
+        inputs.append(pl.Series(values))
+    except ImportError:
+        pass
+
+    for array in inputs:
+        result = trendet.identify_array_trends(array, dates=pa.array(dates))
+
+        for name in expected:
+            assert np.array_equal(result[name], expected[name])
+
+    df = pd.DataFrame({'Close': pd.Series(values, index=dates, dtype='float64[pyarrow]')})
+    df = trendet.identify_df_trends(df=df, column='Close')
+
+    for name in expected:
+        labeled = np.flatnonzero(df[name].notna().to_numpy())
+
+        assert np.array_equal(labeled, np.concatenate([np.arange(start, end + 1) for start, end in expected[name]]))
+
+    table = trendet.identify_array_trends(pa.array(values), dates=dates, output='arrow')
+
+    assert table.column_names == ['trend', 'from', 'to', 'from_date', 'to_date']
+    assert table.num_rows == sum(len(positions) for positions in expected.values())
+
+    with pytest.raises(ValueError):
+        trendet.identify_array_trends(pa.array([1., None, 3.]))
+
+    with pytest.raises(ValueError):
+        trendet.identify_df_trends(df=pd.DataFrame({'Close': pd.Series([1., None, 3.], dtype='Float64')}),
+                                   column='Close')
+
+
+def test_arrow_columns():
+    """
+    This function checks that every function validating the columns of a `pandas.DataFrame` supports Arrow-backed and
+    nullable columns, identifying the same trends as over their `numpy.ndarray` values, and rejects the null ones.
+    """
+
+    pytest.importorskip('pyarrow')
+
+    rng = np.random.RandomState(32)
+
+    values = {column: 100 + np.cumsum(rng.normal(size=600)) for column in ['Open', 'High', 'Low', 'Close']}
+    index = pd.date_range('2000-01-01', periods=600, freq='h')
+
+    df = pd.DataFrame(values, index=index)
+
+    expected = {
+        'ohlc': trendet.identify_ohlc_trends(df=df.copy(), window_size=4),
+        'timeframes': trendet.identify_timeframe_trends(df=df.copy(), column='Close', timeframes=['2h', '1D'],
+                                                        window_size=3),
+        'panel': trendet.identify_panel_trends(df, window_size=4, workers=1),
+    }
+
+    for dtype in ['float64[pyarrow]', 'Float64']:
+        other = df.astype(dtype)
+
+        result = trendet.identify_ohlc_trends(df=other.copy(), window_size=4)
+        pd.testing.assert_frame_equal(result.drop(columns=list(values)), expected['ohlc'].drop(columns=list(values)))
+
+        result = trendet.identify_timeframe_trends(df=other.copy(), column='Close', timeframes=['2h', '1D'],
+                                                   window_size=3)
+        pd.testing.assert_frame_equal(result.drop(columns=list(values)),
+                                      expected['timeframes'].drop(columns=list(values)))
+
+        for params in [{'workers': 1}, {'processes': 1}]:
+            result = trendet.identify_panel_trends(other, window_size=4, **params)
+
+            for column in values:
+                for name in expected['panel'][column]:
+                    assert np.array_equal(result[column][name], expected['panel'][column][name])
+
+        try:
+            import dask.dataframe as dd
+        except ImportError:
+            continue
+
+        result = trendet.identify_dask_trends(dd.from_pandas(other, npartitions=3), column='Close', window_size=4)
+
+        for name in result:
+            assert np.array_equal(result[name], expected['panel']['Close'][name])
+
+    nulls = df.astype('Float64')
+    nulls.iloc[10, 0] = None
+
+    with pytest.raises(ValueError):
+        trendet.identify_ohlc_trends(df=nulls)
+
+    with pytest.raises(ValueError):
+        trendet.identify_panel_trends(nulls, workers=1)
+
+
+def test_unsigned_columns():
+    """
+    This function checks that unsigned columns, including the nullable and Arrow-backed ones, identify the same
+    trends as the same signed column.
+    """
+
+    rng = np.random.RandomState(33)
+
+    df = pd.DataFrame({column: 1000 + np.cumsum(rng.randint(-2, 3, size=400)) for column in ['Open', 'Close']})
+
+    expected = {
+        'df': trendet.identify_df_trends(df=df.copy(), column='Close', window_size=4),
+        'ohlc': trendet.identify_ohlc_trends(df=df.copy(), columns=['Open', 'Close'], window_size=4),
+    }
+
+    dtypes = ['uint32', 'UInt32']
+
+    if importlib.util.find_spec('pyarrow') is not None:
+        dtypes.append('uint32[pyarrow]')
+
+    for dtype in dtypes:
+        other = df.astype(dtype)
+
+        result = trendet.identify_df_trends(df=other.copy(), column='Close', window_size=4)
+        pd.testing.assert_frame_equal(result.drop(columns=list(df)), expected['df'].drop(columns=list(df)))
+
+        result = trendet.identify_ohlc_trends(df=other.copy(), columns=['Open', 'Close'], window_size=4)
+        pd.testing.assert_frame_equal(result.drop(columns=list(df)), expected['ohlc'].drop(columns=list(df)))
+
+
+if __name__ == '__main__':
+    test_array_trends_ends()
+    test_array_trends_overlaps()
+    test_array_trends_unsigned()
+    test_array_errors()
+    test_arrow_columns()
+    test_unsigned_columns()
@@ -0,0 +1,105 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def dense_breadth(frames, calendar):
+    """
+    This function computes the breadth stacking the label columns of every labeled dataframe over the calendar.
+    """
+
+    counts = {name: np.zeros(len(calendar), dtype=np.int64) for name in ['Up Trend', 'Down Trend']}
+
+    for df in frames.values():
+        for name in counts:
+            if name in df.columns:
+                labeled = df[name].notna().reindex(calendar, fill_value=False)
+
+                counts[name] += labeled.to_numpy().astype(np.int64)
+
+    return counts
+
+
+def test_breadth():
+    """
+    This function checks that the breadth built from the trend boundaries matches the one of stacked label columns,
+    also when series are updated and the calendar is extended.
+    """
+
+    rng = np.random.RandomState(19)
+
+    calendar = pd.date_range('2018-01-01', periods=600, freq='D')
+
+    closes = dict()
+
+    for number in range(15):
+        start = rng.randint(0, 100)
+        end = rng.randint(500, 600)
+
+        closes['stock' + str(number)] = pd.Series(100 + np.cumsum(rng.normal(size=end - start)),
+                                                  index=calendar[start:end])
+
+    def identify(closes, until):
+        frames, trends, dates = dict(), dict(), dict()
+
+        for name, close in closes.items():
+            close = close[close.index < until]
+
+            frames[name] = trendet.identify_df_trends(df=close.to_frame('Close'), column='Close')
+            trends[name] = trendet.identify_array_trends(close.to_numpy(), dates=close.index.to_numpy())
+            dates[name] = close.index.to_numpy()
+
+        return frames, trends, dates
+
+    frames, trends, dates = identify(closes, calendar[450])
+
+    breadth = trendet.TrendBreadth.from_trends(trends, dates, calendar=calendar[:450].to_numpy())
+
+    expected = dense_breadth(frames, pd.DatetimeIndex(breadth.calendar))
+
+    result = breadth.breadth()
+
+    assert np.array_equal(result['Up Trend'], expected['Up Trend'])
+    assert np.array_equal(result['Down Trend'], expected['Down Trend'])
+    assert np.array_equal(result['Breadth'], expected['Up Trend'] - expected['Down Trend'])
+
+    union = np.unique(np.concatenate(list(dates.values()))).astype('datetime64[ns]')
+
+    assert np.array_equal(trendet.TrendBreadth.from_trends(trends, dates).calendar, union)
+
+    breadth.extend(calendar[450:].to_numpy())
+
+    frames, trends, dates = identify(closes, calendar[-1] + pd.Timedelta(days=1))
+
+    for name in trends:
+        breadth.update(name, trends[name], dates[name])
+
+    breadth.remove('stock0')
+    del frames['stock0']
+
+    expected = dense_breadth(frames, calendar)
+
+    result = breadth.breadth()
+
+    assert result.index.equals(pd.DatetimeIndex(calendar, name='Date'))
+    assert np.array_equal(result['Up Trend'], expected['Up Trend'])
+    assert np.array_equal(result['Down Trend'], expected['Down Trend'])
+
+    with pytest.raises(ValueError):
+        breadth.extend(calendar[:5].to_numpy())
+
+    with pytest.raises(ValueError):
+        breadth.update('stock1', {'Sideways': np.array([[0, 5]])}, dates['stock1'])
+
+    with pytest.raises(ValueError):
+        trendet.TrendBreadth(calendar[::-1].to_numpy())
+
+
+if __name__ == '__main__':
+    test_breadth()
@@ -0,0 +1,122 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_cache(tmp_path):
+    """
+    This function checks that identified trends are memoized both in memory and on disk.
+    """
+
+    rng = np.random.RandomState(2)
+
+    df = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=1000))},
+                      index=pd.date_range('2000-01-01', periods=1000, freq='D'))
+
+    expected = trendet.identify_df_trends(df=df.copy(), column='Close')
+
+    cache = trendet.TrendCache(maxsize=2, directory=str(tmp_path))
+
+    for _ in range(3):
+        result = trendet.identify_df_trends(df=df.copy(), column='Close', cache=cache)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    assert cache.stats == {'hits': 2, 'disk_hits': 0, 'misses': 1, 'size': 1}
+
+    for window_size in [3, 4, 6]:
+        trendet.identify_df_trends(df=df.copy(), column='Close', window_size=window_size, cache=cache)
+
+    assert cache.stats['size'] == 2
+
+    cache = trendet.TrendCache(directory=str(tmp_path))
+
+    result = trendet.identify_df_trends(df=df.copy(), column='Close', cache=cache)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+    assert cache.stats['disk_hits'] == 1
+
+    other = df.copy()
+    other.iloc[0, 0] += 1
+
+    assert cache.key(other['Close'].to_numpy(), other.index) != cache.key(df['Close'].to_numpy(), df.index)
+
+    aware = df.tz_localize('America/New_York')
+
+    cache = trendet.TrendCache()
+
+    for _ in range(2):
+        result = trendet.identify_df_trends(df=aware.copy(), column='Close', cache=cache)
+
+        pd.testing.assert_frame_equal(result, expected.tz_localize('America/New_York'))
+
+    assert cache.stats['hits'] == 1
+    assert cache.key(df['Close'].to_numpy(), aware.index) != cache.key(df['Close'].to_numpy(), df.index)
+    assert cache.key(df['Close'].to_numpy(), aware.index) != \
+        cache.key(df['Close'].to_numpy(), df.tz_localize('UTC').index)
+
+
+def test_cache_labels():
+    """
+    This function checks that the label columns are memoized along with the trends, so that a hit returns the same
+    labels without building them again, even if a previous result was modified.
+    """
+
+    rng = np.random.RandomState(5)
+
+    df = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=1000))},
+                      index=pd.date_range('2000-01-01', periods=1000, freq='D'))
+
+    expected = trendet.identify_df_trends(df=df.copy(), column='Close')
+
+    cache = trendet.TrendCache(maxsize=1)
+
+    key = cache.key(df['Close'].to_numpy(), df.index, window_size=5, identify='both', engine='fast')
+
+    result = trendet.identify_df_trends(df=df.copy(), column='Close', cache=cache)
+
+    assert set(cache.get_labels(key)) == {'Up Trend', 'Down Trend'}
+
+    result.iloc[:10, 1] = 'error'
+
+    for _ in range(2):
+        result = trendet.identify_df_trends(df=df.copy(), column='Close', cache=cache)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    labeled = df.copy()
+    labeled['Up Trend'] = 'error'
+
+    result = trendet.identify_df_trends(df=labeled, column='Close', cache=cache)
+
+    assert (result['Up Trend'].dropna() == 'error').any()
+    pd.testing.assert_series_equal(result['Down Trend'], expected['Down Trend'])
+
+    trendet.identify_df_trends(df=df.copy(), column='Close', window_size=3, cache=cache)
+
+    assert cache.get_labels(key) is None
+
+
+def test_cache_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    for param in [{'maxsize': 0}, {'maxsize': 'error'}, {'directory': ['error']}]:
+        with pytest.raises(ValueError):
+            trendet.TrendCache(**param)
+
+    with pytest.raises(ValueError):
+        trendet.identify_df_trends(df=pd.DataFrame({'Close': [1., 2., 3.]}), column='Close', cache='error')
+
+
+if __name__ == '__main__':
+    test_cache_labels()
+    test_cache_errors()
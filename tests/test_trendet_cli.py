@@ -0,0 +1,153 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+from trendet.cli import find_files, main, run
+
+
+def test_cli(tmp_path):
+    """
+    This function checks that the `trendet` command identifies the trends of a directory of files into a single
+    Parquet table, and that it skips the files already done when resumed.
+    """
+
+    pytest.importorskip('pyarrow')
+
+    rng = np.random.RandomState(5)
+
+    expected = dict()
+
+    for number in range(4):
+        df = pd.DataFrame({
+            'Date': pd.date_range('2000-01-01', periods=500, freq='D'),
+            'Close': 100 + np.cumsum(rng.normal(size=500)),
+        })
+
+        name = 'stock' + str(number)
+
+        if number % 2 == 0:
+            df.to_csv(str(tmp_path / (name + '.csv')), index=False)
+        else:
+            df.to_parquet(str(tmp_path / (name + '.parquet')), index=False)
+
+        expected[name] = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df['Date'].to_numpy())
+
+    output = str(tmp_path / 'out' / 'trends.parquet')
+
+    os.makedirs(os.path.dirname(output))
+
+    assert main([str(tmp_path), '-o', output, '-p', '2']) == 0
+
+    trends = pd.read_parquet(output)
+
+    assert set(trends['series']) == set(expected.keys())
+
+    for name, positions in expected.items():
+        for trend, values in positions.items():
+            rows = trends[(trends['series'] == name) & (trends['trend'] == trend)]
+
+            assert np.array_equal(rows[['from', 'to']].to_numpy(), values)
+
+    os.remove(output)
+
+    assert main([str(tmp_path / 'stock*'), '-o', output]) == 0
+
+    assert pd.read_parquet(output).equals(trends)
+
+    # the files done with other params, or which changed since, are identified again instead of resumed
+    files = find_files([str(tmp_path)])
+
+    stats = run(files, output, window_size=4, stream=io.StringIO())
+
+    assert stats['skipped'] == 0 and stats['files'] == 4
+    assert len(os.listdir(output + '.parts')) == 4
+
+    df = pd.read_csv(str(tmp_path / 'stock0.csv'))
+    df['Close'] = df['Close'][::-1].to_numpy()
+    df.to_csv(str(tmp_path / 'stock0.csv'), index=False)
+
+    stats = run(files, output, window_size=4, stream=io.StringIO())
+
+    assert stats['skipped'] == 3 and stats['files'] == 1
+
+    trends = pd.read_parquet(output)
+    expected = trendet.identify_array_trends(df['Close'].to_numpy(), dates=pd.to_datetime(df['Date']).to_numpy(),
+                                             window_size=4)
+
+    for trend, values in expected.items():
+        rows = trends[(trends['series'] == 'stock0') & (trends['trend'] == trend)]
+
+        assert np.array_equal(rows[['from', 'to']].to_numpy(), values)
+
+
+def test_cli_series(tmp_path):
+    """
+    This function checks that the files named the same in different directories are told apart in the Parquet table,
+    as their series are named after their path relative to the input.
+    """
+
+    pytest.importorskip('pyarrow')
+
+    rng = np.random.RandomState(6)
+
+    expected = dict()
+
+    for directory in ['a', 'b']:
+        os.makedirs(str(tmp_path / directory))
+
+        df = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=300))})
+        df.to_csv(str(tmp_path / directory / 'stock.csv'), index=False)
+
+        expected[directory + '/stock'] = trendet.identify_array_trends(df['Close'].to_numpy())
+
+    output = str(tmp_path / 'trends.parquet')
+
+    assert main([str(tmp_path / 'a'), str(tmp_path / 'b'), '-o', output]) == 0
+
+    trends = pd.read_parquet(output)
+
+    assert set(trends['series']) == set(expected.keys())
+
+    for name, positions in expected.items():
+        for trend, values in positions.items():
+            rows = trends[(trends['series'] == name) & (trends['trend'] == trend)]
+
+            assert np.array_equal(rows[['from', 'to']].to_numpy(), values)
+
+
+def test_cli_pyarrow(tmp_path, monkeypatch):
+    """
+    This function checks that the command exits with an error before identifying any file if pyarrow is missing.
+    """
+
+    pd.DataFrame({'Close': np.arange(10.)}).to_csv(str(tmp_path / 'stock.csv'), index=False)
+
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), '-o', str(tmp_path / 'trends.parquet')])
+
+    assert not os.path.exists(str(tmp_path / 'trends.parquet.parts'))
+
+
+def test_cli_errors(tmp_path):
+    """
+    This function checks that invalid arguments make the command exit with an error.
+    """
+
+    for argv in [[str(tmp_path), '-o', 'trends.parquet'],
+                 [str(tmp_path)],
+                 [str(tmp_path), '-o', 'trends.parquet', '-w', '1']]:
+        with pytest.raises(SystemExit):
+            main(argv)
+
@@ -0,0 +1,79 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_index():
+    """
+    This function checks that the series trending on a date, or within a date range, match a brute force search
+    over the trends of every series.
+    """
+
+    rng = np.random.RandomState(10)
+
+    dates = pd.date_range('2000-01-01', periods=600, freq='D').to_numpy()
+
+    trends = dict()
+
+    for number in range(30):
+        values = 100 + np.cumsum(rng.normal(size=dates.size))
+
+        trends['stock' + str(number)] = trendet.identify_array_trends(values, dates=dates, window_size=3)
+
+    trends['overlapping'] = {'Up Trend': np.array([[10, 300], [20, 30]]), 'Down Trend': np.empty((0, 2))}
+
+    index = trendet.TrendIndex.from_trends(trends, dates)
+
+    def brute_force(start, end, trend):
+        return sorted(name for name, directions in trends.items()
+                      if any(dates[from_trend] <= end and dates[to_trend] >= start
+                             for from_trend, to_trend in directions[trend]))
+
+    for _ in range(50):
+        start = dates[rng.randint(dates.size)] - np.timedelta64(10, 'D')
+        end = start + np.timedelta64(int(rng.randint(0, 20)), 'D')
+
+        for trend in ['Up Trend', 'Down Trend']:
+            assert index.trending(start, trend=trend) == brute_force(start, start, trend)
+            assert index.overlapping(start, end, trend=trend) == brute_force(start, end, trend)
+
+    assert 'overlapping' in index.trending('2000-02-15')
+
+    store = trendet.TrendStore()
+
+    for name, directions in trends.items():
+        store.insert(name, directions, dates=dates)
+
+    index = trendet.TrendIndex.from_frame(store.query())
+
+    assert index.trending('2000-06-01') == brute_force(np.datetime64('2000-06-01'), np.datetime64('2000-06-01'),
+                                                       'Up Trend')
+
+    empty = trendet.TrendIndex.from_trends(dict(), dates)
+
+    assert empty.trending('2000-06-01') == []
+
+
+def test_index_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    with pytest.raises(ValueError):
+        trendet.TrendIndex(['AAA'], ['Up Trend', 'Up Trend'], ['2000-01-01'], ['2000-01-02'])
+
+    index = trendet.TrendIndex(['AAA'], ['Up Trend'], ['2000-01-01'], ['2000-01-02'])
+
+    with pytest.raises(ValueError):
+        index.trending('2000-01-01', trend='error')
+
+
+if __name__ == '__main__':
+    test_index()
+    test_index_errors()
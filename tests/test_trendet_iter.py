@@ -0,0 +1,81 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import itertools
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+from trendet.identification import _identify
+
+
+def test_iter_trends():
+    """
+    This function checks that the lazily identified trends are the ones identified over the whole values, in time
+    order, and that labeling just the first trends stops the scan with the same labels.
+    """
+
+    rng = np.random.RandomState(48)
+
+    for number in range(12):
+        values = 100 + np.cumsum(rng.normal(size=500))
+
+        if number % 2:
+            values = np.round(values, 2)
+
+        dates = pd.date_range('2010-01-01', periods=len(values), freq='D').to_numpy()
+
+        for identify in ['both', 'up', 'down']:
+            expected = trendet.identify_array_trends(values, dates=dates, window_size=4, identify=identify)
+
+            trends = list(trendet.iter_trends(values, dates=dates, window_size=4, identify=identify))
+
+            assert trends == sorted(trends, key=lambda trend: (trend[1], trend[2], trend[0]))
+
+            for name in expected:
+                positions = [[from_trend, to_trend] for trend, from_trend, to_trend in trends if trend == name]
+
+                assert np.array_equal(np.array(positions, dtype=np.int64).reshape(-1, 2), expected[name])
+
+            assert list(itertools.islice(trendet.iter_trends(values, dates=dates, window_size=4, identify=identify),
+                                         3)) == trends[:3]
+
+            df = pd.DataFrame({'Close': values}, index=pd.DatetimeIndex(dates, name='Date'))
+
+            limited = _identify(df.copy(), 'Close', window_size=4, identify=identify, trend_limit=2)
+            full = _identify(df.copy(), 'Close', window_size=4, identify=identify, trend_limit=2,
+                             cache=trendet.TrendCache())
+
+            pd.testing.assert_frame_equal(limited, full)
+
+
+def test_iter_trends_errors():
+    """
+    This function checks that invalid arguments raise a ValueError before iterating.
+    """
+
+    values = np.arange(10, dtype=np.float64)
+
+    params = [
+        {'values': None},
+        {'values': values.reshape(2, 5)},
+        {'values': values.astype(str)},
+        {'values': values, 'dates': values},
+        {'values': values, 'dates': np.arange(3).astype('datetime64[D]')},
+        {'values': values, 'window_size': 2},
+        {'values': values, 'identify': 'error'},
+        {'values': values, 'engine': 'error'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.iter_trends(**param)
+
+
+if __name__ == '__main__':
+    test_iter_trends()
+    test_iter_trends_errors()
@@ -0,0 +1,64 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_membership():
+    """
+    This function checks that bit-packed membership statistics match the ones of dense boolean membership columns.
+    """
+
+    rng = np.random.RandomState(12)
+
+    df = pd.DataFrame(100 + np.cumsum(rng.normal(size=(1000, 7)), axis=0),
+                      columns=['stock' + str(number) for number in range(7)])
+
+    trends = trendet.identify_panel_trends(df, window_size=4, workers=2)
+
+    membership = trendet.TrendMembership.from_trends(trends, len(df))
+
+    dense = dict()
+
+    for name in ['Up Trend', 'Down Trend']:
+        dense[name] = np.zeros((len(trends), len(df)), dtype=bool)
+
+        for row, column in enumerate(trends):
+            for from_trend, to_trend in trends[column][name]:
+                dense[name][row, from_trend:to_trend + 1] = True
+
+        assert np.array_equal(membership.counts(name), dense[name].sum(axis=1))
+
+        expected = dense[name].astype(np.int64) @ dense[name].T.astype(np.int64)
+
+        assert np.array_equal(membership.co_trending(name), expected)
+
+        union = (dense[name][:, None, :] | dense[name][None, :, :]).sum(axis=2)
+
+        assert np.allclose(membership.overlap(name), np.where(union > 0, expected / np.maximum(union, 1), 0))
+
+        for position in [0, 63, 64, 500, len(df) - 1]:
+            assert membership.members(position, name) == [column for row, column in enumerate(trends)
+                                                          if dense[name][row, position]]
+
+    both = sum(dense[name].astype(np.int64) @ dense[name].T.astype(np.int64) for name in dense)
+
+    assert np.array_equal(membership.co_trending(), both)
+
+    with pytest.raises(ValueError):
+        membership.counts('Sideways')
+
+    with pytest.raises(ValueError):
+        membership.members(len(df))
+
+    with pytest.raises(ValueError):
+        trendet.TrendMembership.from_trends(trends, -1)
+
+
+if __name__ == '__main__':
+    test_membership()
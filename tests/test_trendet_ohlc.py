@@ -0,0 +1,77 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def ohlc(size, seed=0):
+    """
+    This function generates a random OHLC `pandas.DataFrame` with a daily `DatetimeIndex` for offline testing.
+    """
+
+    rng = np.random.RandomState(seed)
+
+    close = 100 + np.cumsum(rng.normal(size=size))
+    open_ = close + rng.normal(scale=.5, size=size)
+    high = np.maximum(open_, close) + rng.uniform(size=size)
+    low = np.minimum(open_, close) - rng.uniform(size=size)
+
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close},
+                        index=pd.date_range('2000-01-01', periods=size, freq='D'))
+
+
+def test_ohlc_trends():
+    """
+    This function checks that the trends labeled for every OHLC column match the ones `identify_df_trends` labels
+    over that column on its own, named after the column.
+    """
+
+    df = ohlc(1500)
+
+    for identify in ['both', 'up', 'down']:
+        result = trendet.identify_ohlc_trends(df=df.copy(), window_size=4, identify=identify)
+
+        for column in ['Open', 'High', 'Low', 'Close']:
+            expected = trendet.identify_df_trends(df=df.copy(), column=column, window_size=4, identify=identify)
+
+            for name in ['Up Trend', 'Down Trend']:
+                if name not in expected.columns:
+                    assert column + ' ' + name not in result.columns
+                    continue
+
+                assert result[column + ' ' + name].equals(expected[name].rename(column + ' ' + name))
+
+
+def test_ohlc_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    df = ohlc(10)
+    df['error'] = 'error'
+
+    params = [
+        {'df': None},
+        {'df': ['error']},
+        {'df': df, 'columns': 'Close'},
+        {'df': df, 'columns': []},
+        {'df': df, 'columns': [1]},
+        {'df': df, 'columns': ['Volume']},
+        {'df': df, 'columns': ['error']},
+        {'df': df, 'window_size': 1},
+        {'df': df, 'identify': 'error'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.identify_ohlc_trends(**param)
+
+
+if __name__ == '__main__':
+    test_ohlc_trends()
+    test_ohlc_errors()
@@ -0,0 +1,290 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+from tests.helpers import random_walk
+
+
+def test_dask_trends():
+    """
+    This function checks that trends identified over a partitioned `dask.dataframe.DataFrame` are the same ones
+    identified by a sequential scan, no matter how it is partitioned.
+    """
+
+    dd = pytest.importorskip('dask.dataframe')
+
+    for seed in range(2):
+        df = random_walk(1500, seed=seed)
+
+        for identify in ['both', 'up', 'down']:
+            expected = trendet.identify_array_trends(df['Close'].to_numpy(),
+                                                     dates=df.index.to_numpy(),
+                                                     window_size=4,
+                                                     identify=identify)
+
+            for npartitions, halo in [(1, 1024), (7, 1024), (13, 0), (29, 3)]:
+                ddf = dd.from_pandas(df, npartitions=npartitions)
+
+                result = trendet.identify_dask_trends(ddf, column='Close', window_size=4, identify=identify, halo=halo)
+
+                assert result.keys() == expected.keys()
+
+                for name in expected:
+                    assert np.array_equal(result[name], expected[name])
+
+    # integer walks can end trends beyond the last row, whose date can not be fetched
+    df = pd.DataFrame({'Close': np.cumsum(np.random.RandomState(0).randint(-2, 3, 120))},
+                      index=pd.date_range('2000-01-01', periods=120, freq='D'))
+
+    expected = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy(), window_size=7)
+
+    assert expected['Down Trend'].tolist() == [[12, 57], [102, 119]]
+
+    for index in [df.index, df.index.tz_localize('UTC')]:
+        df.index = index
+
+        result = trendet.identify_dask_trends(dd.from_pandas(df, npartitions=4), column='Close', window_size=7)
+
+        assert result.keys() == expected.keys()
+
+        for name in expected:
+            assert np.array_equal(result[name], expected[name])
+
+
+def test_dask_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    dd = pytest.importorskip('dask.dataframe')
+
+    df = random_walk(10)
+    df['error'] = 'error'
+
+    ddf = dd.from_pandas(df, npartitions=2)
+
+    params = [
+        {'ddf': None},
+        {'ddf': df},
+        {'ddf': ddf, 'column': None},
+        {'ddf': ddf, 'column': 'error'},
+        {'ddf': ddf, 'column': 'Volume'},
+        {'ddf': ddf, 'window_size': 1},
+        {'ddf': ddf, 'identify': 'error'},
+        {'ddf': ddf, 'halo': -1},
+    ]
+
+    for param in params:
+        param.setdefault('column', 'Close')
+
+        with pytest.raises(ValueError):
+            trendet.identify_dask_trends(**param)
+
+
+def test_panel_trends():
+    """
+    This function checks that trends identified over the columns of a panel in parallel are the same ones identified
+    over every column on its own.
+    """
+
+    rng = np.random.RandomState(6)
+
+    df = pd.DataFrame(100 + np.cumsum(rng.normal(size=(800, 9)), axis=0),
+                      columns=['stock' + str(number) for number in range(9)],
+                      index=pd.date_range('2000-01-01', periods=800, freq='D'))
+
+    for identify in ['both', 'up', 'down']:
+        results = trendet.identify_panel_trends(df, window_size=4, identify=identify, processes=2)
+
+        assert list(results.keys()) == df.columns.tolist()
+
+        for column, trends in results.items():
+            expected = trendet.identify_array_trends(df[column].to_numpy(),
+                                                     dates=df.index.to_numpy(),
+                                                     window_size=4,
+                                                     identify=identify)
+
+            assert trends.keys() == expected.keys()
+
+            for name in expected:
+                assert np.array_equal(trends[name], expected[name])
+
+    results = trendet.identify_panel_trends(df.reset_index(drop=True), columns=['stock0'], processes=4)
+
+    assert list(results.keys()) == ['stock0']
+
+
+def test_panel_pickled(monkeypatch):
+    """
+    This function checks that, without `multiprocessing.shared_memory` as on Python versions older than 3.8, the
+    columns of a panel pickled to the workers identify the same trends as every column on its own.
+    """
+
+    monkeypatch.setattr(trendet.parallel, 'shared_memory', None)
+
+    rng = np.random.RandomState(8)
+
+    df = pd.DataFrame(100 + np.cumsum(rng.normal(size=(500, 5)), axis=0),
+                      columns=['stock' + str(number) for number in range(5)],
+                      index=pd.date_range('2000-01-01', periods=500, freq='D'))
+
+    results = trendet.identify_panel_trends(df, window_size=4, processes=2)
+
+    assert list(results.keys()) == df.columns.tolist()
+
+    for column, trends in results.items():
+        expected = trendet.identify_array_trends(df[column].to_numpy(), dates=df.index.to_numpy(), window_size=4)
+
+        for name in expected:
+            assert np.array_equal(trends[name], expected[name])
+
+
+def test_panel_threads():
+    """
+    This function checks that trends identified over the columns of a panel by a thread pool are the same ones
+    identified over every column on its own by the reference engine.
+    """
+
+    rng = np.random.RandomState(9)
+
+    df = pd.DataFrame(np.round(100 + np.cumsum(rng.normal(size=(3000, 12)), axis=0), 1),
+                      columns=['stock' + str(number) for number in range(12)],
+                      index=pd.date_range('2000-01-01', periods=3000, freq='D'))
+
+    results = trendet.identify_panel_trends(df, window_size=4, workers=4)
+
+    assert list(results.keys()) == df.columns.tolist()
+
+    for column, trends in results.items():
+        expected = trendet.identify_array_trends(df[column].to_numpy(),
+                                                 dates=df.index.to_numpy(),
+                                                 window_size=4,
+                                                 engine='reference')
+
+        for name in expected:
+            assert np.array_equal(trends[name], expected[name])
+
+
+def test_panel_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    df = random_walk(10)
+    df['error'] = 'error'
+
+    params = [
+        {'df': None},
+        {'df': ['error']},
+        {'df': df, 'columns': 'Close'},
+        {'df': df, 'columns': ['Volume']},
+        {'df': df, 'columns': ['error']},
+        {'df': df, 'window_size': 1},
+        {'df': df, 'identify': 'error'},
+        {'df': df, 'processes': 0},
+        {'df': df, 'columns': ['Close'], 'workers': 0},
+        {'df': df, 'columns': ['Close'], 'workers': 2, 'processes': 2},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.identify_panel_trends(**param)
+
+
+def test_chunked_trends():
+    """
+    This function checks, over randomized series and chunk sizes, that trends identified by scanning the chunks of a
+    series in parallel and stitching them are the same ones identified by a sequential scan.
+    """
+
+    rng = np.random.RandomState(7)
+
+    for _ in range(40):
+        size = rng.randint(1, 1500)
+
+        values = 100 + np.cumsum(rng.normal(size=size))
+
+        if rng.rand() < .5:
+            values = np.round(values, 0)
+
+        window_size = int(rng.randint(3, 7))
+        chunk_size = int(rng.randint(1, size + 2))
+        identify = ['both', 'up', 'down'][rng.randint(3)]
+
+        expected = trendet.identify_array_trends(values, window_size=window_size, identify=identify)
+
+        result = trendet.identify_chunked_trends(values,
+                                                 window_size=window_size,
+                                                 identify=identify,
+                                                 chunk_size=chunk_size,
+                                                 processes=1)
+
+        assert result.keys() == expected.keys()
+
+        for name in expected:
+            assert np.array_equal(result[name], expected[name])
+
+    df = random_walk(3000)
+
+    expected = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy())
+
+    result = trendet.identify_chunked_trends(df['Close'].to_numpy(), dates=df.index.to_numpy(), processes=3)
+
+    for name in expected:
+        assert np.array_equal(result[name], expected[name])
+
+
+def test_chunked_pickled(monkeypatch):
+    """
+    This function checks that, without `multiprocessing.shared_memory` as on Python versions older than 3.8, the
+    chunks of a series pickled to the workers identify the same trends as a sequential scan.
+    """
+
+    monkeypatch.setattr(trendet.parallel, 'shared_memory', None)
+
+    df = random_walk(2000, seed=3)
+
+    expected = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy(), window_size=4)
+
+    result = trendet.identify_chunked_trends(df['Close'].to_numpy(), dates=df.index.to_numpy(), window_size=4,
+                                             processes=3)
+
+    for name in expected:
+        assert np.array_equal(result[name], expected[name])
+
+
+def test_chunked_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    params = [
+        {'values': None},
+        {'values': np.zeros((3, 3))},
+        {'values': np.array(['error'])},
+        {'values': np.zeros(3), 'dates': np.zeros(3)},
+        {'values': np.zeros(3), 'window_size': 1},
+        {'values': np.zeros(3), 'identify': 'error'},
+        {'values': np.zeros(3), 'chunk_size': 0},
+        {'values': np.zeros(3), 'processes': 0},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.identify_chunked_trends(**param)
+
+
+if __name__ == '__main__':
+    test_dask_trends()
+    test_dask_errors()
+    test_panel_trends()
+    test_panel_threads()
+    test_panel_errors()
+    test_chunked_trends()
+    test_chunked_errors()
@@ -0,0 +1,73 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_preview():
+    """
+    This function checks that previews are downsampled to about the requested width while keeping trend boundaries.
+    """
+
+    rng = np.random.RandomState(5)
+
+    values = 100 + np.cumsum(rng.normal(size=100000))
+    dates = pd.date_range('2000-01-01', periods=len(values), freq='h').to_numpy()
+
+    for method in ['minmax', 'lttb']:
+        for series_dates in [None, dates]:
+            preview = trendet.preview_trends(values, dates=series_dates, width=500, method=method)
+
+            trends = trendet.identify_array_trends(values, dates=series_dates)
+
+            positions = preview['positions']
+            boundaries = np.concatenate([trend.reshape(-1) for trend in trends.values()])
+
+            assert np.all(np.diff(positions) > 0)
+            assert positions[0] == 0 and positions[-1] == len(values) - 1
+            assert np.all(np.isin(boundaries, positions))
+            assert len(positions) <= 502 + len(boundaries)
+            assert np.array_equal(preview['values'], values[positions])
+
+            for name in trends:
+                assert np.array_equal(preview['trends'][name], trends[name])
+
+            if series_dates is None:
+                assert preview['dates'] is None
+            else:
+                assert np.array_equal(preview['dates'], dates[positions])
+
+    preview = trendet.preview_trends(values, width=500, method='minmax')
+
+    buckets = np.array_split(np.arange(len(values)), 250)
+
+    for bucket in buckets[:10]:
+        assert bucket[np.argmin(values[bucket])] in preview['positions']
+        assert bucket[np.argmax(values[bucket])] in preview['positions']
+
+    for method in ['minmax', 'lttb']:
+        preview = trendet.preview_trends(values[:100], width=500, method=method)
+
+        assert np.array_equal(preview['positions'], np.arange(100))
+
+
+def test_preview_errors():
+    """
+    This function checks that invalid preview arguments raise a ValueError.
+    """
+
+    values = np.arange(10, dtype=np.float64)
+
+    for kwargs in [{'width': 2}, {'width': 10.0}, {'method': 'mean'}, {'window_size': 2}]:
+        with pytest.raises(ValueError):
+            trendet.preview_trends(values, **kwargs)
+
+
+if __name__ == '__main__':
+    test_preview()
+    test_preview_errors()
@@ -0,0 +1,144 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import json
+import os
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_runner(tmp_path):
+    """
+    This function checks that a run identifies the trends of every series, isolates and retries the failed ones and
+    is resumed just processing the series which are not finished.
+    """
+
+    rng = np.random.RandomState(49)
+
+    universe = {
+        'stock_' + str(number): pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=300))},
+                                             index=pd.date_range('2015-01-01', periods=300, freq='D', name='Date'))
+        for number in range(6)
+    }
+
+    calls = list()
+    broken = {'stock_2', 'stock_4'}
+    flaky = {'stock_1': 1}
+
+    def provider(name):
+        calls.append(name)
+
+        if name in broken:
+            raise ConnectionError('investpy is down')
+
+        if flaky.get(name, 0) > 0:
+            flaky[name] -= 1
+
+            raise ConnectionError('timeout')
+
+        return universe[name]
+
+    directory = str(tmp_path)
+    names = sorted(universe)
+
+    runner = trendet.TrendRunner(directory, provider, window_size=4, retries=2, delay=0, checkpoint=2)
+
+    results = runner.run(names)
+
+    assert results['done'] == ['stock_0', 'stock_1', 'stock_3', 'stock_5']
+    assert results['skipped'] == []
+    assert set(results['failed']) == broken
+    assert calls.count('stock_1') == 2 and calls.count('stock_2') == 3
+
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+
+    assert manifest['series']['stock_2'] == {'status': 'failed', 'attempts': 3, 'error': 'ConnectionError: investpy '
+                                                                                         'is down'}
+    assert manifest['series']['stock_1']['status'] == 'done'
+
+    for name in results['done']:
+        df = universe[name]
+
+        expected = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy(), window_size=4)
+        trends = runner.trends(name)
+
+        for trend in expected:
+            assert np.array_equal(trends[trend], expected[trend])
+            assert np.array_equal(trends[trend + ' Dates'], df.index.to_numpy()[expected[trend]])
+
+    # resuming the run after the provider recovers just processes the failed series, even if the manifest lost the
+    # record of a finished one
+    del manifest['series']['stock_5']
+
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+    broken.clear()
+    calls.clear()
+
+    runner = trendet.TrendRunner(directory, provider, window_size=4, retries=2, delay=0)
+
+    assert set(runner.failed) == {'stock_2', 'stock_4'}
+
+    results = runner.run(names)
+
+    assert calls == ['stock_2', 'stock_4']
+    assert results['done'] == ['stock_2', 'stock_4']
+    assert results['skipped'] == ['stock_0', 'stock_1', 'stock_3', 'stock_5']
+    assert runner.failed == {}
+    assert [name for name in os.listdir(directory) if name.endswith('.tmp')] == []
+
+    with pytest.raises(ValueError):
+        trendet.TrendRunner(directory, provider, window_size=5)
+
+    # a series missing the column fails deterministically, so it is not retried
+    calls.clear()
+
+    def missing(name):
+        calls.append(name)
+
+        return universe[name].rename(columns={'Close': 'Open'})
+
+    runner = trendet.TrendRunner(str(tmp_path / 'missing'), missing, window_size=4, retries=2, delay=0)
+
+    results = runner.run(['stock_0'])
+
+    assert calls == ['stock_0']
+    assert results['failed'] == {'stock_0': 'ValueError: column Close not found in series stock_0'}
+
+
+def test_runner_errors(tmp_path):
+    """
+    This function checks that invalid runner arguments raise a ValueError.
+    """
+
+    directory = str(tmp_path)
+
+    params = [
+        {'directory': None, 'provider': len},
+        {'directory': directory, 'provider': None},
+        {'directory': directory, 'provider': len, 'window_size': 2},
+        {'directory': directory, 'provider': len, 'identify': 'error'},
+        {'directory': directory, 'provider': len, 'engine': 'error'},
+        {'directory': directory, 'provider': len, 'retries': -1},
+        {'directory': directory, 'provider': len, 'delay': -1},
+        {'directory': directory, 'provider': len, 'checkpoint': 0},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.TrendRunner(**param)
+
+    runner = trendet.TrendRunner(directory, len)
+
+    with pytest.raises(ValueError):
+        runner.run('stock')
+
+    with pytest.raises(ValueError):
+        runner.trends('stock')
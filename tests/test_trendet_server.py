@@ -0,0 +1,100 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import json
+import threading
+
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def request(url, body=None):
+    """
+    This function sends a JSON request to the introduced URL and returns its decoded JSON response.
+    """
+
+    data = None if body is None else json.dumps(body).encode('utf-8')
+
+    with urlopen(Request(url, data=data, headers={'Content-Type': 'application/json'})) as response:
+        return json.loads(response.read())
+
+
+def test_server():
+    """
+    This function checks that the trend server serves the same trends as identified locally, retrieving every series
+    from the provider just once.
+    """
+
+    rng = np.random.RandomState(30)
+
+    frames = {
+        name: pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=500))},
+                           index=pd.date_range('2010-01-01', periods=500, freq='D'))
+        for name in ['AAA', 'BBB', 'CCC']
+    }
+
+    calls = list()
+
+    def provider(name):
+        calls.append(name)
+        return frames[name]
+
+    server = trendet.TrendServer(trendet.TrendService(provider=provider))
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        for _ in range(2):
+            results = request(server.url + '/identify', {'series': ['AAA', 'BBB'], 'window_size': 4})
+
+            for name in ['AAA', 'BBB']:
+                expected = trendet.identify_array_trends(frames[name]['Close'].to_numpy(),
+                                                         dates=frames[name].index.to_numpy(),
+                                                         window_size=4)
+
+                for trend in expected:
+                    assert results[name][trend] == expected[trend].tolist()
+
+        assert calls == ['AAA', 'BBB']
+
+        stats = request(server.url + '/stats')
+
+        assert stats['hits'] == 2 and stats['misses'] == 2 and stats['series'] == 2
+
+        rows = request(server.url + '/query', {'series': 'CCC', 'start': '2010-03-01', 'end': '2010-06-01',
+                                               'trend': 'Up Trend'})['trends']
+
+        dates = frames['CCC'].index
+
+        assert rows and all(row['series'] == 'CCC' and row['trend'] == 'Up Trend' for row in rows)
+        assert all(dates[row['to']] >= pd.Timestamp('2010-03-01') for row in rows)
+        assert all(dates[row['from']] <= pd.Timestamp('2010-06-01') for row in rows)
+
+        request(server.url + '/load', {'series': 'DDD', 'values': list(range(50, 0, -1)) + list(range(50))})
+
+        results = request(server.url + '/identify', {'series': 'DDD', 'identify': 'down'})
+
+        assert results['DDD']['Down Trend'] == [[0, 50]]
+
+        for path, body, status in [('/identify', {'series': 'EEE'}, 500),
+                                   ('/identify', {'series': 'AAA', 'window_size': 2}, 400),
+                                   ('/unknown', {}, 404)]:
+            with pytest.raises(HTTPError) as e:
+                request(server.url + path, body)
+
+            assert e.value.code == status
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    test_server()
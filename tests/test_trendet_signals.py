@@ -0,0 +1,68 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_signals():
+    """
+    This function checks that trend signals match the labeled `Up Trend` and `Down Trend` columns.
+    """
+
+    rng = np.random.RandomState(8)
+
+    df = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=2000))},
+                      index=pd.date_range('2000-01-01', periods=2000, freq='D'))
+
+    trends = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy())
+
+    df = trendet.identify_df_trends(df=df, column='Close')
+
+    expected = df['Up Trend'].notna().astype(int) - df['Down Trend'].notna().astype(int)
+
+    for lag in [0, 1, 5]:
+        signals = trendet.trend_signals(trends, len(df), lag=lag)
+
+        assert signals['signal'].dtype == np.int8
+        assert np.array_equal(signals['signal'], expected.shift(lag).fillna(0).to_numpy())
+
+        signal = signals['signal']
+
+        for entry in signals['entries']:
+            assert signal[entry] != 0 and (entry == 0 or signal[entry - 1] != signal[entry])
+
+        for exit in signals['exits']:
+            assert signal[exit - 1] != 0 and signal[exit] != signal[exit - 1]
+
+    signals = trendet.trend_signals({'Up Trend': [(1, 3)], 'Down Trend': [(5, 6)]}, 8)
+
+    assert signals['signal'].tolist() == [0, 1, 1, 1, 0, -1, -1, 0]
+    assert signals['entries'].tolist() == [1, 5]
+    assert signals['exits'].tolist() == [4, 7]
+
+
+def test_signals_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    params = [
+        {'trends': None, 'length': 1},
+        {'trends': {}, 'length': -1},
+        {'trends': {}, 'length': 'error'},
+        {'trends': {}, 'length': 1, 'lag': -1},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.trend_signals(**param)
+
+
+if __name__ == '__main__':
+    test_signals()
+    test_signals_errors()
@@ -0,0 +1,112 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import os
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_writer(tmp_path):
+    """
+    This function checks that trends written in batches into a partitioned dataset match the labeled dataframes.
+    """
+
+    pytest.importorskip('pyarrow')
+
+    import pyarrow.dataset as ds
+
+    rng = np.random.RandomState(17)
+
+    frames = {
+        'stock' + str(number): pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=300))},
+                                            index=pd.date_range('2015-01-01', periods=300, freq='D'))
+        for number in range(12)
+    }
+
+    for format in ['parquet', 'ipc']:
+        path = str(tmp_path / format)
+
+        with trendet.TrendWriter(path, format=format, partitions=4, batch_size=50, labels=True) as writer:
+            for name, df in frames.items():
+                trends = trendet.identify_array_trends(df['Close'].to_numpy(), dates=df.index.to_numpy())
+
+                writer.write(name, trends, dates=df.index.to_numpy())
+
+        assert writer.series == 12
+        assert sorted(os.listdir(os.path.join(path, 'trends'))) == ['bucket=0', 'bucket=1', 'bucket=2', 'bucket=3']
+
+        dataset_format = 'parquet' if format == 'parquet' else 'ipc'
+
+        trends = ds.dataset(os.path.join(path, 'trends'), format=dataset_format, partitioning='hive').to_table()
+        labels = ds.dataset(os.path.join(path, 'labels'), format=dataset_format, partitioning='hive').to_table()
+
+        trends = trends.to_pandas()
+        labels = labels.to_pandas()
+
+        assert len(trends) == writer.rows
+
+        for name, df in frames.items():
+            expected = trendet.identify_df_trends(df=df.copy(), column='Close')
+
+            series = labels[labels['series'] == name].sort_values('position')
+
+            assert np.array_equal(series['date'].to_numpy(), df.index.to_numpy())
+
+            for trend in ['Up Trend', 'Down Trend']:
+                if trend in expected.columns:
+                    assert series[trend].fillna('-').tolist() == expected[trend].fillna('-').tolist()
+
+                rows = trends[(trends['series'] == name) & (trends['trend'] == trend)].sort_values('from')
+
+                for row in rows.itertuples(index=False):
+                    assert (expected[trend].iloc[row[3]:row[4] + 1] == row.label).all()
+                    assert row.from_date == df.index[row[3]] and row.to_date == df.index[row[4]]
+
+    with trendet.TrendWriter(str(tmp_path / 'nodates')) as writer:
+        writer.write('values', {'Up Trend': np.array([[1, 5]])})
+
+    table = pd.read_parquet(str(tmp_path / 'nodates' / 'trends'))
+
+    assert table['from_date'].isna().all() and table['to'].tolist() == [5]
+
+    import pyarrow.parquet as pq
+
+    with trendet.TrendWriter(str(tmp_path / 'sparse'), partitions=1) as writer:
+        for number in range(5000):
+            trends = {'Up Trend': np.empty((0, 2), dtype=np.int64), 'Down Trend': np.empty((0, 2), dtype=np.int64)}
+
+            if number % 1000 == 0:
+                trends['Up Trend'] = np.array([[number, number + 3]])
+
+            writer.write('series' + str(number), trends)
+
+            assert sum(len(chunks) for columns in writer._buffers.values() for chunks in columns.values()) <= 35
+
+    directory = tmp_path / 'sparse' / 'trends' / 'bucket=0'
+
+    assert writer.rows == 5 and pq.ParquetFile(str(next(directory.iterdir()))).num_row_groups == 1
+
+
+def test_writer_errors(tmp_path):
+    """
+    This function checks that invalid writer arguments raise a ValueError.
+    """
+
+    pytest.importorskip('pyarrow')
+
+    for kwargs in [{'path': None}, {'format': 'csv'}, {'partitions': 0}, {'batch_size': 0}, {'labels': 'yes'}]:
+        with pytest.raises(ValueError):
+            trendet.TrendWriter(**dict({'path': str(tmp_path)}, **kwargs))
+
+    with trendet.TrendWriter(str(tmp_path), labels=True) as writer:
+        with pytest.raises(ValueError):
+            writer.write('series', {'Up Trend': np.array([[1, 5]])})
+
+        with pytest.raises(ValueError):
+            writer.write(None, {})
+
@@ -0,0 +1,92 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_store(tmp_path):
+    """
+    This function checks that stored trends are retrieved by series and date range, and replaced on incremental runs.
+    """
+
+    rng = np.random.RandomState(9)
+
+    dates = pd.date_range('2000-01-01', periods=1000, freq='D').to_numpy()
+
+    identified = dict()
+
+    path = str(tmp_path / 'trends.db')
+
+    with trendet.TrendStore(path) as store:
+        for series in ['AAA', 'BBB', 'CCC']:
+            values = 100 + np.cumsum(rng.normal(size=dates.size))
+
+            identified[series] = trendet.identify_array_trends(values, dates=dates)
+
+            count = store.insert(series, identified[series], dates=dates, params={'window_size': 5})
+
+            assert count == sum(len(positions) for positions in identified[series].values())
+
+    store = trendet.TrendStore(path)
+
+    assert store.series() == ['AAA', 'BBB', 'CCC']
+
+    start, end = np.datetime64('2001-01-01'), np.datetime64('2001-03-01')
+
+    df = store.query(series=['AAA', 'CCC'], start=str(start), end=str(end), params={'window_size': 5})
+
+    assert set(df['series']) <= {'AAA', 'CCC'}
+
+    for series in ['AAA', 'CCC']:
+        expected = list()
+
+        for name, positions in identified[series].items():
+            for from_trend, to_trend in positions:
+                if dates[from_trend] <= end and dates[to_trend] >= start:
+                    expected.append((name, from_trend, to_trend))
+
+        rows = df[df['series'] == series]
+
+        assert sorted(expected) == sorted(zip(rows['trend'], rows['from'], rows['to']))
+
+    assert store.query(params={'window_size': 3}).empty
+    assert len(store.query(trend='Up Trend')) == sum(len(trends['Up Trend']) for trends in identified.values())
+
+    store.insert('AAA', {'Up Trend': [(900, 950)]}, dates=dates, params={'window_size': 5}, since=800)
+
+    rows = store.query(series='AAA')
+
+    assert rows['from'].max() == 900
+    assert len(rows[rows['from'] >= 800]) == 1
+
+    store.close()
+
+
+def test_store_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    with pytest.raises(ValueError):
+        trendet.TrendStore(None)
+
+    store = trendet.TrendStore()
+
+    params = [
+        {'series': None, 'trends': {}},
+        {'series': 'AAA', 'trends': None},
+        {'series': 'AAA', 'trends': {}, 'since': -1},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            store.insert(**param)
+
+
+if __name__ == '__main__':
+    test_store_errors()
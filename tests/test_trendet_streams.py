@@ -0,0 +1,99 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+
+import trendet
+
+
+def test_streams():
+    """
+    This function checks that advancing every stream at once confirms the same trends that identifying every
+    direction over the whole stream does, including the streams which are not advanced on every update.
+    """
+
+    rng = np.random.RandomState(50)
+
+    length, number = 400, 30
+
+    values = 100 + np.cumsum(rng.normal(size=(length, number)), axis=0)
+    values[:, 1::3] = np.round(values[:, 1::3])
+    values[:, 2::3] = np.round(values[:, 2::3], 1)
+    values[40:45, 4] = np.nan
+    values[:, 5] = rng.randint(0, 3, size=length)
+
+    mask = rng.rand(length, number) > .2
+    mask[:, :10] = True
+
+    streams = trendet.TrendStreams(number, window_size=4)
+
+    trends = {name: [list() for _ in range(number)] for name in ['Up Trend', 'Down Trend']}
+    started = {name: np.zeros(number, dtype=np.int64) for name in ['Up Trend', 'Down Trend']}
+
+    for row in range(length):
+        results = streams.update(values[row], mask=mask[row])
+
+        for name, result in results.items():
+            for stream, from_trend, to_trend in zip(result['confirmed'], result['from'], result['to']):
+                trends[name][stream].append([from_trend, to_trend])
+
+            started[name][result['started']] += 1
+
+    assert np.array_equal(streams.positions, mask.sum(axis=0))
+
+    for stream in range(number):
+        series = values[mask[:, stream], stream]
+
+        for name, identify in [('Up Trend', 'up'), ('Down Trend', 'down')]:
+            expected = trendet.identify_array_trends(series, window_size=4, identify=identify, engine='reference')
+
+            assert np.array_equal(np.array(trends[name][stream], dtype=np.int64).reshape(-1, 2), expected[name])
+            assert len(expected[name]) <= started[name][stream] <= len(expected[name]) + 1
+
+    # a flat stream never closes its segment, which must not make the state of the streams grow
+    streams = trendet.TrendStreams(3, window_size=4)
+
+    state = sum(array.nbytes for array in vars(streams).values() if isinstance(array, np.ndarray))
+
+    for _ in range(3000):
+        results = streams.update(np.array([.1, 3., 1e-310]))
+
+        assert all(len(result['confirmed']) == 0 for result in results.values())
+
+    assert sum(array.nbytes for array in vars(streams).values() if isinstance(array, np.ndarray)) == state
+    assert (streams.count == 3000).all()
+
+    streams = trendet.TrendStreams(['a', 'b'], window_size=3, identify='up')
+
+    assert list(streams.update(np.array([1, 2]))) == ['Up Trend']
+
+
+def test_streams_errors():
+    """
+    This function checks that invalid arguments raise a ValueError.
+    """
+
+    params = [
+        {'streams': 0},
+        {'streams': []},
+        {'streams': 'stream'},
+        {'streams': 2, 'window_size': 2},
+        {'streams': 2, 'identify': 'error'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.TrendStreams(**param)
+
+    streams = trendet.TrendStreams(2)
+
+    with pytest.raises(ValueError):
+        streams.update(np.zeros(3))
+
+    with pytest.raises(ValueError):
+        streams.update(np.array(['a', 'b']))
+
+    with pytest.raises(ValueError):
+        streams.update(np.zeros(2), mask=np.ones(2))
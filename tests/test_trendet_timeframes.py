@@ -0,0 +1,78 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_timeframe_trends():
+    """
+    This function checks that trends identified over several timeframes match the ones identified over every
+    timeframe resampled on its own, once aligned back to the base timestamps.
+    """
+
+    rng = np.random.RandomState(3)
+
+    index = pd.date_range('2020-01-01', periods=60 * 24 * 60, freq='min')
+
+    df = pd.DataFrame({'Close': 100 + np.cumsum(rng.normal(size=index.size))}, index=index)
+
+    timeframes = ['5min', '1h', '1D']
+
+    result = trendet.identify_timeframe_trends(df=df.copy(), column='Close', timeframes=timeframes, window_size=3)
+
+    for timeframe in timeframes:
+        bars = df['Close'].resample(timeframe).last().dropna().to_frame()
+        bars = trendet.identify_df_trends(df=bars, column='Close', window_size=3)
+
+        for name in ['Up Trend', 'Down Trend']:
+            if name not in bars.columns:
+                assert timeframe + ' ' + name not in result.columns
+                continue
+
+            expected = bars[name].reindex(df.index, method='ffill')
+            labeled = result[timeframe + ' ' + name]
+
+            assert labeled.notna().any()
+
+            positions = np.flatnonzero(labeled.notna().to_numpy())
+
+            assert (labeled.iloc[positions] == expected.iloc[positions]).all()
+
+
+def test_timeframe_errors():
+    """
+    This function checks that invalid arguments raise errors.
+    """
+
+    df = pd.DataFrame({'Close': np.arange(100.)}, index=pd.date_range('2020-01-01', periods=100, freq='min'))
+
+    params = [
+        {'df': None},
+        {'df': ['error']},
+        {'df': df.reset_index()},
+        {'df': df, 'column': None},
+        {'df': df, 'column': 'error'},
+        {'df': df, 'timeframes': '5min'},
+        {'df': df, 'timeframes': ['error']},
+        {'df': df, 'timeframes': ['1h', '5min']},
+        {'df': df, 'timeframes': ['2min', '5min']},
+        {'df': df, 'window_size': 1},
+        {'df': df, 'identify': 'error'},
+    ]
+
+    for param in params:
+        param.setdefault('column', 'Close')
+        param.setdefault('timeframes', ['5min'])
+
+        with pytest.raises(ValueError):
+            trendet.identify_timeframe_trends(**param)
+
+
+if __name__ == '__main__':
+    test_timeframe_trends()
+    test_timeframe_errors()
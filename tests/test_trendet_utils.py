@@ -0,0 +1,90 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+
+import trendet
+
+from trendet.utils import iter_values, scan_trends, scan_values, select_trends, trend_labels
+
+from tests.helpers import random_walk
+
+
+def test_labels():
+    """
+    This function checks that trend labels are generated without the 26 letters limit.
+    """
+
+    labels = trend_labels(800)
+
+    assert labels[:3] == ['A', 'B', 'C']
+    assert labels[25:28] == ['Z', 'AA', 'AB']
+    assert labels[701:703] == ['ZZ', 'AAA']
+    assert len(set(labels)) == 800
+
+
+def test_selection():
+    """
+    This function checks that the strongest trends are selected based on the specified score.
+    """
+
+    values = [10., 9., 8., 7., 6., 5., 4., 3., 2., 1.]
+    trends = [(0, 1), (2, 6), (7, 9)]
+
+    assert select_trends(trends, values, limit=2) == [(0, 1), (2, 6)]
+    assert select_trends(trends, values, limit=2, rank_by='length') == [(2, 6), (7, 9)]
+    assert select_trends(trends, values, limit=1, rank_by='move') == [(2, 6)]
+    assert select_trends(trends, values, limit=1, rank_by='percentage') == [(7, 9)]
+    assert select_trends(trends, values, limit=None) == trends
+
+
+def test_df_labels():
+    """
+    This function checks that every identified trend gets labeled, even if there are more than 26.
+    """
+
+    df = random_walk(5000)
+
+    trends = scan_trends(df['Close'].tolist(), 3)
+
+    assert len(trends) > 26
+
+    df = trendet.identify_df_trends(df=df, column='Close', window_size=3, identify='down')
+
+    assert df['Down Trend'].dropna().nunique() == len(trends)
+
+
+def test_kernel():
+    """
+    This function checks that the compiled kernel identifies the same trends as the reference engine, including the
+    values it can not compare exactly and hands over to the fast engine.
+    """
+
+    pytest.importorskip('numba')
+
+    rng = np.random.RandomState(4)
+
+    for number in range(60):
+        values = np.cumsum(rng.normal(size=300))
+
+        if number % 4 == 1:
+            values = np.round(values * 3) / 3
+        elif number % 4 == 2:
+            values = np.round(values, 1)
+            values[rng.randint(0, 300, size=3)] = np.nan
+        elif number % 4 == 3:
+            values = np.round(values).astype(np.float32)
+
+        for negate in [False, True]:
+            for window_size in [3, 5]:
+                assert scan_values(values, window_size, negate=negate) == \
+                    scan_trends(iter_values(values, negate=negate), window_size, engine='reference')
+
+
+if __name__ == '__main__':
+    test_labels()
+    test_selection()
+    test_df_labels()
+    test_kernel()
@@ -0,0 +1,67 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_engines():
+    """
+    This function checks that the fast and the reference engines identify the same trends.
+    """
+
+    for identify in ['both', 'up', 'down']:
+        assert trendet.check_engines(series=40, length=400, window_sizes=[3, 4, 7], identify=identify) is None
+
+    rng = np.random.RandomState(3)
+
+    df = pd.DataFrame({'Close': np.round(np.cumsum(rng.normal(size=1000)))},
+                      index=pd.date_range('2000-01-01', periods=1000, freq='D'))
+
+    fast = trendet.identify_df_trends(df=df.copy(), column='Close', engine='fast')
+    reference = trendet.identify_df_trends(df=df.copy(), column='Close', engine='reference')
+
+    pd.testing.assert_frame_equal(fast, reference)
+
+    walk = pd.DataFrame({'Close': np.cumsum(np.random.RandomState(0).randint(-2, 3, size=120)).astype(np.int64)},
+                        index=pd.date_range('2000-01-01', periods=120, freq='D'))
+
+    fast = trendet.identify_df_trends(df=walk.copy(), column='Close', window_size=7, engine='fast')
+    reference = trendet.identify_df_trends(df=walk.copy(), column='Close', window_size=7, engine='reference')
+
+    pd.testing.assert_frame_equal(fast, reference)
+
+    values = df['Close'].to_numpy()
+
+    fast = trendet.identify_chunked_trends(values, window_size=4, chunk_size=64, processes=1, engine='fast')
+    reference = trendet.identify_array_trends(values, window_size=4, engine='reference')
+
+    for name in ['Up Trend', 'Down Trend']:
+        assert np.array_equal(fast[name], reference[name])
+
+
+def test_engines_errors():
+    """
+    This function checks that invalid engines and checker arguments raise a ValueError.
+    """
+
+    values = np.arange(10, dtype=np.float64)
+
+    with pytest.raises(ValueError):
+        trendet.identify_array_trends(values, engine='slow')
+
+    with pytest.raises(ValueError):
+        trendet.identify_chunked_trends(values, engine=None)
+
+    for kwargs in [{'series': 0}, {'length': -1}, {'window_sizes': [2]}, {'identify': 'sideways'}]:
+        with pytest.raises(ValueError):
+            trendet.check_engines(**kwargs)
+
+
+if __name__ == '__main__':
+    test_engines()
+    test_engines_errors()
@@ -0,0 +1,111 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+import trendet
+
+
+def test_walk_forward():
+    """
+    This function checks that the trends of every walk-forward step match the ones identified over its lookback.
+    """
+
+    rng = np.random.RandomState(14)
+
+    for number in range(6):
+        values = 100 + np.cumsum(rng.normal(size=400))
+
+        if number % 2:
+            values = np.round(values, 2)
+
+        dates = pd.date_range('2012-01-01', periods=len(values), freq='D').to_numpy()
+
+        lookback, step = [(60, 1), (150, 7), (25, 3)][number % 3]
+
+        for identify in ['both', 'up', 'down']:
+            df = trendet.identify_walk_forward_trends(values, lookback, dates=dates, step=step, window_size=4,
+                                                      identify=identify)
+
+            assert set(df['end']) <= set(range(lookback - 1, len(values), step))
+
+            for end in range(lookback, len(values) + 1, step):
+                start = end - lookback
+
+                expected = trendet.identify_array_trends(values[start:end], dates=dates[start:end], window_size=4,
+                                                         identify=identify)
+
+                step_trends = df[df['end'] == end - 1]
+
+                for name in expected:
+                    trends = step_trends[step_trends['trend'] == name]
+
+                    assert np.array_equal(trends[['from', 'to']].to_numpy(), expected[name] + start)
+                    assert (trends['date'] == dates[end - 1]).all()
+                    assert np.array_equal(trends['from_date'].to_numpy(), dates[trends['from'].to_numpy()])
+
+
+def test_walk_forward_integers():
+    """
+    This function checks that the trends of every walk-forward step over integer walks, where trends can end beyond
+    the values scanned, are clamped to its lookback just like the ones identified over it.
+    """
+
+    for seed in range(8):
+        values = np.cumsum(np.random.RandomState(seed).randint(-2, 3, 120))
+        dates = pd.date_range('2012-01-01', periods=len(values), freq='D').to_numpy()
+
+        for lookback, step in [(10, 1), (25, 3), (60, 1)]:
+            for identify in ['both', 'up', 'down']:
+                for step_dates in [None, dates]:
+                    df = trendet.identify_walk_forward_trends(values, lookback, dates=step_dates, step=step,
+                                                              window_size=4, identify=identify)
+
+                    assert (df['to'] <= df['end']).all()
+
+                    for end in range(lookback, len(values) + 1, step):
+                        start = end - lookback
+
+                        expected = trendet.identify_array_trends(values[start:end],
+                                                                 dates=None if step_dates is None else dates[start:end],
+                                                                 window_size=4,
+                                                                 identify=identify)
+
+                        step_trends = df[df['end'] == end - 1]
+
+                        for name in expected:
+                            trends = step_trends[step_trends['trend'] == name]
+
+                            assert np.array_equal(trends[['from', 'to']].to_numpy(), expected[name] + start)
+
+
+def test_walk_forward_errors():
+    """
+    This function checks that invalid walk-forward arguments raise a ValueError.
+    """
+
+    values = np.arange(10, dtype=np.float64)
+
+    params = [
+        {'values': None, 'lookback': 5},
+        {'values': values.reshape(2, 5), 'lookback': 5},
+        {'values': values, 'lookback': 0},
+        {'values': values, 'lookback': 5, 'step': 0},
+        {'values': values, 'lookback': 5, 'dates': np.arange(3).astype('datetime64[D]')},
+        {'values': values, 'lookback': 5, 'window_size': 2},
+        {'values': values, 'lookback': 5, 'identify': 'error'},
+        {'values': values, 'lookback': 5, 'engine': 'error'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.identify_walk_forward_trends(**param)
+
+
+if __name__ == '__main__':
+    test_walk_forward()
+    test_walk_forward_integers()
+    test_walk_forward_errors()
@@ -0,0 +1,86 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import pytest
+
+import numpy as np
+
+import trendet
+
+
+def test_windows():
+    """
+    This function checks that trend windows are strided views matching the sliced windows around every trend.
+    """
+
+    rng = np.random.RandomState(21)
+
+    values = 100 + np.cumsum(rng.normal(size=3000))
+
+    trends = trendet.identify_array_trends(values, window_size=4)['Up Trend']
+
+    windows = trendet.TrendWindows(values, trends, before=30, after=10)
+
+    assert not windows.view.flags.writeable
+    assert np.shares_memory(windows.view, values)
+    assert len(windows) == len(windows.index) == len(windows.trends)
+
+    for number, (position, (from_trend, _)) in enumerate(zip(windows.index, windows.trends)):
+        assert np.array_equal(trends[position], windows.trends[number])
+        assert np.array_equal(windows[number], values[from_trend - 30:from_trend + 11])
+
+    discarded = np.setdiff1d(np.arange(len(trends)), windows.index)
+
+    assert all(trends[position, 0] < 30 or trends[position, 0] + 10 >= len(values) for position in discarded)
+
+    windows = trendet.TrendWindows(values, trends, before=0, after=500, anchor='to', pad='nan', normalize='anchor')
+
+    assert len(windows) == len(trends)
+
+    batch = windows[:]
+
+    assert batch.shape == (len(trends), 501)
+    assert np.allclose(batch[:, 0], 1)
+
+    for number, (_, to_trend) in enumerate(trends):
+        expected = values[to_trend:to_trend + 501] / values[to_trend]
+
+        assert np.allclose(batch[number, :len(expected)], expected)
+        assert np.isnan(batch[number, len(expected):]).all()
+
+    windows = trendet.TrendWindows(values, trends, before=50, after=50, pad='edge', normalize='zscore')
+
+    batch = windows[::2]
+
+    assert batch.shape == (len(trends[::2]), 101)
+    assert np.allclose(batch.mean(axis=1), 0)
+    assert np.allclose(batch.std(axis=1), 1)
+
+
+def test_windows_errors():
+    """
+    This function checks that invalid window arguments raise a ValueError.
+    """
+
+    values = np.arange(10, dtype=np.float64)
+    trends = np.array([[1, 5]])
+
+    params = [
+        {'values': None, 'trends': trends},
+        {'values': values.reshape(2, 5), 'trends': trends},
+        {'values': values, 'trends': np.array([1, 5])},
+        {'values': values, 'trends': trends, 'before': -1},
+        {'values': values, 'trends': trends, 'after': 1.5},
+        {'values': values, 'trends': trends, 'anchor': 'middle'},
+        {'values': values, 'trends': trends, 'pad': 'zero'},
+        {'values': values, 'trends': trends, 'normalize': 'minmax'},
+    ]
+
+    for param in params:
+        with pytest.raises(ValueError):
+            trendet.TrendWindows(**param)
+
+
+if __name__ == '__main__':
+    test_windows()
+    test_windows_errors()
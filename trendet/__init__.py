@@ -4,4 +4,20 @@
 __author__ = 'Alvaro Bartolome @ alvarobartt on GitHub'
 __version__ = '0.7'
 
-from .identification import identify_trends, identify_all_trends, identify_df_trends
+from .identification import identify_trends, identify_all_trends, identify_df_trends, identify_array_trends, \
+    identify_ohlc_trends, identify_timeframe_trends, iter_trends
+from .cache import TrendCache
+from .parallel import identify_dask_trends, identify_panel_trends, identify_chunked_trends
+from .signals import trend_signals
+from .store import TrendStore
+from .intervals import TrendIndex
+from .validation import check_engines
+from .preview import preview_trends
+from .membership import TrendMembership
+from .windows import TrendWindows
+from .server import TrendService, TrendServer
+from .sink import TrendWriter
+from .walkforward import identify_walk_forward_trends
+from .breadth import TrendBreadth
+from .runner import TrendRunner
+from .streams import TrendStreams
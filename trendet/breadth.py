@@ -0,0 +1,148 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+import pandas as pd
+
+
+TRENDS = ['Up Trend', 'Down Trend']
+
+
+def _timestamps(dates):
+    return np.asarray(dates).astype('datetime64[ns]')
+
+
+class TrendBreadth(object):
+    """
+    This class aggregates the trends of a universe of series into the number of series within an up and a down
+    trend on every date of a shared calendar, along with the breadth, which is the difference between both. Every
+    trend just adds +1 to the difference array of its direction on the date where it starts and -1 on the date after
+    it ends, so that the counts are the cumulative sum of the difference arrays, which costs O(trends + dates)
+    instead of stacking the labels of every series. The contribution of every series is kept, so that its trends can
+    be replaced when they are identified again, and the calendar can be extended with new dates, so that the breadth
+    is updated incrementally.
+
+    Args:
+        calendar (:obj:`numpy.ndarray`): sorted `datetime64` array with the dates of the shared calendar.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, calendar):
+        calendar = _timestamps(calendar)
+
+        if calendar.ndim != 1 or np.any(np.diff(calendar) <= np.timedelta64(0, 'ns')):
+            raise ValueError("calendar argument needs to be a 1-D `datetime64` array of sorted unique dates.")
+
+        self.calendar = calendar
+
+        self._changes = {name: np.zeros(len(calendar) + 1, dtype=np.int64) for name in TRENDS}
+        self._series = dict()
+
+    @classmethod
+    def from_trends(cls, trends, dates, calendar=None):
+        """
+        This function builds the breadth of the trends of several series, where `trends` is a :obj:`dict` with an
+        entry per series containing its trend positions as returned by `identify_panel_trends`, and `dates` is either
+        a single `datetime64` array shared by all the series, or a :obj:`dict` with the dates of every series. The
+        calendar is, by default, every date of any of the series.
+        """
+
+        if not isinstance(trends, dict):
+            raise ValueError("trends argument needs to be a `dict` as returned by `identify_panel_trends`.")
+
+        if calendar is None:
+            if isinstance(dates, dict):
+                calendar = np.unique(np.concatenate([_timestamps(dates[name]) for name in trends] or
+                                                    [np.array([], dtype='datetime64[ns]')]))
+            else:
+                calendar = np.unique(_timestamps(dates))
+
+        breadth = cls(calendar)
+
+        for name, directions in trends.items():
+            breadth.update(name, directions, dates[name] if isinstance(dates, dict) else dates)
+
+        return breadth
+
+    def _apply(self, series, sign):
+        for name, (starts, ends) in self._series[series].items():
+            np.add.at(self._changes[name], starts, sign)
+            np.add.at(self._changes[name], ends + 1, -sign)
+
+    def update(self, series, trends, dates):
+        """
+        This function adds the trends of the introduced series, as returned by `identify_array_trends`, whose values
+        are dated by `dates`, replacing its previous trends if it was already added. Every trend counts from the first
+        date of the calendar on or after the date where it starts, until the last date of the calendar on or before
+        the date where it ends.
+        """
+
+        if not isinstance(trends, dict):
+            raise ValueError("trends argument needs to be a `dict` as returned by `identify_array_trends`.")
+
+        dates = _timestamps(dates)
+
+        contributions = dict()
+
+        for name, positions in trends.items():
+            if name not in TRENDS:
+                raise ValueError("trends should just contain the keys [Up Trend, Down Trend]!")
+
+            positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+            starts = np.searchsorted(self.calendar, dates[positions[:, 0]], side='left')
+            ends = np.searchsorted(self.calendar, dates[positions[:, 1]], side='right') - 1
+
+            valid = starts <= ends
+
+            contributions[name] = (starts[valid], ends[valid])
+
+        self.remove(series)
+
+        self._series[series] = contributions
+        self._apply(series, 1)
+
+    def remove(self, series):
+        """
+        This function removes the trends of the introduced series, if it was added.
+        """
+
+        if series in self._series:
+            self._apply(series, -1)
+            del self._series[series]
+
+    def extend(self, dates):
+        """
+        This function appends the introduced dates, which need to be later than the last date of the calendar, to
+        the calendar; so that the trends of the series can then be updated with the values of the new dates.
+        """
+
+        dates = _timestamps(dates)
+
+        if dates.ndim != 1 or np.any(np.diff(dates) <= np.timedelta64(0, 'ns')) or \
+                (len(dates) and len(self.calendar) and dates[0] <= self.calendar[-1]):
+            raise ValueError("dates argument needs to be a 1-D `datetime64` array of sorted unique dates later than "
+                             "the last date of the calendar.")
+
+        for name in TRENDS:
+            # the trailing slot of the difference array just holds the -1 of the trends ending on the last date, which
+            # now falls on the first new date, so it is carried over
+            self._changes[name] = np.concatenate([self._changes[name], np.zeros(len(dates), dtype=np.int64)])
+
+        self.calendar = np.concatenate([self.calendar, dates])
+
+    def breadth(self):
+        """
+        This function returns a :obj:`pandas.DataFrame` indexed by the calendar, with the number of series within an
+        `Up Trend` and a `Down Trend` on every date and the `Breadth`, which is the difference between both.
+        """
+
+        counts = {name: np.cumsum(self._changes[name][:len(self.calendar)]) for name in TRENDS}
+
+        return pd.DataFrame({
+            'Up Trend': counts['Up Trend'],
+            'Down Trend': counts['Down Trend'],
+            'Breadth': counts['Up Trend'] - counts['Down Trend'],
+        }, index=pd.DatetimeIndex(self.calendar, name='Date'))
@@ -0,0 +1,182 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+from collections import OrderedDict
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from .utils import atomic_write
+
+
+class TrendCache(object):
+    """
+    This class memoizes the trends identified from a series so that identifying trends again over the same data and
+    with the same parameters does not require scanning it again. Results are stored in a bounded in-memory LRU and,
+    optionally, in an on-disk tier, keyed by a hash of the scanned data plus the identification parameters. The label
+    columns built from the trends of every result are memoized in memory along with them, so that a hit does not
+    require labelling the rows again either.
+
+    Args:
+        maxsize (:obj:`int`, optional): maximum number of results kept in memory, least recently used ones are evicted.
+        directory (:obj:`str`, optional): directory where results are also stored, so that they outlive the process.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, maxsize=128, directory=None):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError('maxsize must be an `int` equal or higher than 1!')
+
+        if directory is not None and not isinstance(directory, str):
+            raise ValueError('directory is neither None or a `str`!')
+
+        self.maxsize = maxsize
+        self.directory = directory
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self._results = OrderedDict()
+        self._labels = dict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(values, dates=None, **params):
+        """
+        This function computes the key of the introduced data and parameters, hashing the raw bytes of the values
+        and dates (or of every chunk of them) with BLAKE2b so that the key depends on the content of the data and not
+        on its identity.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+
+        for arrays in [values, dates]:
+            if arrays is None:
+                digest.update(b'none')
+                continue
+
+            for array in arrays if isinstance(arrays, list) else [arrays]:
+                if hasattr(array, 'asi8'):
+                    # tz-aware dates become an object array, so their nanoseconds are hashed along with their timezone
+                    digest.update(str(getattr(array, 'tz', None)).encode('utf-8'))
+                    array = array.asi8
+
+                array = np.ascontiguousarray(array)
+
+                digest.update(str((array.dtype.str, array.shape)).encode('utf-8'))
+                digest.update(array.view(np.uint8))
+
+        digest.update(repr(sorted(params.items())).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        This function returns the trends stored under the introduced key, or None if they are not cached.
+        """
+
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+
+                return self._results[key]
+
+        trends = self._load(key)
+
+        with self._lock:
+            if trends is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._store(key, trends)
+
+        return trends
+
+    def set(self, key, trends):
+        """
+        This function stores the introduced trends under the introduced key, both in memory and on disk.
+        """
+
+        with self._lock:
+            self._store(key, trends)
+
+        self._dump(key, trends)
+
+    def get_labels(self, key):
+        """
+        This function returns the label columns built from the trends stored under the introduced key, as a
+        :obj:`dict` with the array of the column per direction (or None if the direction has no trends to label), or
+        None if they are not memoized.
+        """
+
+        with self._lock:
+            return self._labels.get(key)
+
+    def set_labels(self, key, labels):
+        """
+        This function memoizes the introduced label columns along with the trends stored under the introduced key,
+        just in memory, so that they are evicted along with them.
+        """
+
+        with self._lock:
+            if key in self._results:
+                self._labels[key] = labels
+
+    def clear(self):
+        """
+        This function removes every result stored in memory, while the on-disk ones are kept.
+        """
+
+        with self._lock:
+            self._results.clear()
+            self._labels.clear()
+
+    @property
+    def stats(self):
+        """
+        This property returns a :obj:`dict` with the memory hits, disk hits and misses of the cache and its size.
+        """
+
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self._results),
+        }
+
+    def _store(self, key, trends):
+        self._results[key] = trends
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.maxsize:
+            evicted, _ = self._results.popitem(last=False)
+            self._labels.pop(evicted, None)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def _load(self, key):
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+
+        with np.load(self._path(key), allow_pickle=False) as data:
+            return {name: [tuple(trend) for trend in data[name].tolist()] for name in data.files}
+
+    def _dump(self, key, trends):
+        if self.directory is None:
+            return
+
+        arrays = {name: np.array(positions, dtype=np.int64).reshape(-1, 2) for name, positions in trends.items()}
+
+        atomic_write(self.directory, self._path(key), lambda f: np.savez(f, **arrays))
@@ -0,0 +1,259 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from .identification import identify_array_trends
+
+
+EXTENSIONS = ['.csv', '.parquet']
+
+
+def find_files(paths):
+    """
+    This function returns the sorted CSV and Parquet files contained in the introduced paths, which can either be
+    files, directories or glob patterns.
+    """
+
+    files = set()
+
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [os.path.join(path, name) for name in os.listdir(path)]
+        else:
+            candidates = glob.glob(path)
+
+        for candidate in candidates:
+            if os.path.isfile(candidate) and os.path.splitext(candidate)[1].lower() in EXTENSIONS:
+                files.add(os.path.abspath(candidate))
+
+    return sorted(files)
+
+
+def series_names(files):
+    """
+    This function returns the name of the series of every introduced file, which is its path relative to the deepest
+    directory containing all of them, without its extension; so that files named the same in different directories
+    are still told apart.
+    """
+
+    if not files:
+        return dict()
+
+    root = os.path.commonpath([os.path.dirname(path) for path in files])
+
+    return {path: os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '/') for path in files}
+
+
+def read_file(path, column, date_column=None):
+    """
+    This function reads the introduced CSV or Parquet file, returning the values of the specified column and, if
+    present, the dates of the specified date column.
+    """
+
+    if os.path.splitext(path)[1].lower() == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    if column not in df.columns:
+        raise ValueError("column " + column + " not found in " + path)
+
+    dates = None
+
+    if date_column is not None and date_column in df.columns:
+        dates = pd.to_datetime(df[date_column]).to_numpy()
+
+    return df[column].to_numpy(), dates
+
+
+def identify_file_trends(path, column, date_column=None, window_size=5, identify='both', series=None):
+    """
+    This function identifies the trends of the introduced file, returning a :obj:`pandas.DataFrame` with a row per
+    trend, identified by the introduced `series` name or, if not specified, by the name of the file; and the number
+    of rows of the file.
+    """
+
+    values, dates = read_file(path, column, date_column)
+
+    table = identify_array_trends(values, dates=dates, window_size=window_size, identify=identify, output='arrow')
+
+    if series is None:
+        series = os.path.splitext(os.path.basename(path))[0]
+
+    trends = table.to_pandas()
+    trends.insert(0, 'series', series)
+
+    return trends, len(values)
+
+
+def _part_path(directory, path, series, params):
+    # the part is keyed by the identification params, the name of the series and the size and modification time of
+    # the file too, so that the parts of files which changed or were identified with other params are not reused
+    stat = os.stat(path)
+
+    key = json.dumps([path, series, params, stat.st_size, stat.st_mtime_ns], sort_keys=True)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+    return os.path.join(directory, os.path.splitext(os.path.basename(path))[0] + '-' + digest + '.parquet')
+
+
+def _run(path, part, series, column, date_column, window_size, identify):
+    trends, rows = identify_file_trends(path, column, date_column, window_size, identify, series)
+
+    trends.to_parquet(part + '.tmp', index=False)
+    os.replace(part + '.tmp', part)
+
+    return rows, len(trends)
+
+
+def run(files, output, column='Close', date_column='Date', window_size=5, identify='both', processes=None,
+        resume=True, stream=sys.stdout):
+    """
+    This function identifies the trends of every introduced file across a process pool, writing the trends of every
+    file as soon as it is done into a progress directory next to the output, named as it followed by `.parts`; so
+    that if the run is interrupted, the files already done are skipped when it is resumed. The progress of every file
+    is keyed by its size and modification time and by the identification params, so that the files which changed
+    since, or the runs with other params, identify them again; and the stale progress is removed. The trends of every
+    file are named after it as explained in :obj:`series_names`. Once every file is done, their trends are
+    consolidated into a single Parquet file and throughput statistics are printed.
+
+    Returns:
+        :obj:`dict` - stats:
+            The function returns a :obj:`dict` with the number of files done and skipped, the number of rows and
+            trends of the files done, and the elapsed seconds.
+    """
+
+    directory = output + '.parts'
+
+    os.makedirs(directory, exist_ok=True)
+
+    start = time.time()
+
+    stats = {'files': 0, 'skipped': 0, 'failed': 0, 'rows': 0, 'trends': 0}
+
+    params = {
+        'column': column,
+        'date_column': date_column,
+        'window_size': window_size,
+        'identify': identify,
+        'version': __version__,
+    }
+
+    names = series_names(files)
+
+    parts = {path: _part_path(directory, path, names[path], params) for path in files}
+
+    for name in os.listdir(directory):
+        if os.path.join(directory, name) not in parts.values():
+            os.remove(os.path.join(directory, name))
+
+    pending = dict()
+
+    for path, part in parts.items():
+        if resume and os.path.exists(part):
+            stats['skipped'] += 1
+        else:
+            pending[path] = part
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(_run, path, part, names[path], column, date_column, window_size, identify): path
+            for path, part in pending.items()
+        }
+
+        for future in as_completed(futures):
+            try:
+                rows, trends = future.result()
+            except Exception as e:
+                stats['failed'] += 1
+                print(f'{futures[future]} failed with Exception: {e}', file=stream)
+                continue
+
+            stats['files'] += 1
+            stats['rows'] += rows
+            stats['trends'] += trends
+
+    parts = [part for part in parts.values() if os.path.exists(part)]
+
+    if parts:
+        trends = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+    else:
+        trends = pd.DataFrame({'series': [], 'trend': [], 'from': np.array([], dtype=np.int64),
+                               'to': np.array([], dtype=np.int64)})
+
+    trends.to_parquet(output + '.tmp', index=False)
+    os.replace(output + '.tmp', output)
+
+    stats['seconds'] = time.time() - start
+
+    print(f"{stats['files']} files done ({stats['skipped']} skipped, {stats['failed']} failed), "
+          f"{stats['rows']} rows and {stats['trends']} trends in {stats['seconds']:.2f}s "
+          f"({stats['rows'] / max(stats['seconds'], 1e-9):.0f} rows/s, "
+          f"{stats['files'] / max(stats['seconds'], 1e-9):.2f} files/s)", file=stream)
+
+    return stats
+
+
+def main(argv=None):
+    """
+    This function is the entry point of the `trendet` command, which identifies the trends of a directory or glob
+    of CSV/Parquet files into a single Parquet table.
+    """
+
+    parser = argparse.ArgumentParser(prog='trendet',
+                                     description='Identify the trends of a batch of CSV/Parquet files into a single '
+                                                 'Parquet table.')
+
+    parser.add_argument('paths', nargs='+', help='files, directories or glob patterns of CSV/Parquet files.')
+    parser.add_argument('-o', '--output', required=True, help='Parquet file where trends are written.')
+    parser.add_argument('-c', '--column', default='Close', help='column from where trends are identified.')
+    parser.add_argument('-d', '--date-column', default='Date', help='column containing the dates, if any.')
+    parser.add_argument('-w', '--window-size', type=int, default=5,
+                        help='number of days from where market behaviour is considered a trend.')
+    parser.add_argument('-i', '--identify', default='both', choices=['both', 'up', 'down'],
+                        help='which trends are identified.')
+    parser.add_argument('-p', '--processes', type=int, default=None, help='number of worker processes.')
+    parser.add_argument('--no-resume', action='store_true', help='identify again the files already done.')
+
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec('pyarrow') is None:
+        parser.error('pyarrow is required to write the trends as Parquet, install it via '
+                     '`python -m pip install pyarrow`.')
+
+    if args.window_size < 3:
+        parser.error('window_size must be an `int` equal or higher than 3!')
+
+    files = find_files(args.paths)
+
+    if not files:
+        parser.error('no CSV/Parquet files found.')
+
+    stats = run(files,
+                output=args.output,
+                column=args.column,
+                date_column=args.date_column,
+                window_size=args.window_size,
+                identify=args.identify,
+                processes=args.processes,
+                resume=not args.no_resume)
+
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
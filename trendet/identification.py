@@ -6,22 +6,25 @@ from investpy import get_stock_historical_data
 import numpy as np
 import pandas as pd
 
-from statistics import mean
-
 from unidecode import unidecode
 
 import datetime
-import string
+
+from .cache import TrendCache
+from .utils import RANK_BY, ENGINES, as_array, trends_table, trend_arrays, identify_positions, iter_positions, \
+    select_trends, trend_labels, assign_labels, index_dates, is_numeric, column_values
 
 
-def identify_trends(stock, country, from_date, to_date, window_size=5, trend_limit=3, labels=None, identify='both'):
+def identify_trends(stock, country, from_date, to_date, window_size=5, trend_limit=3, labels=None, identify='both',
+                    rank_by=None, engine='fast'):
     """
     This function retrieves historical data from the introduced `stock` between two dates from Investing via investpy;
     and that data is later going to be analysed in order to detect/identify trends over a certain date range. A trend
     is considered so based on the window_size, which specifies the number of consecutive days which lead the algorithm
     to identify the market behaviour as a trend. So on, this function will identify both up and down trends and will
     remove the ones that overlap, keeping just the longer trend and discarding the nested trend; but it will just
-    identify a maximum of trend_limit up and down trends which will be labeled as specified by labels list.
+    identify a maximum of trend_limit up and down trends which will be labeled as specified by labels list. If rank_by
+    is specified, the strongest trend_limit trends based on that score will be identified instead of the first ones.
 
     Args:
         stock (:obj:`str`): symbol of the stock to retrieve historical data from.
@@ -33,6 +36,12 @@ def identify_trends(stock, country, from_date, to_date, window_size=5, trend_lim
         labels (:obj:`list`, optional): name of the labels for every identified trend.
         identify (:obj:`str`, optional):
             which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        rank_by (:obj:`str`, optional):
+            score used to select the strongest trends, it can either be None (first trends in time order), 'length',
+            'move' or 'percentage'.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
 
     Returns:
         :obj:`pandas.DataFrame`:
@@ -103,6 +112,12 @@ def identify_trends(stock, country, from_date, to_date, window_size=5, trend_lim
     if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
         raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    if rank_by is not None and rank_by not in RANK_BY:
+        raise ValueError('rank_by should be either None or a `str` contained in [length, move, percentage]!')
+
     try:
         df = get_stock_historical_data(stock=stock,
                                        country=country,
@@ -111,148 +126,17 @@ def identify_trends(stock, country, from_date, to_date, window_size=5, trend_lim
     except Exception as e:
         raise RuntimeError(f'investpy function call failed with Exception: {e}!')
 
-    objs = list()
-
-    up_trend = {
-        'name': 'Up Trend',
-        'element': np.negative(df['Close'])
-    }
-
-    down_trend = {
-        'name': 'Down Trend',
-        'element': df['Close']
-    }
-
-    if identify == 'both':
-        objs.append(up_trend)
-        objs.append(down_trend)
-    elif identify == 'up':
-        objs.append(up_trend)
-    elif identify == 'down':
-        objs.append(down_trend)
-
-    results = dict()
-
-    for obj in objs:
-        limit = None
-        values = list()
-
-        trends = list()
-
-        for index, value in enumerate(obj['element'], 0):
-            if limit and limit > value:
-                values.append(value)
-                limit = mean(values)
-            elif limit and limit < value:
-                if len(values) > window_size:
-                    min_value = min(values)
-
-                    for counter, item in enumerate(values, 0):
-                        if item == min_value:
-                            break
-
-                    to_trend = from_trend + counter
-
-                    trend = {
-                        'from': df.index.tolist()[from_trend],
-                        'to': df.index.tolist()[to_trend],
-                    }
-
-                    trends.append(trend)
-
-                limit = None
-                values = list()
-            else:
-                from_trend = index
-
-                values.append(value)
-                limit = mean(values)
-
-        results[obj['name']] = trends
-
-    if identify == 'both':
-        up_trends = list()
-
-        for up in results['Up Trend']:
-            flag = True
-
-            for down in results['Down Trend']:
-                if down['from'] < up['from'] < down['to'] or down['from'] < up['to'] < down['to']:
-                    if (up['to'] - up['from']).days > (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
-
-            if flag is True:
-                up_trends.append(up)
-
-        if labels is None:
-            up_labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
-        else:
-            up_labels = labels
-
-        for up_trend, up_label in zip(up_trends, up_labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = up_label
-
-        down_trends = list()
-
-        for down in results['Down Trend']:
-            flag = True
+    return _identify(df=df,
+                     column='Close',
+                     window_size=window_size,
+                     identify=identify,
+                     trend_limit=trend_limit,
+                     labels=labels,
+                     rank_by=rank_by,
+                     engine=engine)
 
-            for up in results['Up Trend']:
-                if up['from'] < down['from'] < up['to'] or up['from'] < down['to'] < up['to']:
-                    if (up['to'] - up['from']).days < (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
 
-            if flag is True:
-                down_trends.append(down)
-
-        if labels is None:
-            down_labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
-        else:
-            down_labels = labels
-
-        for down_trend, down_label in zip(down_trends, down_labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = down_label
-
-        return df
-    elif identify == 'up':
-        up_trends = results['Up Trend']
-
-        if labels is None:
-            up_labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
-        else:
-            up_labels = labels
-
-        for up_trend, up_label in zip(up_trends, up_labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = up_label
-
-        return df
-    elif identify == 'down':
-        down_trends = results['Down Trend']
-
-        if labels is None:
-            down_labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
-        else:
-            down_labels = labels
-
-        for down_trend, down_label in zip(down_trends, down_labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = down_label
-
-        return df
-
-
-def identify_all_trends(stock, country, from_date, to_date, window_size=5, identify='both'):
+def identify_all_trends(stock, country, from_date, to_date, window_size=5, identify='both', engine='fast'):
     """
     This function retrieves historical data from the introduced `stock` between two dates from Investing via investpy;
     and that data is later going to be analysed in order to detect/identify trends over a certain date range. A trend
@@ -268,6 +152,9 @@ def identify_all_trends(stock, country, from_date, to_date, window_size=5, ident
         window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
         identify (:obj:`str`, optional):
             which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
 
     Returns:
         :obj:`pandas.DataFrame`:
@@ -325,6 +212,9 @@ def identify_all_trends(stock, country, from_date, to_date, window_size=5, ident
     if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
         raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
     try:
         df = get_stock_historical_data(stock=stock,
                                        country=country,
@@ -333,156 +223,276 @@ def identify_all_trends(stock, country, from_date, to_date, window_size=5, ident
     except Exception as e:
         raise RuntimeError(f'investpy function call failed with Exception: {e}!')
 
-    objs = list()
+    return _identify(df=df, column='Close', window_size=window_size, identify=identify, engine=engine)
+
+
+def identify_df_trends(df, column, window_size=5, identify='both', cache=None, engine='fast'):
+    """
+    This function receives as input a pandas.DataFrame from which data is going to be analysed in order to
+    detect/identify trends over a certain date range. A trend is considered so based on the window_size, which
+    specifies the number of consecutive days which lead the algorithm to identify the market behaviour as a trend. So
+    on, this function will identify both up and down trends and will remove the ones that overlap, keeping just the
+    longer trend and discarding the nested trend. Besides `int64` and `float64` columns, nullable and Arrow-backed
+    numeric columns without null values are supported too, and read without copying them. If a `TrendCache` is
+    specified, the identified trends are memoized so that identifying them again over the same data and parameters
+    does not require scanning it again.
+
+    Args:
+        df (:obj:`pandas.DataFrame`): dataframe containing the data to be analysed.
+        column (:obj:`str`): name of the column from where trends are going to be identified.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        cache (:obj:`trendet.TrendCache`, optional): cache where the identified trends are memoized.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
+
+    Returns:
+        :obj:`pandas.DataFrame`:
+            The function returns a :obj:`pandas.DataFrame` which contains the retrieved historical data from Investing
+            using `investpy`, with a new column which identifies every trend found on the market between two dates
+            identifying when did the trend started and when did it end. So the additional column contains labeled date
+            ranges, representing both bullish (up) and bearish (down) trends.
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if df is None:
+        raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
+
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
+
+    if column is None:
+        raise ValueError("column parameter is mandatory and must be a valid column name.")
+
+    if column and not isinstance(column, str):
+        raise ValueError("column argument needs to be a `str`.")
+
+    if isinstance(df, pd.DataFrame):
+        if column not in df.columns:
+            raise ValueError("introduced column does not match any column from the specified `pandas.DataFrame`.")
+        else:
+            if not is_numeric(df[column].dtype):
+                raise ValueError("supported values are just `int` or `float`, and the specified column of the "
+                                 "introduced `pandas.DataFrame` is " + str(df[column].dtype))
+
+            if not isinstance(df[column].dtype, np.dtype) and df[column].isna().any():
+                raise ValueError("the specified column of the introduced `pandas.DataFrame` contains null values.")
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    if cache is not None and not isinstance(cache, TrendCache):
+        raise ValueError('cache is neither None or a `trendet.TrendCache`!')
+
+    return _identify(df=df, column=column, window_size=window_size, identify=identify, cache=cache, engine=engine)
+
+
+def identify_array_trends(values, dates=None, window_size=5, identify='both', output='numpy', engine='fast'):
+    """
+    This function receives as input a 1-D :obj:`numpy.ndarray`, which can also be a :obj:`numpy.memmap`, from which
+    data is going to be analysed in order to detect/identify trends, without wrapping it into a `pandas.DataFrame`.
+    The array is read in chunks and never copied, so that memory-mapped data can be scanned without materializing it.
+    Arrow arrays, Polars series and Arrow-backed or nullable `pandas.Series` are supported too, and their buffers
+    are read without copying them. So on, this function will identify both up and down trends and will remove the
+    ones that overlap, keeping just the longer trend and discarding the nested trend, just like `identify_df_trends`
+    does.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values to be analysed, which can also be a `pandas.Series`, a
+            `pyarrow.Array`, a `pyarrow.ChunkedArray` or a `polars.Series` without null values.
+        dates (:obj:`numpy.ndarray`, optional):
+            1-D `datetime64` array (or any of the types supported for values) with the timestamp of every value, used
+            to measure the duration of the trends in days when removing the overlapping ones. If not specified,
+            durations are measured in positions.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        output (:obj:`str`, optional): format of the identified trends, it can either be 'numpy' or 'arrow'.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
+
+    Returns:
+        :obj:`dict` or :obj:`pyarrow.Table`:
+            The function returns a :obj:`dict` with the keys `Up Trend` and/or `Down Trend`, whose values are
+            :obj:`numpy.ndarray` of shape (n, 2) containing the positions where every identified trend starts and
+            ends, both included. If output is 'arrow', a :obj:`pyarrow.Table` with a row per trend containing its
+            `trend` direction, its `from` and `to` positions and, if dates were specified, its `from_date` and
+            `to_date` is returned instead.
 
-    up_trend = {
-        'name': 'Up Trend',
-        'element': np.negative(df['Close'])
-    }
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
 
-    down_trend = {
-        'name': 'Down Trend',
-        'element': df['Close']
-    }
+    if values is None:
+        raise ValueError("values argument is mandatory and needs to be a `numpy.ndarray`.")
 
-    if identify == 'both':
-        objs.append(up_trend)
-        objs.append(down_trend)
-    elif identify == 'up':
-        objs.append(up_trend)
-    elif identify == 'down':
-        objs.append(down_trend)
+    values = as_array(values)
 
-    results = dict()
+    arrays = values if isinstance(values, list) else [values]
 
-    for obj in objs:
-        limit = None
-        values = list()
+    for array in arrays:
+        if array.ndim != 1:
+            raise ValueError("values argument needs to be a 1-D `numpy.ndarray`.")
 
-        trends = list()
+        if array.dtype.kind not in ['i', 'u', 'f']:
+            raise ValueError("supported values are just `int` or `float`, and the introduced `numpy.ndarray` is "
+                             + str(array.dtype))
 
-        for index, value in enumerate(obj['element'], 0):
-            if limit and limit > value:
-                values.append(value)
-                limit = mean(values)
-            elif limit and limit < value:
-                if len(values) > window_size:
-                    min_value = min(values)
+    if dates is not None:
+        dates = as_array(dates)
 
-                    for counter, item in enumerate(values, 0):
-                        if item == min_value:
-                            break
+        if isinstance(dates, list):
+            dates = np.concatenate(dates)
 
-                    to_trend = from_trend + counter
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            raise ValueError("dates argument needs to be a `datetime64` `numpy.ndarray`.")
 
-                    trend = {
-                        'from': df.index.tolist()[from_trend],
-                        'to': df.index.tolist()[to_trend],
-                    }
+        if dates.shape != (sum(len(array) for array in arrays),):
+            raise ValueError("dates argument needs to have the same length as values.")
 
-                    trends.append(trend)
+    if output not in ['numpy', 'arrow']:
+        raise ValueError('output should be a `str` contained in [numpy, arrow]!')
 
-                limit = None
-                values = list()
-            else:
-                from_trend = index
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
 
-                values.append(value)
-                limit = mean(values)
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
 
-        results[obj['name']] = trends
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
-    if identify == 'both':
-        up_trends = list()
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
 
-        for up in results['Up Trend']:
-            flag = True
+    trends = trend_arrays(identify_positions(values, dates, window_size, identify, engine),
+                          sum(len(array) for array in arrays))
 
-            for down in results['Down Trend']:
-                if down['from'] < up['from'] < down['to'] or down['from'] < up['to'] < down['to']:
-                    if (up['to'] - up['from']).days > (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
+    if output == 'arrow':
+        return trends_table(trends, dates)
 
-            if flag is True:
-                up_trends.append(up)
+    return trends
 
-        labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
 
-        for up_trend, label in zip(up_trends, labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = label
+def iter_trends(values, dates=None, window_size=5, identify='both', engine='fast'):
+    """
+    This function lazily identifies the trends of the introduced 1-D :obj:`numpy.ndarray`, yielding every trend in
+    time order as soon as the scan confirms it, so that the scan stops whenever the caller stops iterating; e.g. the
+    first k trends since a certain date are `itertools.islice(iter_trends(values[start:]), k)`, which just scans the
+    values until those are confirmed instead of the whole series. The yielded trends are the same ones that
+    `identify_array_trends` identifies, which means that if both up and down trends are identified, a trend
+    overlapping the last trend of the opposite direction scanned so far is just confirmed once another trend of the
+    opposite direction is closed, or at the end of the values, as it is removed if the overlapping trend is the last
+    one of its direction.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values to be analysed, or any of the types supported by
+            `identify_array_trends`.
+        dates (:obj:`numpy.ndarray`, optional):
+            1-D `datetime64` array with the timestamp of every value, used to measure the duration of the trends in
+            days when removing the overlapping ones. If not specified, durations are measured in positions.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional): engine used to scan the values, it can either be 'fast' or 'reference'.
+
+    Returns:
+        :obj:`generator`:
+            The function returns a generator yielding a tuple per trend, containing its direction, which is either
+            `Up Trend` or `Down Trend`, and the positions where it starts and ends, both included; sorted by the
+            position where they start and end.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if values is None:
+        raise ValueError("values argument is mandatory and needs to be a `numpy.ndarray`.")
 
-        down_trends = list()
+    values = as_array(values)
 
-        for down in results['Down Trend']:
-            flag = True
+    if isinstance(values, list):
+        values = np.concatenate(values)
 
-            for up in results['Up Trend']:
-                if up['from'] < down['from'] < up['to'] or up['from'] < down['to'] < up['to']:
-                    if (up['to'] - up['from']).days < (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
+    if values.ndim != 1 or values.dtype.kind not in ['i', 'u', 'f']:
+        raise ValueError("values argument needs to be a 1-D `numpy.ndarray` of `int` or `float` values.")
 
-            if flag is True:
-                down_trends.append(down)
+    if dates is not None:
+        dates = as_array(dates)
 
-        labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
+        if isinstance(dates, list):
+            dates = np.concatenate(dates)
 
-        for down_trend, label in zip(down_trends, labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = label
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            raise ValueError("dates argument needs to be a `datetime64` `numpy.ndarray`.")
 
-        return df
-    elif identify == 'up':
-        up_trends = results['Up Trend']
+        if dates.shape != values.shape:
+            raise ValueError("dates argument needs to have the same length as values.")
 
-        up_labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
 
-        for up_trend, up_label in zip(up_trends, up_labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = up_label
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
 
-        return df
-    elif identify == 'down':
-        down_trends = results['Down Trend']
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
-        down_labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
-        for down_trend, down_label in zip(down_trends, down_labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = down_label
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
 
-        return df
+    return iter_positions(values, dates, window_size, identify, engine)
 
 
-def identify_df_trends(df, column, window_size=5, identify='both'):
+def identify_ohlc_trends(df, columns=None, window_size=5, identify='both', engine='fast'):
     """
-    This function receives as input a pandas.DataFrame from which data is going to be analysed in order to
-    detect/identify trends over a certain date range. A trend is considered so based on the window_size, which
-    specifies the number of consecutive days which lead the algorithm to identify the market behaviour as a trend. So
-    on, this function will identify both up and down trends and will remove the ones that overlap, keeping just the
-    longer trend and discarding the nested trend.
+    This function receives as input a pandas.DataFrame formatted as OHLC from which the specified columns are going
+    to be analysed in order to detect/identify trends over a certain date range, so that, for example, the trends
+    identified over the `Close` values can be confirmed with the ones identified over the `High` and `Low` values.
+    Every column is read without copying it whenever it can be, and then scanned on its own.
 
     Args:
         df (:obj:`pandas.DataFrame`): dataframe containing the data to be analysed.
-        column (:obj:`str`): name of the column from where trends are going to be identified.
+        columns (:obj:`list`, optional):
+            names of the columns from where trends are going to be identified, which by default are the `Open`,
+            `High`, `Low` and `Close` ones.
         window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
         identify (:obj:`str`, optional):
             which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
 
     Returns:
         :obj:`pandas.DataFrame`:
-            The function returns a :obj:`pandas.DataFrame` which contains the retrieved historical data from Investing
-            using `investpy`, with a new column which identifies every trend found on the market between two dates
-            identifying when did the trend started and when did it end. So the additional column contains labeled date
-            ranges, representing both bullish (up) and bearish (down) trends.
+            The function returns the introduced :obj:`pandas.DataFrame` with two new columns per analysed column,
+            named as the column followed by `Up Trend` and `Down Trend` (e.g. `High Up Trend`), which contain the
+            labeled date ranges of every identified bullish (up) and bearish (down) trend of that column.
+
     Raises:
         ValueError: raised if any of the introduced arguments errored.
     """
@@ -493,19 +503,27 @@ def identify_df_trends(df, column, window_size=5, identify='both'):
     if not isinstance(df, pd.DataFrame):
         raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
 
-    if column is None:
-        raise ValueError("column parameter is mandatory and must be a valid column name.")
+    if columns is None:
+        columns = ['Open', 'High', 'Low', 'Close']
 
-    if column and not isinstance(column, str):
-        raise ValueError("column argument needs to be a `str`.")
+    if not isinstance(columns, list) or len(columns) < 1:
+        raise ValueError("columns argument needs to be a non empty `list` of column names.")
+
+    for column in columns:
+        if not isinstance(column, str):
+            raise ValueError("columns argument needs to be a non empty `list` of column names.")
 
-    if isinstance(df, pd.DataFrame):
         if column not in df.columns:
-            raise ValueError("introduced column does not match any column from the specified `pandas.DataFrame`.")
-        else:
-            if df[column].dtype not in ['int64', 'float64']:
-                raise ValueError("supported values are just `int` or `float`, and the specified column of the "
-                                 "introduced `pandas.DataFrame` is " + str(df[column].dtype))
+            raise ValueError("introduced column " + column + " does not match any column from the specified "
+                             "`pandas.DataFrame`.")
+
+        if not is_numeric(df[column].dtype):
+            raise ValueError("supported values are just `int` or `float`, and the specified column " + column +
+                             " of the introduced `pandas.DataFrame` is " + str(df[column].dtype))
+
+        if not isinstance(df[column].dtype, np.dtype) and df[column].isna().any():
+            raise ValueError("the specified column " + column + " of the introduced `pandas.DataFrame` contains null "
+                             "values.")
 
     if not isinstance(window_size, int):
         raise ValueError('window_size must be an `int`')
@@ -519,130 +537,192 @@ def identify_df_trends(df, column, window_size=5, identify='both'):
     if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
         raise ValueError('identify should be a `str` contained in [both, up, down]!')
 
-    objs = list()
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
 
-    up_trend = {
-        'name': 'Up Trend',
-        'element': np.negative(df[column])
-    }
+    dates = index_dates(df.index)
 
-    down_trend = {
-        'name': 'Down Trend',
-        'element': df[column]
-    }
+    for column in columns:
+        trends = identify_positions(column_values(df[column]), dates, window_size, identify, engine)
 
-    if identify == 'both':
-        objs.append(up_trend)
-        objs.append(down_trend)
-    elif identify == 'up':
-        objs.append(up_trend)
-    elif identify == 'down':
-        objs.append(down_trend)
+        for name, positions in trends.items():
+            assign_labels(df, column + ' ' + name, positions, trend_labels(len(positions)))
 
-    results = dict()
+    return df
 
-    for obj in objs:
-        limit = None
-        values = list()
 
-        trends = list()
+def identify_timeframe_trends(df, column, timeframes, window_size=5, identify='both', engine='fast'):
+    """
+    This function receives as input a pandas.DataFrame with a `DatetimeIndex`, containing the base data to be
+    analysed, from which trends are going to be identified over several timeframes (bar sizes) at once. Every
+    timeframe is aggregated from the next finer one instead of from the base data, keeping the last value of every bar,
+    so that each aggregation only processes the bars of the previous timeframe. The trends identified at every
+    timeframe are then aligned back to the timestamps of the base data, so that they cover every base row contained
+    in the bars where the trend starts and ends.
 
-        for index, value in enumerate(obj['element'], 0):
-            if limit and limit > value:
-                values.append(value)
-                limit = mean(values)
-            elif limit and limit < value:
-                if len(values) > window_size:
-                    min_value = min(values)
+    Args:
+        df (:obj:`pandas.DataFrame`): dataframe containing the base data to be analysed.
+        column (:obj:`str`): name of the column from where trends are going to be identified.
+        timeframes (:obj:`list`):
+            bar sizes as `str` (e.g. ['5min', '1h', '1D']) sorted from the finest to the coarsest one, where every
+            timeframe needs to be a multiple of the previous one.
+        window_size (:obj:`window`, optional): number of bars from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
 
-                    for counter, item in enumerate(values, 0):
-                        if item == min_value:
-                            break
+    Returns:
+        :obj:`pandas.DataFrame`:
+            The function returns the introduced :obj:`pandas.DataFrame` with two new columns per timeframe, named as
+            the timeframe followed by `Up Trend` and `Down Trend` (e.g. `1h Up Trend`), which contain the labeled
+            ranges of base rows covered by every bullish (up) and bearish (down) trend of that timeframe.
 
-                    to_trend = from_trend + counter
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if df is None:
+        raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
+
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
 
-                    trend = {
-                        'from': df.index.tolist()[from_trend],
-                        'to': df.index.tolist()[to_trend],
-                    }
+    if not isinstance(df.index, pd.DatetimeIndex) or not df.index.is_monotonic_increasing:
+        raise ValueError("df argument needs to have a sorted `pandas.DatetimeIndex`.")
+
+    if column is None:
+        raise ValueError("column parameter is mandatory and must be a valid column name.")
+
+    if column and not isinstance(column, str):
+        raise ValueError("column argument needs to be a `str`.")
 
-                    trends.append(trend)
+    if column not in df.columns:
+        raise ValueError("introduced column does not match any column from the specified `pandas.DataFrame`.")
 
-                limit = None
-                values = list()
-            else:
-                from_trend = index
+    if not is_numeric(df[column].dtype):
+        raise ValueError("supported values are just `int` or `float`, and the specified column of the "
+                         "introduced `pandas.DataFrame` is " + str(df[column].dtype))
 
-                values.append(value)
-                limit = mean(values)
+    if not isinstance(timeframes, list) or len(timeframes) < 1:
+        raise ValueError("timeframes argument needs to be a non empty `list` of bar sizes.")
 
-        results[obj['name']] = trends
+    sizes = list()
 
-    if identify == 'both':
-        up_trends = list()
+    for timeframe in timeframes:
+        try:
+            sizes.append(pd.Timedelta(timeframe))
+        except (TypeError, ValueError):
+            raise ValueError("timeframes argument needs to be a non empty `list` of bar sizes, and " +
+                             str(timeframe) + " is not a valid one.")
+
+    for finer, coarser in zip(sizes[:-1], sizes[1:]):
+        if coarser <= finer or coarser % finer != pd.Timedelta(0):
+            raise ValueError("every timeframe needs to be a multiple of the previous one.")
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    bars = df[column]
+
+    for timeframe, size in zip(timeframes, sizes):
+        bars = bars.resample(size).last().dropna()
+
+        trends = trend_arrays(identify_positions(column_values(bars), bars.index, window_size, identify, engine),
+                              len(bars))
+
+        for name, positions in trends.items():
+            aligned = list()
+
+            for from_trend, to_trend in positions.tolist():
+                start = df.index.searchsorted(bars.index[from_trend], side='left')
+                end = df.index.searchsorted(bars.index[to_trend] + size, side='left') - 1
+
+                aligned.append((start, end))
+
+            assign_labels(df, str(timeframe) + ' ' + name, aligned, trend_labels(len(aligned)))
+
+    return df
+
+
+def _identify(df, column, window_size, identify, trend_limit=None, labels=None, rank_by=None, cache=None,
+              engine='fast'):
+    """
+    This function identifies the up and/or down trends of the specified column of the introduced `pandas.DataFrame`,
+    removes the ones that overlap if both are identified, and labels up to trend_limit trends of each direction
+    in new columns named `Up Trend` and `Down Trend`. Identified trends are memoized in the cache, if any.
+    """
 
-        for up in results['Up Trend']:
-            flag = True
+    values = as_array(df[column])
+    dates = index_dates(df.index)
 
-            for down in results['Down Trend']:
-                if down['from'] < up['from'] < down['to'] or down['from'] < up['to'] < down['to']:
-                    if (up['to'] - up['from']).days > (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
+    if cache is None and trend_limit is not None and rank_by is None:
+        # just the first trend_limit trends of every direction are labeled, so the scan stops once they are confirmed
+        trends = dict()
 
-            if flag is True:
-                up_trends.append(up)
+        if identify in ['both', 'up']:
+            trends['Up Trend'] = list()
 
-        labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
+        if identify in ['both', 'down']:
+            trends['Down Trend'] = list()
 
-        for up_trend, label in zip(up_trends, labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = label
+        for name, from_trend, to_trend in iter_positions(values, dates, window_size, identify, engine):
+            trends[name].append((from_trend, to_trend))
 
-        down_trends = list()
+            if all(len(positions) >= trend_limit for positions in trends.values()):
+                break
+    elif cache is None:
+        trends = identify_positions(values, dates, window_size, identify, engine)
+    else:
+        key = cache.key(values, dates, window_size=window_size, identify=identify, engine=engine)
+        trends = cache.get(key)
 
-        for down in results['Down Trend']:
-            flag = True
+        if trends is None:
+            trends = identify_positions(values, dates, window_size, identify, engine)
+            cache.set(key, trends)
 
-            for up in results['Up Trend']:
-                if up['from'] < down['from'] < up['to'] or up['from'] < down['to'] < up['to']:
-                    if (up['to'] - up['from']).days < (down['to'] - down['from']).days:
-                        flag = True
-                    else:
-                        flag = False
-                else:
-                    flag = True
+    # the label columns of every trend are memoized along with the trends, unless just some of them are labeled
+    memoize = cache is not None and trend_limit is None and labels is None
 
-            if flag is True:
-                down_trends.append(down)
+    columns = cache.get_labels(key) if memoize else None
+    memoized = dict()
 
-        labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
+    # ends beyond the values are clamped before selecting, as ranking the trends reads the values where they end
+    trends = trend_arrays(trends, len(df))
 
-        for down_trend, label in zip(down_trends, labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = label
+    for name in ['Up Trend', 'Down Trend']:
+        if name not in trends:
+            continue
 
-        return df
-    elif identify == 'up':
-        up_trends = results['Up Trend']
+        if name in df.columns:
+            # the existing labels of the column are kept outside of the trends, so they can not be memoized
+            memoize = False
+        elif columns is not None:
+            if columns[name] is not None:
+                df[name] = columns[name].copy()
 
-        up_labels = [letter for letter in string.ascii_uppercase[:len(up_trends)]]
+            continue
 
-        for up_trend, up_label in zip(up_trends, up_labels):
-            for index, row in df[up_trend['from']:up_trend['to']].iterrows():
-                df.loc[index, 'Up Trend'] = up_label
+        selected = select_trends(trends[name].tolist(), values, trend_limit, rank_by)
 
-        return df
-    elif identify == 'down':
-        down_trends = results['Down Trend']
+        assign_labels(df, name, selected, labels if labels is not None else trend_labels(len(selected)))
 
-        down_labels = [letter for letter in string.ascii_uppercase[:len(down_trends)]]
+        memoized[name] = df[name].array.copy() if name in df.columns else None
 
-        for down_trend, down_label in zip(down_trends, down_labels):
-            for index, row in df[down_trend['from']:down_trend['to']].iterrows():
-                df.loc[index, 'Down Trend'] = down_label
+    if memoize and columns is None:
+        cache.set_labels(key, memoized)
 
-        return df
+    return df
@@ -0,0 +1,158 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+import pandas as pd
+
+
+def _timestamps(dates):
+    return np.asarray(dates).astype('datetime64[ns]').astype(np.int64)
+
+
+class TrendIndex(object):
+    """
+    This class indexes the trends of many series so as to answer which series are trending on a certain date, or
+    within a certain date range, without going through the trends of every series. The trends of every direction
+    are kept sorted by series and start date in flat arrays, along with the running maximum end date of every
+    series; so that every series is resolved with a single binary search, and the binary searches of all the series
+    are run at once as a single vectorized :obj:`numpy.searchsorted` call.
+
+    Args:
+        series (:obj:`numpy.ndarray`): identifier of the series of every trend.
+        trend (:obj:`numpy.ndarray`): direction of every trend, either `Up Trend` or `Down Trend`.
+        from_date (:obj:`numpy.ndarray`): date where every trend starts.
+        to_date (:obj:`numpy.ndarray`): date where every trend ends.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, series, trend, from_date, to_date):
+        series = np.asarray(series, dtype=object)
+        trend = np.asarray(trend, dtype=object)
+
+        from_date = _timestamps(from_date)
+        to_date = _timestamps(to_date)
+
+        if not (series.shape == trend.shape == from_date.shape == to_date.shape) or series.ndim != 1:
+            raise ValueError("series, trend, from_date and to_date need to be 1-D arrays of the same length.")
+
+        self.names, codes = np.unique(series.astype(str), return_inverse=True)
+
+        codes = codes.reshape(-1)
+
+        self._directions = dict()
+
+        for name in ['Up Trend', 'Down Trend']:
+            selected = trend == name
+
+            self._directions[name] = self._build(codes[selected], from_date[selected], to_date[selected])
+
+    @staticmethod
+    def _build(codes, starts, ends):
+        order = np.lexsort((starts, codes))
+
+        codes, starts, ends = codes[order].astype(np.int64), starts[order], ends[order]
+
+        calendar = np.unique(starts)
+
+        keys = codes * (len(calendar) + 1) + np.searchsorted(calendar, starts)
+
+        max_ends = ends.copy()
+
+        if ends.size:
+            boundaries = np.flatnonzero(np.diff(codes)) + 1
+
+            for block in np.split(np.arange(ends.size), boundaries):
+                max_ends[block] = np.maximum.accumulate(ends[block])
+
+        return {
+            'calendar': calendar,
+            'keys': keys,
+            'codes': codes,
+            'max_ends': max_ends,
+        }
+
+    @classmethod
+    def from_trends(cls, trends, dates):
+        """
+        This function builds the index from the trends of several series, where `trends` is a :obj:`dict` with an
+        entry per series containing its trend positions as returned by `identify_array_trends`, and `dates` is either
+        a single `datetime64` array shared by all the series, or a :obj:`dict` with the dates of every series.
+        """
+
+        series, trend, from_date, to_date = list(), list(), list(), list()
+
+        for name, directions in trends.items():
+            series_dates = _timestamps(dates[name] if isinstance(dates, dict) else dates)
+
+            for direction, positions in directions.items():
+                positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+                series.extend([name] * len(positions))
+                trend.extend([direction] * len(positions))
+                from_date.append(series_dates[positions[:, 0]])
+                to_date.append(series_dates[positions[:, 1]])
+
+        empty = np.array([], dtype=np.int64)
+
+        return cls(series,
+                   trend,
+                   np.concatenate(from_date or [empty]).astype('datetime64[ns]'),
+                   np.concatenate(to_date or [empty]).astype('datetime64[ns]'))
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        This function builds the index from a :obj:`pandas.DataFrame` with a row per trend, containing its `series`,
+        `trend`, `from_date` and `to_date`, as returned by `TrendStore.query`.
+        """
+
+        return cls(df['series'].to_numpy(), df['trend'].to_numpy(), df['from_date'].to_numpy(),
+                   df['to_date'].to_numpy())
+
+    def mask(self, start, end=None, trend='Up Trend'):
+        """
+        This function returns a boolean :obj:`numpy.ndarray`, aligned with the `names` of the indexed series, which
+        tells whether every series has a trend of the introduced direction overlapping the introduced date range, or
+        containing the introduced date if just `start` is specified.
+        """
+
+        if trend not in self._directions:
+            raise ValueError("trend should be a `str` contained in [Up Trend, Down Trend]!")
+
+        start = int(pd.Timestamp(start).value)
+        end = start if end is None else int(pd.Timestamp(end).value)
+
+        index = self._directions[trend]
+
+        codes = np.arange(len(self.names), dtype=np.int64)
+
+        rank = np.searchsorted(index['calendar'], end, side='right') - 1
+
+        positions = np.searchsorted(index['keys'], codes * (len(index['calendar']) + 1) + rank, side='right') - 1
+
+        valid = (positions >= 0) & (rank >= 0)
+
+        positions = np.where(valid, positions, 0)
+
+        if not index['codes'].size:
+            return np.zeros(len(self.names), dtype=bool)
+
+        return valid & (index['codes'][positions] == codes) & (index['max_ends'][positions] >= start)
+
+    def trending(self, date, trend='Up Trend'):
+        """
+        This function returns the names of the series which are within a trend of the introduced direction on the
+        introduced date.
+        """
+
+        return self.names[self.mask(date, trend=trend)].tolist()
+
+    def overlapping(self, start, end, trend='Up Trend'):
+        """
+        This function returns the names of the series which have a trend of the introduced direction overlapping the
+        introduced date range, both included.
+        """
+
+        return self.names[self.mask(start, end, trend=trend)].tolist()
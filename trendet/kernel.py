@@ -0,0 +1,125 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import math
+import threading
+
+import numpy as np
+
+
+_lock = threading.Lock()
+
+_kernel = None
+
+
+def _scan(values, start, negate, window_size):
+    """
+    This function scans the introduced array from the introduced position on, starting with an empty scan, exactly as
+    :obj:`trendet.utils.FastTrendScanner` does; but keeping the running sum of the segment as a float along with its
+    rounding error, instead of as an exact integer. While no rounding happened, the mean is exact and so are the
+    comparisons against it; otherwise, the scan stops at the first value which is too close to the mean (or the mean
+    too close to zero) to be compared without exact arithmetic, as well as at the first non-finite value.
+
+    Returns the trends found, the position where the scan stopped (the length of the array if it was not stopped) and
+    the position where the segment being scanned when it stopped began, or -1 if the scan was empty.
+    """
+
+    length = values.shape[0]
+
+    trends = np.empty(((length - start) // (window_size + 2) + 1, 2), dtype=np.int64)
+    number = 0
+
+    count = 0
+    window_start = -1
+    from_trend = 0
+    min_value = 0.0
+    min_position = 0
+    high = 0.0
+    low = 0.0
+    magnitude = 0.0
+    exact = True
+
+    for index in range(start, length):
+        value = float(values[index])
+
+        if negate:
+            value = -value
+
+        if not math.isfinite(value):
+            return trends[:number], index, window_start
+
+        limit = 0.0
+
+        if count > 0:
+            if exact:
+                limit = high / count
+            else:
+                limit = (high + low) / count
+                bound = 1e-15 * abs(limit) + 1e-30 * magnitude + 1e-300
+
+                if abs(limit) <= bound or abs(value - limit) <= bound or not math.isfinite(limit):
+                    return trends[:number], index, window_start
+
+        if limit != 0.0 and limit < value:
+            if count > window_size:
+                trends[number, 0] = from_trend
+                trends[number, 1] = from_trend + min_position - window_start
+                number += 1
+
+            count = 0
+            window_start = -1
+            high = 0.0
+            low = 0.0
+            magnitude = 0.0
+            exact = True
+
+            continue
+
+        if limit == 0.0 or limit == value:
+            from_trend = index
+
+        if count == 0:
+            window_start = index
+
+        if count == 0 or value < min_value:
+            min_value = value
+            min_position = index
+
+        total = high + value
+        rounded = total - high
+        error = (high - (total - rounded)) + (value - rounded)
+
+        high = total
+
+        if error != 0.0:
+            low += error
+            exact = False
+
+        magnitude += abs(value)
+        count += 1
+
+    return trends[:number], length, window_start
+
+
+def scan_kernel(dtype):
+    """
+    This function returns the scan kernel compiled with numba, which runs without holding the GIL so that several
+    series can be scanned at once from a thread pool; or None if numba is not installed or the introduced dtype is
+    not a supported `float` one.
+    """
+
+    global _kernel
+
+    if np.dtype(dtype) not in [np.float32, np.float64]:
+        return None
+
+    with _lock:
+        if _kernel is None:
+            try:
+                import numba
+            except ImportError:
+                _kernel = False
+            else:
+                _kernel = numba.njit(nogil=True)(_scan)
+
+        return _kernel or None
@@ -0,0 +1,148 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+
+
+TRENDS = ['Up Trend', 'Down Trend']
+
+
+def _popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+    table = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+    return table[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+class TrendMembership(object):
+    """
+    This class holds which series are within an up or a down trend on every position (e.g. day) of a panel, as a
+    bit-packed matrix per direction with a row per series and a bit per position, so that the membership of a
+    universe of thousands of series over decades takes a few megabytes instead of a dense boolean frame per series.
+    Co-trending statistics between every pair of series are computed over the packed rows, via bitwise ands and
+    popcounts over 64 positions at once, without ever expanding them.
+
+    Args:
+        names (:obj:`list`): identifiers of the series, one per row of the matrices.
+        length (:obj:`int`): number of positions of the panel.
+        bits (:obj:`dict`):
+            bit-packed matrices of every direction, `Up Trend` and `Down Trend`, as `uint64` :obj:`numpy.ndarray` of
+            shape (series, words), where the bit `position % 64` of the word `position // 64` of a row is set if the
+            series is within a trend of that direction on that position.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, names, length, bits):
+        if not isinstance(length, int) or length < 0:
+            raise ValueError('length must be an `int` equal or higher than 0!')
+
+        words = -(-length // 64)
+
+        for name in TRENDS:
+            if name not in bits or bits[name].dtype != np.uint64 or bits[name].shape != (len(names), words):
+                raise ValueError("bits argument needs to contain an `uint64` matrix of shape (series, words) per "
+                                 "direction.")
+
+        self.names = list(names)
+        self.length = length
+        self.bits = bits
+
+    @classmethod
+    def from_trends(cls, trends, length):
+        """
+        This function builds the membership matrices from the trends of several series, where `trends` is a
+        :obj:`dict` with an entry per series containing its trend positions, as returned by `identify_panel_trends`,
+        and `length` is the number of positions of the panel. The membership of every series is built via a
+        difference array over its trend boundaries, and packed right away.
+        """
+
+        if not isinstance(trends, dict):
+            raise ValueError("trends argument needs to be a `dict` as returned by `identify_panel_trends`.")
+
+        if not isinstance(length, int) or length < 0:
+            raise ValueError('length must be an `int` equal or higher than 0!')
+
+        words = -(-length // 64)
+
+        bits = {name: np.zeros((len(trends), words), dtype=np.uint64) for name in TRENDS}
+
+        for row, directions in enumerate(trends.values()):
+            for name, positions in directions.items():
+                positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+                changes = np.zeros(words * 64 + 1, dtype=np.int64)
+
+                np.add.at(changes, positions[:, 0], 1)
+                np.add.at(changes, positions[:, 1] + 1, -1)
+
+                member = np.cumsum(changes[:-1]) > 0
+
+                bits[name][row] = np.packbits(member, bitorder='little').view('<u8').astype(np.uint64)
+
+        return cls(list(trends.keys()), length, bits)
+
+    def _bits(self, trend):
+        if trend not in TRENDS:
+            raise ValueError("trend should be a `str` contained in [Up Trend, Down Trend]!")
+
+        return self.bits[trend]
+
+    def members(self, position, trend='Up Trend'):
+        """
+        This function returns the names of the series which are within a trend of the introduced direction on the
+        introduced position.
+        """
+
+        if not isinstance(position, int) or not 0 <= position < self.length:
+            raise ValueError('position must be an `int` between 0 and the length of the panel!')
+
+        bits = self._bits(trend)[:, position // 64] >> np.uint64(position % 64)
+
+        return [name for name, member in zip(self.names, (bits & np.uint64(1)).astype(bool)) if member]
+
+    def counts(self, trend='Up Trend'):
+        """
+        This function returns an `int64` :obj:`numpy.ndarray` with the number of positions every series is within a
+        trend of the introduced direction.
+        """
+
+        return _popcount(self._bits(trend))
+
+    def co_trending(self, trend=None):
+        """
+        This function returns an `int64` :obj:`numpy.ndarray` of shape (series, series) with the number of positions
+        every pair of series is within a trend of the introduced direction at once, or within a trend of the same
+        direction at once if no direction is introduced. Its diagonal contains the counts of every series.
+        """
+
+        directions = TRENDS if trend is None else [trend]
+
+        result = np.zeros((len(self.names), len(self.names)), dtype=np.int64)
+
+        for direction in directions:
+            bits = self._bits(direction)
+
+            for row in range(len(self.names)):
+                result[row] += _popcount(bits[row] & bits)
+
+        return result
+
+    def overlap(self, trend=None):
+        """
+        This function returns a `float64` :obj:`numpy.ndarray` of shape (series, series) with the Jaccard index of
+        the positions where every pair of series is within a trend of the introduced direction (or of the positions
+        and directions, if no direction is introduced); which is the ratio between the positions where both of them
+        are within a trend and the ones where any of them is, or 0 if none of them ever is.
+        """
+
+        shared = self.co_trending(trend)
+
+        counts = np.diag(shared)
+
+        union = counts[:, None] + counts[None, :] - shared
+
+        return np.where(union > 0, shared / np.maximum(union, 1), 0.0)
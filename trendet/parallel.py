@@ -0,0 +1,578 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import os
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # multiprocessing.shared_memory was added in Python 3.8, so the arrays are pickled to the workers before it
+    shared_memory = None
+
+import numpy as np
+import pandas as pd
+
+from .utils import ENGINES, as_array, iter_values, scan_chunk, stitch_chunks, remove_overlaps, identify_positions, \
+    index_dates, trend_arrays, is_numeric, column_values, clamp_trends
+
+
+def _scan_partition(partition, column, window_size, identify, halo, engine):
+    values = column_values(partition[column])
+
+    return dict(_scan_values(values, window_size, identify, engine), halo=values[:halo].copy(), length=len(values))
+
+
+def _partition_values(partition, column):
+    return column_values(partition[column])
+
+
+def _partition_dates(partition, positions):
+    return partition.index[positions].to_numpy()
+
+
+def identify_dask_trends(ddf, column, window_size=5, identify='both', halo=1024, engine='fast'):
+    """
+    This function receives as input a dask.dataframe.DataFrame from which data is going to be analysed in order to
+    detect/identify trends, without collecting its partitions into a single `pandas.DataFrame`. Every partition is
+    scanned in parallel as if the scan started on it, and then the scans are stitched together sequentially by
+    continuing the scan coming from the previous partitions over a halo of the first rows of every partition, until
+    both scans agree; so that the identified trends are the same ones identified by a sequential scan. Just if both
+    scans do not agree within the halo, the rest of the values of that partition are retrieved. So on, this function
+    will identify both up and down trends and will remove the ones that overlap, keeping just the longer trend and
+    discarding the nested trend, just like `identify_df_trends` does.
+
+    Args:
+        ddf (:obj:`dask.dataframe.DataFrame`): dataframe containing the data to be analysed.
+        column (:obj:`str`): name of the column from where trends are going to be identified.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        halo (:obj:`int`, optional): number of rows of every partition sent along with its scan to stitch them.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
+
+    Returns:
+        :obj:`dict`:
+            The function returns a :obj:`dict` with the keys `Up Trend` and/or `Down Trend`, whose values are
+            :obj:`numpy.ndarray` of shape (n, 2) containing the positions, relative to the beginning of the
+            dataframe, where every identified trend starts and ends, both included.
+
+    Raises:
+        ImportError: raised if `dask` is not installed.
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    try:
+        import dask
+        import dask.dataframe as dd
+    except ImportError:
+        raise ImportError('dask is required to identify trends over a `dask.dataframe.DataFrame`, install it via '
+                          '`python -m pip install "dask[dataframe]"`.')
+
+    if ddf is None or not isinstance(ddf, dd.DataFrame):
+        raise ValueError("ddf argument is mandatory and needs to be a `dask.dataframe.DataFrame`.")
+
+    if column is None:
+        raise ValueError("column parameter is mandatory and must be a valid column name.")
+
+    if column and not isinstance(column, str):
+        raise ValueError("column argument needs to be a `str`.")
+
+    if column not in ddf.columns:
+        raise ValueError("introduced column does not match any column from the specified `dask.dataframe.DataFrame`.")
+
+    if not is_numeric(ddf[column].dtype):
+        raise ValueError("supported values are just `int` or `float`, and the specified column of the "
+                         "introduced `dask.dataframe.DataFrame` is " + str(ddf[column].dtype))
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    if not isinstance(halo, int) or halo < 0:
+        raise ValueError('halo must be an `int` equal or higher than 0!')
+
+    partitions = ddf.to_delayed()
+
+    scans = dask.compute(*[dask.delayed(_scan_partition)(partition, column, window_size, identify, halo, engine)
+                           for partition in partitions])
+
+    retrieved = dict()
+
+    def fetch(number, negate):
+        values = scans[number]['halo']
+
+        for value in iter_values(values, negate=negate):
+            yield value
+
+        if len(values) < scans[number]['length']:
+            if number not in retrieved:
+                retrieved[number] = dask.compute(dask.delayed(_partition_values)(partitions[number], column))[0]
+
+            for value in iter_values(retrieved[number][len(values):], negate=negate):
+                yield value
+
+    names = list()
+
+    if identify in ['both', 'up']:
+        names.append(('Up Trend', True))
+
+    if identify in ['both', 'down']:
+        names.append(('Down Trend', False))
+
+    results = dict()
+
+    length = sum(scan['length'] for scan in scans)
+
+    for name, negate in names:
+        trends, _ = stitch_chunks([scan[name] for scan in scans],
+                                  window_size,
+                                  lambda number: fetch(number, negate),
+                                  engine)
+
+        results[name] = clamp_trends(trends, length)
+
+    if identify == 'both':
+        dates = None
+
+        if pd.api.types.is_datetime64_any_dtype(ddf.index.dtype):
+            dates = _trend_dates(partitions, scans, results['Up Trend'] + results['Down Trend'])
+
+        results = {
+            'Up Trend': remove_overlaps(results['Up Trend'], results['Down Trend'], dates, engine),
+            'Down Trend': remove_overlaps(results['Down Trend'], results['Up Trend'], dates, engine),
+        }
+
+    return trend_arrays(results, length)
+
+
+def _trend_dates(partitions, scans, trends):
+    import dask
+
+    offsets = np.cumsum([0] + [scan['length'] for scan in scans])
+
+    positions = sorted(set(position for trend in trends for position in trend))
+
+    requests = dict()
+
+    for position in positions:
+        number = int(np.searchsorted(offsets, position, side='right')) - 1
+        requests.setdefault(number, list()).append(position)
+
+    numbers = list(requests.keys())
+
+    dates = dask.compute(*[dask.delayed(_partition_dates)(partitions[number],
+                                                          [position - offsets[number] for position in requests[number]])
+                           for number in numbers])
+
+    return {position: date
+            for number, values in zip(numbers, dates)
+            for position, date in zip(requests[number], values)}
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _identify_panel_columns(block, dates, columns, window_size, identify, engine):
+    """
+    This function identifies the trends of the introduced columns of a panel stored in shared memory, where `block`
+    and `dates` are tuples containing the name, shape and dtype of the shared arrays; and returns just the trend
+    positions of every column as compact :obj:`numpy.ndarray`.
+    """
+
+    segments = list()
+
+    try:
+        segment = _attach(block[0])
+        segments.append(segment)
+
+        values = np.ndarray(block[1], dtype=block[2], buffer=segment.buf)
+
+        if dates is not None:
+            segment = _attach(dates[0])
+            segments.append(segment)
+
+            dates = np.ndarray(dates[1], dtype=dates[2], buffer=segment.buf)
+
+        results = _identify_panel_values([values[column] for column in columns], dates, window_size, identify, engine)
+
+        del values, dates
+
+        return results
+    finally:
+        for segment in segments:
+            segment.close()
+
+
+def _identify_panel_values(arrays, dates, window_size, identify, engine):
+    """
+    This function identifies the trends of the introduced columns of a panel, and returns just the trend positions of
+    every column as compact :obj:`numpy.ndarray`.
+    """
+
+    return [trend_arrays(identify_positions(values, dates, window_size, identify, engine), len(values))
+            for values in arrays]
+
+
+def identify_panel_trends(df, columns=None, window_size=5, identify='both', processes=None, engine='fast',
+                          workers=None):
+    """
+    This function receives as input a wide pandas.DataFrame, containing a series per column (e.g. the close values of
+    every stock of a universe), whose columns are going to be analysed in parallel in order to detect/identify their
+    trends. The values of the panel are copied once into shared memory, where every worker process reads the columns
+    it analyses from, so that no column is pickled to the workers; and the workers just send back the positions of
+    the identified trends, instead of a labeled `pandas.DataFrame`. On Python versions older than 3.8, which lack
+    `multiprocessing.shared_memory`, the columns are pickled to the workers instead. So on, this function will
+    identify both up and down trends of every column and will remove the ones that overlap, just like
+    `identify_df_trends` does.
+
+    Alternatively, if `workers` is specified, the columns are analysed by a pool of threads of the current process,
+    which read them straight from the `pandas.DataFrame`, so that no process is started and nothing is copied. Note
+    that threads just run at once when the scan does not hold the GIL, which requires the fast engine, numba to be
+    installed and `float` columns; otherwise, columns are analysed one at a time.
+
+    Args:
+        df (:obj:`pandas.DataFrame`): dataframe containing the series to be analysed, one per column.
+        columns (:obj:`list`, optional): names of the columns to analyse, which by default are all of them.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        processes (:obj:`int`, optional): number of worker processes, which by default is the number of CPUs.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
+        workers (:obj:`int`, optional): number of threads of the current process used instead of worker processes.
+
+    Returns:
+        :obj:`dict`:
+            The function returns a :obj:`dict` with an entry per column, containing a :obj:`dict` with the keys `Up
+            Trend` and/or `Down Trend`, whose values are :obj:`numpy.ndarray` of shape (n, 2) containing the positions
+            where every identified trend starts and ends, both included.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if df is None or not isinstance(df, pd.DataFrame):
+        raise ValueError("df argument is mandatory and needs to be a `pandas.DataFrame`.")
+
+    if columns is None:
+        columns = df.columns.tolist()
+
+    if not isinstance(columns, list) or len(columns) < 1:
+        raise ValueError("columns argument needs to be a non empty `list` of column names.")
+
+    for column in columns:
+        if column not in df.columns:
+            raise ValueError("introduced column " + str(column) + " does not match any column from the specified "
+                             "`pandas.DataFrame`.")
+
+        if not is_numeric(df[column].dtype):
+            raise ValueError("supported values are just `int` or `float`, and the specified column " + str(column) +
+                             " of the introduced `pandas.DataFrame` is " + str(df[column].dtype))
+
+        if not isinstance(df[column].dtype, np.dtype) and df[column].isna().any():
+            raise ValueError("the specified column " + str(column) + " of the introduced `pandas.DataFrame` contains "
+                             "null values.")
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    if processes is not None and (not isinstance(processes, int) or processes < 1):
+        raise ValueError('processes must be an `int` equal or higher than 1!')
+
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError('workers must be an `int` equal or higher than 1!')
+
+    if processes is not None and workers is not None:
+        raise ValueError('processes and workers can not be specified at the same time!')
+
+    if workers is not None:
+        dates = index_dates(df.index)
+
+        def identify_column(column):
+            return trend_arrays(identify_positions(column_values(df[column]), dates, window_size, identify, engine),
+                                len(df))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(columns, executor.map(identify_column, columns)))
+
+    processes = processes or os.cpu_count() or 1
+
+    if shared_memory is None:
+        dates = index_dates(df.index)
+        dates = None if dates is None else dates.to_numpy()
+
+        batches = [columns[start::processes] for start in range(min(processes, len(columns)))]
+
+        with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+            futures = [executor.submit(_identify_panel_values, [column_values(df[column]) for column in batch], dates,
+                                       window_size, identify, engine)
+                       for batch in batches]
+
+            results = dict()
+
+            for batch, future in zip(batches, futures):
+                results.update(zip(batch, future.result()))
+
+        return {column: results[column] for column in columns}
+
+    dtype = np.result_type(*[column_values(df[column]).dtype for column in columns])
+    shape = (len(columns), len(df))
+
+    dates = index_dates(df.index)
+
+    segments = list()
+
+    try:
+        segment = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        segments.append(segment)
+
+        block = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+        for position, column in enumerate(columns):
+            block[position] = column_values(df[column])
+
+        block = (segment.name, shape, dtype.str)
+
+        if dates is not None:
+            values = dates.to_numpy()
+
+            segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            segments.append(segment)
+
+            np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+
+            dates = (segment.name, values.shape, values.dtype.str)
+
+        batches = [list(range(start, len(columns), processes)) for start in range(min(processes, len(columns)))]
+
+        with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+            futures = [executor.submit(_identify_panel_columns, block, dates, batch, window_size, identify, engine)
+                       for batch in batches]
+
+            results = dict()
+
+            for batch, future in zip(batches, futures):
+                for position, trends in zip(batch, future.result()):
+                    results[columns[position]] = trends
+
+        return {column: results[column] for column in columns}
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def _scan_shared_chunk(block, start, end, window_size, identify, engine):
+    """
+    This function scans the chunk between `start` and `end` of a series stored in shared memory, where `block` is a
+    tuple containing the name, shape and dtype of the shared array, as explained in :obj:`trendet.utils.scan_chunk`.
+    """
+
+    segment = _attach(block[0])
+
+    try:
+        values = np.ndarray(block[1], dtype=block[2], buffer=segment.buf)
+
+        scans = _scan_values(values[start:end], window_size, identify, engine)
+
+        del values
+
+        return scans
+    finally:
+        segment.close()
+
+
+def _scan_values(values, window_size, identify, engine):
+    scans = dict()
+
+    if identify in ['both', 'up']:
+        scans['Up Trend'] = scan_chunk(iter_values(values, negate=True), window_size, engine)
+
+    if identify in ['both', 'down']:
+        scans['Down Trend'] = scan_chunk(iter_values(values), window_size, engine)
+
+    return scans
+
+
+def identify_chunked_trends(values, dates=None, window_size=5, identify='both', chunk_size=None, processes=None,
+                            engine='fast'):
+    """
+    This function receives as input a single long series of values, which is split into chunks that are scanned in
+    parallel in order to detect/identify its trends using several cores. Every chunk is scanned as if the scan started
+    on it, and then a stitching pass continues the scan coming from the previous chunks over every chunk until both
+    scans agree, which reconciles the segments crossing the chunk boundaries; so that the identified trends are the
+    same ones identified by a sequential scan. So on, this function will identify both up and down trends and will
+    remove the ones that overlap, just like `identify_array_trends` does.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values to be analysed, or any of the types supported by
+            `identify_array_trends`.
+        dates (:obj:`numpy.ndarray`, optional):
+            1-D `datetime64` array with the timestamp of every value, used to measure the duration of the trends in
+            days when removing the overlapping ones. If not specified, durations are measured in positions.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        chunk_size (:obj:`int`, optional):
+            number of values of every chunk, which by default splits the series into a chunk per process.
+        processes (:obj:`int`, optional):
+            number of worker processes, which by default is the number of CPUs. If 1, the chunks are scanned in the
+            current process. The workers read the series from shared memory or, on Python versions older than 3.8,
+            which lack `multiprocessing.shared_memory`, their chunks are pickled to them instead.
+        engine (:obj:`str`, optional):
+            engine used to scan the values, it can either be 'fast' or 'reference', which is the original
+            implementation of the scan and identifies the same trends, just slower.
+
+    Returns:
+        :obj:`dict`:
+            The function returns a :obj:`dict` with the keys `Up Trend` and/or `Down Trend`, whose values are
+            :obj:`numpy.ndarray` of shape (n, 2) containing the positions where every identified trend starts and
+            ends, both included.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if values is None:
+        raise ValueError("values argument is mandatory and needs to be a `numpy.ndarray`.")
+
+    values = as_array(values)
+
+    if isinstance(values, list):
+        values = np.concatenate(values)
+
+    if values.ndim != 1:
+        raise ValueError("values argument needs to be a 1-D `numpy.ndarray`.")
+
+    if values.dtype.kind not in ['i', 'u', 'f']:
+        raise ValueError("supported values are just `int` or `float`, and the introduced `numpy.ndarray` is "
+                         + str(values.dtype))
+
+    if dates is not None:
+        dates = as_array(dates)
+
+        if isinstance(dates, list):
+            dates = np.concatenate(dates)
+
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            raise ValueError("dates argument needs to be a `datetime64` `numpy.ndarray`.")
+
+        if dates.shape != values.shape:
+            raise ValueError("dates argument needs to have the same length as values.")
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size < 1):
+        raise ValueError('chunk_size must be an `int` equal or higher than 1!')
+
+    if processes is not None and (not isinstance(processes, int) or processes < 1):
+        raise ValueError('processes must be an `int` equal or higher than 1!')
+
+    processes = processes or os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = max(-(-len(values) // processes), 1)
+
+    bounds = [(start, min(start + chunk_size, len(values))) for start in range(0, len(values), chunk_size)]
+
+    if processes == 1 or len(bounds) < 2:
+        scans = [_scan_values(values[start:end], window_size, identify, engine) for start, end in bounds]
+    elif shared_memory is None:
+        with ProcessPoolExecutor(max_workers=min(processes, len(bounds))) as executor:
+            scans = list(executor.map(_scan_values,
+                                      [values[start:end] for start, end in bounds],
+                                      [window_size] * len(bounds),
+                                      [identify] * len(bounds),
+                                      [engine] * len(bounds)))
+    else:
+        segment = shared_memory.SharedMemory(create=True, size=values.nbytes)
+
+        try:
+            np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+
+            block = (segment.name, values.shape, values.dtype.str)
+
+            with ProcessPoolExecutor(max_workers=min(processes, len(bounds))) as executor:
+                scans = list(executor.map(_scan_shared_chunk,
+                                          [block] * len(bounds),
+                                          [start for start, _ in bounds],
+                                          [end for _, end in bounds],
+                                          [window_size] * len(bounds),
+                                          [identify] * len(bounds),
+                                          [engine] * len(bounds)))
+        finally:
+            segment.close()
+            segment.unlink()
+
+    names = list()
+
+    if identify in ['both', 'up']:
+        names.append(('Up Trend', True))
+
+    if identify in ['both', 'down']:
+        names.append(('Down Trend', False))
+
+    results = dict()
+
+    for name, negate in names:
+        trends, _ = stitch_chunks([scan[name] for scan in scans],
+                                  window_size,
+                                  lambda number: iter_values(values[bounds[number][0]:bounds[number][1]],
+                                                             negate=negate),
+                                  engine)
+
+        results[name] = clamp_trends(trends, len(values))
+
+    if identify == 'both':
+        results = {
+            'Up Trend': remove_overlaps(results['Up Trend'], results['Down Trend'], dates, engine),
+            'Down Trend': remove_overlaps(results['Down Trend'], results['Up Trend'], dates, engine),
+        }
+
+    return trend_arrays(results, len(values))
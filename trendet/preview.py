@@ -0,0 +1,134 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+
+from .identification import identify_array_trends
+from .utils import as_array
+
+
+METHODS = ['minmax', 'lttb']
+
+
+def _minmax(values, width):
+    length = len(values)
+
+    size = -(-length // max(width // 2, 1))
+
+    if size < 2:
+        return np.arange(length, dtype=np.int64)
+
+    buckets = -(-length // size)
+
+    padded = np.concatenate([values, np.repeat(values[-1:], buckets * size - length)]).reshape(buckets, size)
+
+    starts = np.arange(buckets, dtype=np.int64) * size
+
+    return np.concatenate([[0, length - 1], starts + np.argmin(padded, axis=1), starts + np.argmax(padded, axis=1)])
+
+
+def _lttb(x, y, width):
+    length = len(y)
+
+    if width >= length:
+        return np.arange(length, dtype=np.int64)
+
+    edges = np.linspace(1, length - 1, width - 1).astype(np.int64)
+
+    selected = np.empty(width, dtype=np.int64)
+    selected[0], selected[-1] = 0, length - 1
+
+    previous = 0
+
+    for bucket in range(width - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        if bucket + 2 < width - 1:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = length - 1, length
+
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+
+        previous = start + int(np.argmax(areas))
+
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def preview_trends(values, dates=None, width=2000, method='minmax', window_size=5, identify='both', engine='fast'):
+    """
+    This function identifies the trends of the introduced series just like `identify_array_trends` does, and also
+    downsamples the series to about `width` points, so that it can be plotted along with its trends without sending
+    every value to the chart. The series can either be downsampled keeping the minimum and the maximum of every bucket
+    of values (`minmax`), which keeps every spike of the series, or via Largest-Triangle-Three-Buckets (`lttb`),
+    which keeps the point of every bucket that best preserves the visual shape of the series. Either way, the
+    positions where every trend starts and ends are always kept, so trends are drawn exactly over the preview.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values to be analysed, or any of the types supported by
+            `identify_array_trends`.
+        dates (:obj:`numpy.ndarray`, optional): 1-D `datetime64` array with the timestamp of every value.
+        width (:obj:`int`, optional): number of points of the preview, apart from the trend boundaries.
+        method (:obj:`str`, optional): downsampling method, it can either be 'minmax' or 'lttb'.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional): engine used to scan the values, it can either be 'fast' or 'reference'.
+
+    Returns:
+        :obj:`dict` - preview:
+            The function returns a :obj:`dict` with the sorted `positions` of the series kept in the preview, their
+            `values` and their `dates` (or None if no dates were specified), along with the `trends` identified over
+            the whole series, as returned by `identify_array_trends`.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if not isinstance(width, int) or width < 3:
+        raise ValueError('width must be an `int` equal or higher than 3!')
+
+    if method not in METHODS:
+        raise ValueError('method should be a `str` contained in [minmax, lttb]!')
+
+    trends = identify_array_trends(values, dates=dates, window_size=window_size, identify=identify, engine=engine)
+
+    values = as_array(values)
+
+    if isinstance(values, list):
+        values = np.concatenate(values)
+
+    if dates is not None:
+        dates = as_array(dates)
+
+        if isinstance(dates, list):
+            dates = np.concatenate(dates)
+
+    if len(values) == 0:
+        positions = np.array([], dtype=np.int64)
+    elif method == 'minmax':
+        positions = _minmax(values, width)
+    else:
+        if dates is None:
+            x = np.arange(len(values), dtype=np.float64)
+        else:
+            x = (dates - dates[0]).astype('timedelta64[ns]').astype(np.int64).astype(np.float64)
+
+        positions = _lttb(x, values.astype(np.float64), width)
+
+    boundaries = [np.asarray(trend, dtype=np.int64).reshape(-1) for trend in trends.values()]
+
+    positions = np.unique(np.concatenate([positions] + boundaries))
+
+    return {
+        'positions': positions,
+        'values': values[positions],
+        'dates': None if dates is None else dates[positions],
+        'trends': trends,
+    }
@@ -0,0 +1,238 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from . import __version__
+from .identification import identify_array_trends
+from .utils import ENGINES, atomic_write, provider_series
+
+
+MANIFEST = 'manifest.json'
+
+# errors raised by the series themselves, e.g. a missing column, which would be raised again by any retry
+PERMANENT = (ValueError, TypeError, KeyError)
+
+
+class TrendRunner(object):
+    """
+    This class identifies the trends of a universe of series retrieved from the introduced provider, checkpointing
+    the progress into a local directory so that a run which is killed or partially fails can be resumed just paying
+    for the remaining series. The provider is a function receiving the name of a series and returning either a
+    :obj:`pandas.DataFrame` containing `column` or a tuple with its values and dates, such as the one returned by
+    :obj:`trendet.server.investpy_provider`. The directory is laid out as follows:
+
+    * `<directory>/trends/<hash>.npz` with the trend positions of a finished series, as returned by
+      `identify_array_trends`, along with the dates where they start and end if the series is dated.
+    * `<directory>/manifest.json` with the identification params and the status, number of attempts and last error of
+      every series.
+
+    Every file is written into a temporary file and then atomically renamed, so that a killed run never leaves a
+    partial file behind. As the file of every finished series is its own completion record, the manifest is just
+    rewritten every `checkpoint` series and at the end of the run, and the finished series missing from it are
+    recovered from their files when resuming.
+
+    Args:
+        directory (:obj:`str`): directory where the progress of the run is checkpointed.
+        provider (:obj:`callable`): function retrieving the series by their name.
+        column (:obj:`str`, optional): column of the :obj:`pandas.DataFrame` returned by the provider to analyse.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional): engine used to scan the values, it can either be 'fast' or 'reference'.
+        retries (:obj:`int`, optional): number of times a failed series is retried within a run.
+        delay (:obj:`float`, optional): seconds waited before the first retry, which are doubled on every retry.
+        checkpoint (:obj:`int`, optional): number of series processed between writes of the manifest.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored, or if the directory holds a run with other
+            identification params.
+    """
+
+    def __init__(self, directory, provider, column='Close', window_size=5, identify='both', engine='fast',
+                 retries=2, delay=1., checkpoint=50):
+        if not isinstance(directory, str):
+            raise ValueError('directory must be a `str`!')
+
+        if not callable(provider):
+            raise ValueError('provider must be a callable!')
+
+        if not isinstance(window_size, int) or window_size < 3:
+            raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+        if identify not in ['both', 'up', 'down']:
+            raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+        if engine not in ENGINES:
+            raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError('retries must be an `int` equal or higher than 0!')
+
+        if not isinstance(delay, (int, float)) or delay < 0:
+            raise ValueError('delay must be a `float` equal or higher than 0!')
+
+        if not isinstance(checkpoint, int) or checkpoint < 1:
+            raise ValueError('checkpoint must be an `int` equal or higher than 1!')
+
+        self.directory = directory
+        self.provider = provider
+        self.column = column
+        self.window_size = window_size
+        self.identify = identify
+        self.engine = engine
+        self.retries = retries
+        self.delay = delay
+        self.checkpoint = checkpoint
+
+        self.params = {
+            'column': column,
+            'window_size': window_size,
+            'identify': identify,
+            'engine': engine,
+            'version': __version__,
+        }
+
+        os.makedirs(os.path.join(directory, 'trends'), exist_ok=True)
+
+        self.manifest = {'params': self.params, 'series': dict()}
+
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            with open(os.path.join(directory, MANIFEST), 'r') as f:
+                manifest = json.load(f)
+
+            if manifest['params'] != self.params:
+                raise ValueError("directory " + directory + " holds a run with other identification params: "
+                                 + json.dumps(manifest['params'], sort_keys=True))
+
+            self.manifest = manifest
+
+    def _path(self, name):
+        return os.path.join(self.directory, 'trends', hashlib.sha1(name.encode('utf-8')).hexdigest() + '.npz')
+
+    def _save(self):
+        data = json.dumps(self.manifest, sort_keys=True, indent=1).encode('utf-8')
+
+        atomic_write(self.directory, os.path.join(self.directory, MANIFEST), lambda f: f.write(data))
+
+    def _identify(self, name):
+        values, dates = provider_series(self.provider(name), self.column, name)
+
+        if dates is not None:
+            dates = np.asarray(dates).astype('datetime64[ns]')
+
+        trends = identify_array_trends(values, dates=dates, window_size=self.window_size, identify=self.identify,
+                                       engine=self.engine)
+
+        arrays = dict(trends)
+
+        if dates is not None:
+            for trend, positions in trends.items():
+                arrays[trend + ' Dates'] = dates[positions]
+
+        atomic_write(self.directory, self._path(name), lambda f: np.savez(f, **arrays))
+
+    def done(self, name):
+        """
+        This function returns whether the trends of the introduced series were already identified, either as
+        recorded by the manifest or by the file of its trends, in case the run was killed before recording it.
+        """
+
+        status = self.manifest['series'].get(name, dict()).get('status')
+
+        return status == 'done' or (status is None and os.path.exists(self._path(name)))
+
+    def run(self, names):
+        """
+        This function identifies the trends of the introduced series which are not finished yet, retrying every
+        failed series up to `retries` times waiting an exponential backoff, and isolating the series which still fail
+        so that the rest of them are processed anyway. Series failing with a `ValueError`, `TypeError` or `KeyError`,
+        such as the ones missing the column, are not retried as they would just fail again, while every failed
+        series is retried on the next run.
+
+        Args:
+            names (:obj:`list`): names of the series to identify the trends of.
+
+        Returns:
+            :obj:`dict`:
+                The function returns a :obj:`dict` with the names of the series which were `done` and `skipped`, as
+                they were already finished, and a `failed` :obj:`dict` with the last error of every failed series.
+        """
+
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError("names argument needs to be a `list` of `str`.")
+
+        results = {'done': list(), 'skipped': list(), 'failed': dict()}
+
+        processed = 0
+
+        try:
+            for name in names:
+                if self.done(name):
+                    if name not in self.manifest['series']:
+                        self.manifest['series'][name] = {'status': 'done', 'attempts': 0, 'error': None}
+
+                    results['skipped'].append(name)
+                    continue
+
+                entry = self.manifest['series'].setdefault(name, {'status': None, 'attempts': 0, 'error': None})
+
+                for attempt in range(self.retries + 1):
+                    if attempt > 0:
+                        time.sleep(self.delay * 2 ** (attempt - 1))
+
+                    entry['attempts'] += 1
+
+                    try:
+                        self._identify(name)
+                    except Exception as e:
+                        entry['status'] = 'failed'
+                        entry['error'] = f'{type(e).__name__}: {e}'
+
+                        if isinstance(e, PERMANENT):
+                            break
+                    else:
+                        entry['status'] = 'done'
+                        entry['error'] = None
+                        break
+
+                if entry['status'] == 'done':
+                    results['done'].append(name)
+                else:
+                    results['failed'][name] = entry['error']
+
+                processed += 1
+
+                if processed % self.checkpoint == 0:
+                    self._save()
+        finally:
+            self._save()
+
+        return results
+
+    def trends(self, name):
+        """
+        This function returns the trends of the introduced finished series, as returned by `identify_array_trends`,
+        along with the dates where every trend starts and ends under the `Up Trend Dates` and `Down Trend Dates`
+        keys, if the series is dated.
+        """
+
+        if not self.done(name):
+            raise ValueError("series " + name + " is not finished yet.")
+
+        with np.load(self._path(name), allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    @property
+    def failed(self):
+        """
+        This property returns a :obj:`dict` with the last error of every series which failed on its last run.
+        """
+
+        return {name: entry['error'] for name, entry in self.manifest['series'].items()
+                if entry['status'] == 'failed'}
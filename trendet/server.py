@@ -0,0 +1,344 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import argparse
+import json
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .cache import TrendCache
+from .utils import ENGINES, as_array, identify_positions, provider_series, trend_arrays
+
+
+def investpy_provider(country, from_date, to_date):
+    """
+    This function returns a provider which retrieves the historical data of the stock named as requested, from the
+    introduced country and date range, via investpy; just like `identify_all_trends` does.
+    """
+
+    from investpy import get_stock_historical_data
+
+    def provider(name):
+        return get_stock_historical_data(stock=name, country=country, from_date=from_date, to_date=to_date)
+
+    return provider
+
+
+class TrendService(object):
+    """
+    This class keeps the series and the trends identified from them warm in memory, so that a long-running process
+    can serve identification requests for many series without loading them, nor identifying their trends, again on
+    every request. Series are either loaded explicitly or retrieved on demand from the introduced provider, which is a
+    function receiving the name of a series and returning either a :obj:`pandas.DataFrame` containing `column` or a
+    tuple with its values and dates; and the identified trends are memoized in a :obj:`trendet.TrendCache`.
+
+    Args:
+        provider (:obj:`callable`, optional): function retrieving the series which are not loaded, by their name.
+        column (:obj:`str`, optional): column of the :obj:`pandas.DataFrame` returned by the provider to analyse.
+        maxsize (:obj:`int`, optional): maximum number of series kept in memory, least recently used ones are evicted.
+        cache (:obj:`trendet.TrendCache`, optional): cache where the identified trends are memoized.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, provider=None, column='Close', maxsize=1024, cache=None):
+        if provider is not None and not callable(provider):
+            raise ValueError('provider is neither None or a callable!')
+
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError('maxsize must be an `int` equal or higher than 1!')
+
+        if cache is not None and not isinstance(cache, TrendCache):
+            raise ValueError('cache is neither None or a `trendet.TrendCache`!')
+
+        self.provider = provider
+        self.column = column
+        self.maxsize = maxsize
+        self.cache = cache or TrendCache(maxsize=maxsize)
+
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, name, values, dates=None):
+        """
+        This function loads the values and, optionally, the `datetime64` dates of a series under the introduced name,
+        replacing the series previously loaded under it, if any.
+        """
+
+        if not isinstance(name, str):
+            raise ValueError('name must be a `str`!')
+
+        values = as_array(values)
+
+        if isinstance(values, list):
+            values = np.concatenate(values)
+
+        if values.ndim != 1 or values.dtype.kind not in ['i', 'u', 'f']:
+            raise ValueError("values argument needs to be a 1-D `numpy.ndarray` of `int` or `float` values.")
+
+        if dates is not None:
+            dates = np.asarray(dates).astype('datetime64[ns]')
+
+            if dates.shape != values.shape:
+                raise ValueError("dates argument needs to have the same length as values.")
+
+        with self._lock:
+            self._series[name] = (values, dates)
+            self._series.move_to_end(name)
+
+            while len(self._series) > self.maxsize:
+                self._series.popitem(last=False)
+
+    def series(self, name):
+        """
+        This function returns a tuple with the values and dates of the introduced series, retrieving it from the
+        provider if it is not loaded.
+        """
+
+        with self._lock:
+            if name in self._series:
+                self._series.move_to_end(name)
+
+                return self._series[name]
+
+        if self.provider is None:
+            raise ValueError("series " + str(name) + " is not loaded and there is no provider to retrieve it.")
+
+        self.load(name, *provider_series(self.provider(name), self.column, name))
+
+        return self.series(name)
+
+    def identify(self, names, window_size=5, identify='both', engine='fast'):
+        """
+        This function identifies the trends of the introduced series, or of every series of the introduced
+        :obj:`list` at once, returning a :obj:`dict` with an entry per series containing the positions of its
+        trends, as returned by `identify_array_trends`.
+        """
+
+        if isinstance(names, str):
+            names = [names]
+
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError("names argument needs to be either a `str` or a `list` of `str`.")
+
+        if not isinstance(window_size, int) or window_size < 3:
+            raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+        if identify not in ['both', 'up', 'down']:
+            raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+        if engine not in ENGINES:
+            raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+        results = dict()
+
+        for name in names:
+            values, dates = self.series(name)
+
+            key = self.cache.key(values, dates, window_size=window_size, identify=identify, engine=engine)
+            trends = self.cache.get(key)
+
+            if trends is None:
+                trends = identify_positions(values, dates, window_size, identify, engine)
+                self.cache.set(key, trends)
+
+            results[name] = trend_arrays(trends, len(values))
+
+        return results
+
+    def query(self, names, start=None, end=None, trend=None, window_size=5, identify='both', engine='fast'):
+        """
+        This function returns a :obj:`list` with a :obj:`dict` per trend of the introduced series which overlaps the
+        introduced date range, both included, optionally filtered by direction; containing its `series`, `trend`
+        direction, `from` and `to` positions and `from_date` and `to_date`, formatted as ISO strings.
+        """
+
+        if trend is not None and trend not in ['Up Trend', 'Down Trend']:
+            raise ValueError("trend should be a `str` contained in [Up Trend, Down Trend]!")
+
+        start = None if start is None else np.datetime64(pd.Timestamp(start).to_datetime64(), 'ns')
+        end = None if end is None else np.datetime64(pd.Timestamp(end).to_datetime64(), 'ns')
+
+        rows = list()
+
+        for name, trends in self.identify(names, window_size, identify, engine).items():
+            dates = self.series(name)[1]
+
+            if (start is not None or end is not None) and dates is None:
+                raise ValueError("series " + name + " has no dates to query it by date range.")
+
+            for direction, positions in trends.items():
+                if trend is not None and direction != trend:
+                    continue
+
+                for from_trend, to_trend in positions.tolist():
+                    from_date = None if dates is None else dates[from_trend]
+                    to_date = None if dates is None else dates[to_trend]
+
+                    if start is not None and to_date < start or end is not None and from_date > end:
+                        continue
+
+                    rows.append({
+                        'series': name,
+                        'trend': direction,
+                        'from': from_trend,
+                        'to': to_trend,
+                        'from_date': None if from_date is None else str(np.datetime_as_string(from_date)),
+                        'to_date': None if to_date is None else str(np.datetime_as_string(to_date)),
+                    })
+
+        return rows
+
+    @property
+    def stats(self):
+        """
+        This property returns a :obj:`dict` with the number of series loaded and the stats of the trend cache.
+        """
+
+        return dict(self.cache.stats, series=len(self._series))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != '/stats':
+            return self._send(404, {'error': 'unknown path ' + self.path})
+
+        self._send(200, self.server.service.stats)
+
+    def do_POST(self):
+        service = self.server.service
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+            if not isinstance(request, dict):
+                raise ValueError("requests need to be a JSON object.")
+
+            params = {key: request[key] for key in ['window_size', 'identify', 'engine'] if key in request}
+
+            if self.path == '/identify':
+                results = service.identify(request.get('series'), **params)
+
+                body = {name: {trend: positions.tolist() for trend, positions in trends.items()}
+                        for name, trends in results.items()}
+            elif self.path == '/query':
+                body = {'trends': service.query(request.get('series'), start=request.get('start'),
+                                                end=request.get('end'), trend=request.get('trend'), **params)}
+            elif self.path == '/load':
+                service.load(request.get('series'), np.asarray(request.get('values'), dtype=np.float64),
+                             dates=request.get('dates'))
+
+                body = {'loaded': request.get('series')}
+            else:
+                return self._send(404, {'error': 'unknown path ' + self.path})
+        except (ValueError, TypeError) as e:
+            return self._send(400, {'error': str(e)})
+        except Exception as e:
+            return self._send(500, {'error': f'{type(e).__name__}: {e}'})
+
+        self._send(200, body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class TrendServer(ThreadingMixIn, HTTPServer):
+    """
+    This class is a threaded HTTP server, just built on the standard library, which serves the introduced
+    :obj:`trendet.TrendService` as JSON, so that batch scripts can request trends from a warm process instead of
+    importing trendet, loading their series and identifying trends on every run. Every endpoint receives a JSON object
+    with the `series` name (or a list of them) and, optionally, the `window_size`, `identify` and `engine` params:
+
+    * `POST /identify` returns the positions of the trends of every series.
+    * `POST /query` returns the trends of every series overlapping the `start` and `end` dates, of a `trend` direction.
+    * `POST /load` loads the introduced `values` and `dates` of a series.
+    * `GET /stats` returns the stats of the service.
+
+    Args:
+        service (:obj:`trendet.TrendService`): service whose series and trends are served.
+        host (:obj:`str`, optional): host the server listens on, which by default is just the local one.
+        port (:obj:`int`, optional): port the server listens on, which by default is any free one.
+        verbose (:obj:`bool`, optional): whether every request is logged to stderr or not.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service, host='127.0.0.1', port=0, verbose=False):
+        if not isinstance(service, TrendService):
+            raise ValueError('service must be a `trendet.TrendService`!')
+
+        self.service = service
+        self.verbose = verbose
+
+        super().__init__((host, port), _Handler)
+
+    @property
+    def url(self):
+        """
+        This property returns the base URL the server is listening on.
+        """
+
+        return 'http://' + self.server_address[0] + ':' + str(self.server_address[1])
+
+
+def main(argv=None):
+    """
+    This function is the entry point of `python -m trendet.server`, which serves the trends of the series loaded
+    into it or retrieved via investpy, if a country and date range are specified, until it is interrupted.
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m trendet.server',
+                                     description='Serve trendet identification requests from a warm process.')
+
+    parser.add_argument('--host', default='127.0.0.1', help='host the server listens on.')
+    parser.add_argument('--port', type=int, default=8000, help='port the server listens on.')
+    parser.add_argument('--country', default=None, help='country of the stocks retrieved via investpy.')
+    parser.add_argument('--from-date', default=None, help="date from where stocks are retrieved, as 'dd/mm/yyyy'.")
+    parser.add_argument('--to-date', default=None, help="date until where stocks are retrieved, as 'dd/mm/yyyy'.")
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request.')
+
+    args = parser.parse_args(argv)
+
+    provider = None
+
+    if args.country is not None:
+        if args.from_date is None or args.to_date is None:
+            parser.error('--from-date and --to-date are required along with --country.')
+
+        provider = investpy_provider(args.country, args.from_date, args.to_date)
+
+    server = TrendServer(TrendService(provider=provider), host=args.host, port=args.port, verbose=args.verbose)
+
+    print(f'serving trendet on {server.url}', file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+
+
+def trend_signals(trends, length, lag=0):
+    """
+    This function converts the positions of the identified trends into a dense position signal ready for vectorized
+    backtesting, which is +1 within up trends, -1 within down trends and 0 elsewhere (including the positions where
+    an up and a down trend overlap); along with the positions where the signal enters and exits every position. The
+    signal is built via a difference array over the trend boundaries, so it costs O(length + trends) and never goes
+    through the labeled `Up Trend` and `Down Trend` columns.
+
+    Args:
+        trends (:obj:`dict`):
+            positions of the identified trends as returned by `identify_array_trends`, with the keys `Up Trend`
+            and/or `Down Trend`.
+        length (:obj:`int`): number of values of the series where trends were identified.
+        lag (:obj:`int`, optional):
+            number of positions the signal is delayed, e.g. to account for the trend confirmation delay or for
+            trading on the next bar.
+
+    Returns:
+        :obj:`dict`:
+            The function returns a :obj:`dict` with the `int8` :obj:`numpy.ndarray` `signal`, and the `int64`
+            :obj:`numpy.ndarray` `entries` and `exits`, containing the positions where the signal becomes +1/-1 and
+            the positions where a +1/-1 signal ends or changes, respectively.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if not isinstance(trends, dict):
+        raise ValueError("trends argument needs to be a `dict` as returned by `identify_array_trends`.")
+
+    if not isinstance(length, int) or length < 0:
+        raise ValueError('length must be an `int` equal or higher than 0!')
+
+    if not isinstance(lag, int) or lag < 0:
+        raise ValueError('lag must be an `int` equal or higher than 0!')
+
+    changes = np.zeros(length + 1, dtype=np.int64)
+
+    for name, sign in [('Up Trend', 1), ('Down Trend', -1)]:
+        if name not in trends:
+            continue
+
+        positions = np.asarray(trends[name], dtype=np.int64).reshape(-1, 2)
+
+        np.add.at(changes, np.clip(positions[:, 0] + lag, 0, length), sign)
+        np.add.at(changes, np.clip(positions[:, 1] + 1 + lag, 0, length), -sign)
+
+    signal = np.sign(np.cumsum(changes[:length])).astype(np.int8)
+
+    previous = np.concatenate([np.zeros(1, dtype=np.int8), signal[:-1]])
+    switches = signal != previous
+
+    entries = np.flatnonzero(switches & (signal != 0))
+    exits = np.flatnonzero(switches & (previous != 0))
+
+    return {
+        'signal': signal,
+        'entries': entries,
+        'exits': exits,
+    }
@@ -0,0 +1,262 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import hashlib
+import os
+import uuid
+
+import numpy as np
+
+from .utils import trend_labels
+
+
+FORMATS = {
+    'parquet': '.parquet',
+    'ipc': '.arrow',
+}
+
+
+class TrendWriter(object):
+    """
+    This class writes the trends of every series as soon as they are identified into a partitioned Parquet or Arrow
+    IPC dataset, so that the trends of a universe of series are never gathered in memory before being saved. Trends
+    are buffered as plain columns until `batch_size` rows are, which are then appended as a single Arrow record batch
+    to the file of the bucket every series is hashed into, so that memory is bounded by the size of a batch regardless
+    of the number of series, even if most of them have no trends at all.
+    The dataset is laid out in hive-style partitions, which can be read back with `pandas.read_parquet` or
+    `pyarrow.dataset`, as follows:
+
+    * `<path>/trends/bucket=<bucket>/part-<token>.<format>` with a row per trend, containing its `series`, `trend`
+      direction, `label` as assigned by `identify_df_trends`, `from` and `to` positions and `from_date` and `to_date`.
+    * `<path>/labels/bucket=<bucket>/part-<token>.<format>` with a row per value, containing its `series`,
+      `position`, `date` and the labels of the `Up Trend` and `Down Trend` it belongs to; just if `labels` is True.
+
+    Args:
+        path (:obj:`str`): directory where the dataset is written.
+        format (:obj:`str`, optional): format of the files of the dataset, it can either be 'parquet' or 'ipc'.
+        partitions (:obj:`int`, optional): number of buckets series are hashed into.
+        batch_size (:obj:`int`, optional): maximum number of rows buffered before they are written.
+        labels (:obj:`bool`, optional): whether the labels of every value are written too or not.
+
+    Raises:
+        ImportError: raised if pyarrow is not installed.
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, path, format='parquet', partitions=16, batch_size=65536, labels=False):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError('pyarrow is required to write the identified trends, install it via '
+                              '`python -m pip install pyarrow`.')
+
+        if not isinstance(path, str):
+            raise ValueError('path must be a `str`!')
+
+        if format not in FORMATS:
+            raise ValueError('format should be a `str` contained in [parquet, ipc]!')
+
+        if not isinstance(partitions, int) or partitions < 1:
+            raise ValueError('partitions must be an `int` equal or higher than 1!')
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError('batch_size must be an `int` equal or higher than 1!')
+
+        if not isinstance(labels, bool):
+            raise ValueError('labels must be a `bool`!')
+
+        self.path = path
+        self.format = format
+        self.partitions = partitions
+        self.batch_size = batch_size
+        self.labels = labels
+
+        self._token = uuid.uuid4().hex
+
+        self._schemas = {
+            'trends': pa.schema([
+                ('series', pa.string()),
+                ('trend', pa.string()),
+                ('label', pa.string()),
+                ('from', pa.int64()),
+                ('to', pa.int64()),
+                ('from_date', pa.timestamp('ns')),
+                ('to_date', pa.timestamp('ns')),
+            ]),
+            'labels': pa.schema([
+                ('series', pa.string()),
+                ('position', pa.int64()),
+                ('date', pa.timestamp('ns')),
+                ('Up Trend', pa.string()),
+                ('Down Trend', pa.string()),
+            ]),
+        }
+
+        self._buffers = dict()
+        self._buffered = 0
+        self._writers = dict()
+
+        self.series = 0
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _bucket(self, series):
+        digest = hashlib.blake2b(series.encode('utf-8'), digest_size=8).digest()
+
+        return int.from_bytes(digest, 'little') % self.partitions
+
+    def _writer(self, dataset, bucket):
+        if (dataset, bucket) not in self._writers:
+            import pyarrow as pa
+
+            directory = os.path.join(self.path, dataset, 'bucket=' + str(bucket).zfill(len(str(self.partitions - 1))))
+
+            os.makedirs(directory, exist_ok=True)
+
+            path = os.path.join(directory, 'part-' + self._token + FORMATS[self.format])
+
+            if self.format == 'parquet':
+                import pyarrow.parquet as pq
+
+                writer = pq.ParquetWriter(path, self._schemas[dataset])
+            else:
+                writer = pa.ipc.new_file(path, self._schemas[dataset])
+
+            self._writers[(dataset, bucket)] = writer
+
+        return self._writers[(dataset, bucket)]
+
+    def _batch(self, dataset, columns):
+        import pyarrow as pa
+
+        length = len(columns['series'])
+
+        return pa.record_batch([pa.nulls(length, type=field.type) if columns[field.name] is None
+                                else pa.array(columns[field.name], type=field.type, from_pandas=True)
+                                for field in self._schemas[dataset]], schema=self._schemas[dataset])
+
+    def _write(self, dataset, bucket, batches):
+        import pyarrow as pa
+
+        writer = self._writer(dataset, bucket)
+
+        if self.format == 'parquet':
+            writer.write_table(pa.Table.from_batches(batches, schema=self._schemas[dataset]))
+        else:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    def write(self, series, trends, dates=None, length=None):
+        """
+        This function adds the introduced trends of a series to the dataset, which are written as soon as the
+        buffered rows reach the batch size; and, if labels are written too, writes the labels of every value of the
+        series right away, in batches of up to the batch size. The number of values of the series is taken from its
+        dates, unless `length` is introduced, and it is just required if labels are written.
+
+        Args:
+            series (:obj:`str`): identifier of the series.
+            trends (:obj:`dict`):
+                positions of the identified trends as returned by `identify_array_trends`, with the keys `Up Trend`
+                and/or `Down Trend`.
+            dates (:obj:`numpy.ndarray`, optional): `datetime64` array with the timestamp of every value of the series.
+            length (:obj:`int`, optional): number of values of the series.
+
+        Raises:
+            ValueError: raised if any of the introduced arguments errored.
+        """
+
+        if not isinstance(series, str):
+            raise ValueError('series must be a `str`!')
+
+        if not isinstance(trends, dict):
+            raise ValueError("trends argument needs to be a `dict` as returned by `identify_array_trends`.")
+
+        if dates is not None:
+            dates = np.asarray(dates).astype('datetime64[ns]')
+
+            length = len(dates) if length is None else length
+
+        if self.labels and (not isinstance(length, int) or length < 0):
+            raise ValueError('length must be an `int` equal or higher than 0 if labels are written!')
+
+        bucket = self._bucket(series)
+
+        if self.labels:
+            columns = {
+                'Up Trend': np.full(length, None, dtype=object),
+                'Down Trend': np.full(length, None, dtype=object),
+            }
+
+        for name, positions in trends.items():
+            positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+            labels = trend_labels(len(positions))
+
+            if len(positions) > 0:
+                if dates is None:
+                    missing = np.full(len(positions), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+                buffer = self._buffers.setdefault(bucket, {field.name: list() for field in self._schemas['trends']})
+
+                buffer['series'].append(np.full(len(positions), series, dtype=object))
+                buffer['trend'].append(np.full(len(positions), name, dtype=object))
+                buffer['label'].append(np.array(labels, dtype=object))
+                buffer['from'].append(positions[:, 0])
+                buffer['to'].append(positions[:, 1])
+                buffer['from_date'].append(missing if dates is None else dates[positions[:, 0]])
+                buffer['to_date'].append(missing if dates is None else dates[positions[:, 1]])
+
+                self._buffered += len(positions)
+
+            if self.labels:
+                for (from_trend, to_trend), label in zip(positions.tolist(), labels):
+                    columns[name][from_trend:to_trend + 1] = label
+
+        if self.labels:
+            for start in range(0, length, self.batch_size):
+                end = min(start + self.batch_size, length)
+
+                self._write('labels', bucket, [self._batch('labels', {
+                    'series': [series] * (end - start),
+                    'position': np.arange(start, end, dtype=np.int64),
+                    'date': None if dates is None else dates[start:end],
+                    'Up Trend': columns['Up Trend'][start:end],
+                    'Down Trend': columns['Down Trend'][start:end],
+                })])
+
+        self.series += 1
+
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        This function writes every buffered trend into the file of its bucket, as a single batch per bucket.
+        """
+
+        for bucket, columns in self._buffers.items():
+            batch = self._batch('trends', {name: np.concatenate(chunks) for name, chunks in columns.items()})
+
+            self._write('trends', bucket, [batch])
+
+            self.rows += batch.num_rows
+
+        self._buffers.clear()
+        self._buffered = 0
+
+    def close(self):
+        """
+        This function writes every buffered trend and closes the files of the dataset.
+        """
+
+        self.flush()
+
+        for writer in self._writers.values():
+            writer.close()
+
+        self._writers.clear()
@@ -0,0 +1,201 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trends (
+    series TEXT NOT NULL,
+    params TEXT NOT NULL,
+    version TEXT NOT NULL,
+    trend TEXT NOT NULL,
+    from_position INTEGER NOT NULL,
+    to_position INTEGER NOT NULL,
+    from_date INTEGER,
+    to_date INTEGER,
+    PRIMARY KEY (series, params, version, trend, from_position)
+);
+CREATE INDEX IF NOT EXISTS trends_from_date ON trends (series, params, version, from_date);
+CREATE INDEX IF NOT EXISTS trends_dates ON trends (from_date, to_date);
+"""
+
+
+class TrendStore(object):
+    """
+    This class persists the identified trends of several series into a local SQLite database, so that they can be
+    queried by series and date range instead of identifying them again. Trends are stored per series, identification
+    parameters and trendet version, and indexed by the date where they start, so that range queries just visit the
+    trends starting before the end of the range.
+
+    Args:
+        path (:obj:`str`, optional): path of the SQLite database, which by default is kept in memory.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, path=':memory:'):
+        if not isinstance(path, str):
+            raise ValueError('path must be a `str`!')
+
+        self.path = path
+
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """
+        This function closes the connection to the database.
+        """
+
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def _params(params):
+        return json.dumps(params or dict(), sort_keys=True)
+
+    @staticmethod
+    def _timestamp(date):
+        return None if date is None else int(pd.Timestamp(date).value)
+
+    def insert(self, series, trends, dates=None, params=None, version=None, since=None):
+        """
+        This function stores in bulk the introduced trends of a series, replacing the stored ones of the same series,
+        parameters and version which start at the same position. On incremental runs, where just the trends from a
+        certain position on are identified again, `since` removes first the stored trends starting from it, so that
+        the ones which are not identified anymore do not remain stored.
+
+        Args:
+            series (:obj:`str`): identifier of the series.
+            trends (:obj:`dict`):
+                positions of the identified trends as returned by `identify_array_trends`, with the keys `Up Trend`
+                and/or `Down Trend`.
+            dates (:obj:`numpy.ndarray`, optional): `datetime64` array with the timestamp of every value of the series.
+            params (:obj:`dict`, optional): parameters used to identify the trends, e.g. the window_size.
+            version (:obj:`str`, optional): version of the identification, which by default is the trendet one.
+            since (:obj:`int`, optional): position from where the stored trends are replaced.
+
+        Returns:
+            :obj:`int` - count:
+                The function returns the number of stored trends.
+
+        Raises:
+            ValueError: raised if any of the introduced arguments errored.
+        """
+
+        if not isinstance(series, str):
+            raise ValueError('series must be a `str`!')
+
+        if not isinstance(trends, dict):
+            raise ValueError("trends argument needs to be a `dict` as returned by `identify_array_trends`.")
+
+        if since is not None and (not isinstance(since, int) or since < 0):
+            raise ValueError('since must be an `int` equal or higher than 0!')
+
+        key = (series, self._params(params), version or __version__)
+
+        if dates is not None:
+            dates = np.asarray(dates).astype('datetime64[ns]').astype(np.int64)
+
+        rows = list()
+
+        for name, positions in trends.items():
+            for from_trend, to_trend in np.asarray(positions, dtype=np.int64).reshape(-1, 2).tolist():
+                rows.append(key + (name, from_trend, to_trend,
+                                   None if dates is None else int(dates[from_trend]),
+                                   None if dates is None else int(dates[to_trend])))
+
+        with self._connection:
+            if since is not None:
+                self._connection.execute('DELETE FROM trends WHERE series = ? AND params = ? AND version = ? AND '
+                                         'from_position >= ?', key + (since,))
+
+            self._connection.executemany('INSERT OR REPLACE INTO trends VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+        return len(rows)
+
+    def query(self, series=None, start=None, end=None, params=None, version=None, trend=None):
+        """
+        This function retrieves the stored trends which overlap the introduced date range, optionally filtered by
+        series, parameters, version and direction.
+
+        Args:
+            series (:obj:`str` or :obj:`list`, optional): identifier or identifiers of the series.
+            start (:obj:`str`, optional): date from where trends are retrieved, as anything `pandas.Timestamp` parses.
+            end (:obj:`str`, optional): date until where trends are retrieved, as anything `pandas.Timestamp` parses.
+            params (:obj:`dict`, optional): parameters used to identify the trends.
+            version (:obj:`str`, optional): version of the identification.
+            trend (:obj:`str`, optional): direction of the trends, it can either be `Up Trend` or `Down Trend`.
+
+        Returns:
+            :obj:`pandas.DataFrame`:
+                The function returns a :obj:`pandas.DataFrame` with a row per trend, containing its `series`,
+                `params`, `version`, `trend` direction, `from` and `to` positions and `from_date` and `to_date`.
+        """
+
+        conditions = list()
+        arguments = list()
+
+        if series is not None:
+            series = [series] if isinstance(series, str) else list(series)
+
+            conditions.append('series IN (' + ', '.join('?' * len(series)) + ')')
+            arguments.extend(series)
+
+        if params is not None:
+            conditions.append('params = ?')
+            arguments.append(self._params(params))
+
+        if version is not None:
+            conditions.append('version = ?')
+            arguments.append(version)
+
+        if trend is not None:
+            conditions.append('trend = ?')
+            arguments.append(trend)
+
+        if end is not None:
+            conditions.append('from_date <= ?')
+            arguments.append(self._timestamp(end))
+
+        if start is not None:
+            conditions.append('to_date >= ?')
+            arguments.append(self._timestamp(start))
+
+        sql = 'SELECT * FROM trends'
+
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+
+        sql += ' ORDER BY series, params, version, from_position'
+
+        df = pd.DataFrame(self._connection.execute(sql, arguments).fetchall(),
+                          columns=['series', 'params', 'version', 'trend', 'from', 'to', 'from_date', 'to_date'])
+
+        df['from'] = df['from'].astype(np.int64)
+        df['to'] = df['to'].astype(np.int64)
+
+        for column in ['from_date', 'to_date']:
+            df[column] = pd.to_datetime(df[column], unit='ns')
+
+        return df
+
+    def series(self):
+        """
+        This function returns the identifiers of the series with stored trends.
+        """
+
+        return [row[0] for row in self._connection.execute('SELECT DISTINCT series FROM trends ORDER BY series')]
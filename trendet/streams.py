@@ -0,0 +1,251 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+
+from .utils import EXACT_SHIFT
+
+
+DIRECTIONS = [('Up Trend', -1.), ('Down Trend', 1.)]
+
+
+class TrendStreams(object):
+    """
+    This class identifies the trends of many live streams of values at once, e.g. the ticks of thousands of symbols,
+    keeping the state of the scan of every stream and direction in :obj:`numpy.ndarray` instead of in a scanner
+    object per stream, so that every stream is advanced on every update in a single vectorized step. The scan is the
+    one of `identify_df_trends`, so every direction confirms the same trends that identifying it over the whole
+    stream does; note that, when both directions are identified, the confirmed trends are not removed when they
+    overlap an opposite trend, as just the last opposite trend of the stream decides so, see `iter_trends`.
+
+    The running sum of every segment is kept as a float along with its rounding error, just like the compiled scan
+    kernel does; and, once the float sum of a segment is not exact anymore, its exact sum is kept too, as an integer
+    in units of the smallest float just like the `fast` engine does, so that the few comparisons of a value against
+    the mean of its segment which are too close to be decided with floats are decided exactly instead, while the
+    state of every stream keeps a fixed size regardless of how long its segment lasts.
+
+    Args:
+        streams (:obj:`int` or :obj:`list`): number of streams, or the names of the streams.
+        window_size (:obj:`window`, optional): number of values from where the behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, streams, window_size=5, identify='both'):
+        if isinstance(streams, int) and not isinstance(streams, bool):
+            if streams < 1:
+                raise ValueError('streams must be an `int` equal or higher than 1!')
+
+            streams = list(range(streams))
+
+        if not isinstance(streams, list) or not streams:
+            raise ValueError("streams argument needs to be either an `int` or a non-empty `list` of names.")
+
+        if not isinstance(window_size, int) or window_size < 3:
+            raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+        if identify not in ['both', 'up', 'down']:
+            raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+        self.names = streams
+        self.window_size = window_size
+        self.identify = identify
+
+        self.directions = [(name, sign) for name, sign in DIRECTIONS
+                           if identify == 'both' or name == ('Up Trend' if identify == 'up' else 'Down Trend')]
+
+        self._signs = np.array([sign for _, sign in self.directions])[:, None]
+
+        shape = (len(self.directions), len(streams))
+
+        self.positions = np.zeros(len(streams), dtype=np.int64)
+
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.window_start = np.zeros(shape, dtype=np.int64)
+        self.from_trend = np.zeros(shape, dtype=np.int64)
+        self.min_value = np.zeros(shape, dtype=np.float64)
+        self.min_position = np.zeros(shape, dtype=np.int64)
+        self.high = np.zeros(shape, dtype=np.float64)
+        self.low = np.zeros(shape, dtype=np.float64)
+        self.magnitude = np.zeros(shape, dtype=np.float64)
+        self.exact = np.ones(shape, dtype=bool)
+
+        self._total = np.zeros(shape, dtype=object)
+        self._special = np.zeros(shape, dtype=np.float64)
+        self._specials = np.zeros(shape, dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _limits(self, values, active, mask):
+        count = np.maximum(self.count, 1)
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            limit = np.where(self.exact, self.high / count, (self.high + self.low) / count)
+            limit = np.where(active, limit, 0.)
+
+            bound = 1e-15 * np.abs(limit) + 1e-30 * self.magnitude + 1e-300
+
+            uncertain = active & ~self.exact & (
+                (np.abs(limit) <= bound) | (np.abs(values - limit) <= bound) | ~np.isfinite(limit))
+
+        if mask is not None:
+            uncertain &= mask
+
+        extend = (limit != 0.) & (limit > values)
+        close = (limit != 0.) & (limit < values)
+
+        for row, column in zip(*np.nonzero(uncertain)):
+            count = int(self.count[row, column])
+
+            # the comparison is decided exactly as the reference scan does, from the exact sum of the segment
+            if self._specials[row, column]:
+                limit = float(self._special[row, column]) / count
+            else:
+                limit = self._total[row, column] / (count << EXACT_SHIFT)
+
+            value = float(values[row, column])
+
+            extend[row, column] = bool(limit and limit > value)
+            close[row, column] = bool(limit and limit < value)
+
+        return extend, close
+
+    def update(self, values, mask=None):
+        """
+        This function advances every stream with its introduced value, or just the streams where `mask` is True, and
+        returns the streams where a trend started, which happens once its segment is longer than the window size, as
+        well as the ones where a trend was confirmed, which happens once its segment is closed, along with the
+        positions where every confirmed trend starts and ends, both included, within its stream.
+
+        Args:
+            values (:obj:`numpy.ndarray`): 1-D array with the next `int` or `float` value of every stream.
+            mask (:obj:`numpy.ndarray`, optional): 1-D `bool` array with the streams to advance, which are all of them
+                by default.
+
+        Returns:
+            :obj:`dict`:
+                The function returns a :obj:`dict` with the keys `Up Trend` and/or `Down Trend`, containing a
+                :obj:`dict` with the `int64` :obj:`numpy.ndarray` `started` and `confirmed`, with the indices of the
+                streams where a trend started and was confirmed, respectively, and `from` and `to`, with the
+                positions of every confirmed trend.
+
+        Raises:
+            ValueError: raised if any of the introduced arguments errored.
+        """
+
+        values = np.asarray(values)
+
+        if values.shape != (len(self),) or values.dtype.kind not in ['i', 'u', 'f']:
+            raise ValueError("values argument needs to be a 1-D `numpy.ndarray` of `int` or `float` values with a "
+                             "value per stream.")
+
+        if mask is not None:
+            mask = np.asarray(mask)
+
+            if mask.shape != (len(self),) or mask.dtype != bool:
+                raise ValueError("mask argument needs to be a 1-D `bool` `numpy.ndarray` with a value per stream.")
+
+        values = self._signs * values.astype(np.float64)[None, :]
+        index = np.broadcast_to(self.positions, values.shape)
+
+        active = self.count > 0
+
+        extend, close = self._limits(values, active, mask)
+
+        start = ~extend & ~close
+
+        if mask is not None:
+            extend &= mask
+            close &= mask
+            start &= mask
+
+        append = extend | start
+
+        confirmed = close & (self.count > self.window_size)
+
+        trends = (self.from_trend + self.min_position - self.window_start)[confirmed]
+        froms = self.from_trend[confirmed]
+
+        self.count[close] = 0
+        self.high[close] = 0.
+        self.low[close] = 0.
+        self.magnitude[close] = 0.
+        self.exact[close] = True
+        self._total[close] = 0
+        self._special[close] = 0.
+        self._specials[close] = False
+
+        self.from_trend[start] = index[start]
+        self.window_start[start & ~active] = index[start & ~active]
+
+        lower = append & (~active | (values < self.min_value))
+
+        self.min_value[lower] = values[lower]
+        self.min_position[lower] = index[lower]
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            total = self.high + values
+            rounded = total - self.high
+            error = (self.high - (total - rounded)) + (values - rounded)
+
+        # the exact sum of a segment is just kept once its float sum is not exact anymore, starting from the float
+        # sum up to then, which is still exact and finite
+        inexact = append & (error != 0.)
+
+        starting = inexact & self.exact
+
+        if np.any(starting):
+            self._total[starting] = _exact(self.high[starting])
+
+        tracked = append & (inexact | ~self.exact)
+
+        finite = tracked & np.isfinite(values)
+        special = tracked & ~np.isfinite(values)
+
+        if np.any(finite):
+            self._total[finite] += _exact(values[finite])
+
+        self._special[special] += values[special]
+        self._specials[special] = True
+
+        self.high[append] = total[append]
+        self.low[append] += error[append]
+        self.exact[inexact] = False
+        self.magnitude[append] += np.abs(values[append])
+        self.count[append] += 1
+
+        started = append & (self.count == self.window_size + 1)
+
+        if mask is None:
+            self.positions += 1
+        else:
+            self.positions[mask] += 1
+
+        results = dict()
+
+        for row, (name, _) in enumerate(self.directions):
+            results[name] = {
+                'started': np.flatnonzero(started[row]),
+                'confirmed': np.flatnonzero(confirmed[row]),
+                'from': froms[np.nonzero(confirmed)[0] == row],
+                'to': trends[np.nonzero(confirmed)[0] == row],
+            }
+
+        return results
+
+
+def _exact(values):
+    # finite floats as integers in units of the smallest float, the subnormal ones being shifted right, which is exact
+    # as their mantissa ends in as many zeros
+    mantissa, exponent = np.frexp(values)
+
+    mantissa = (mantissa * 2. ** 53).astype(np.int64)
+    shift = exponent.astype(np.int64) + (EXACT_SHIFT - 53)
+
+    mantissa = np.where(shift < 0, mantissa >> np.maximum(-shift, 0), mantissa)
+
+    return mantissa.astype(object) << np.maximum(shift, 0).astype(object)
@@ -0,0 +1,867 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import heapq
+import math
+import os
+import string
+import tempfile
+
+from collections import deque
+
+from statistics import mean
+
+import numpy as np
+import pandas as pd
+
+from .kernel import scan_kernel
+
+
+RANK_BY = ['length', 'move', 'percentage']
+
+ENGINES = ['fast', 'reference']
+
+CHUNK_SIZE = 65536
+
+EXACT_SHIFT = 1074
+
+
+def as_array(values):
+    """
+    This function returns the values of the introduced :obj:`numpy.ndarray`, :obj:`pandas.Series` (including the
+    ones backed by Arrow or nullable dtypes), :obj:`pyarrow.Array`, :obj:`pyarrow.ChunkedArray` or
+    :obj:`polars.Series` as a :obj:`numpy.ndarray` which shares its memory via the buffer protocol, so that they are
+    never copied. If the values are split into several chunks, a :obj:`list` with an array per chunk is returned.
+
+    Raises:
+        ValueError: raised if the values contain nulls, or if they can not be shared without copying them.
+    """
+
+    if isinstance(values, np.ndarray):
+        return values
+
+    if isinstance(values, pd.Series):
+        if isinstance(values.dtype, np.dtype):
+            return values.to_numpy()
+
+        if not hasattr(values.array, '__arrow_array__'):
+            raise ValueError("values of dtype " + str(values.dtype) + " can not be converted into Arrow.")
+
+        values = values.array.__arrow_array__()
+    elif type(values).__module__.split('.')[0] == 'polars':
+        values = values.to_arrow()
+
+    if type(values).__module__.split('.')[0] != 'pyarrow':
+        raise ValueError("values need to be either a `numpy.ndarray`, a `pandas.Series`, a `pyarrow.Array` or a "
+                         "`polars.Series`.")
+
+    chunks = values.chunks if hasattr(values, 'chunks') else [values]
+
+    arrays = list()
+
+    for chunk in chunks:
+        if chunk.null_count > 0:
+            raise ValueError("values containing nulls are not supported.")
+
+        try:
+            arrays.append(chunk.to_numpy(zero_copy_only=True))
+        except Exception as e:
+            raise ValueError(f'values of type {chunk.type} can not be shared without copying them: {e}')
+
+    if len(arrays) == 1:
+        return arrays[0]
+
+    return arrays
+
+
+def is_numeric(dtype):
+    """
+    This function returns whether the introduced dtype holds `int` or `float` values, which includes the nullable and
+    Arrow-backed ones.
+    """
+
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def column_values(series):
+    """
+    This function returns the values of the introduced :obj:`pandas.Series` as a single :obj:`numpy.ndarray`, via
+    :obj:`as_array` so that the nullable and Arrow-backed ones are supported too, concatenating its chunks if any.
+    """
+
+    values = as_array(series)
+
+    if isinstance(values, list):
+        values = np.concatenate(values)
+
+    return values
+
+
+def iter_values(values, negate=False, chunk_size=CHUNK_SIZE):
+    """
+    This function iterates over the introduced :obj:`numpy.ndarray` (including :obj:`numpy.memmap`), or over every
+    array of the introduced :obj:`list` of them, yielding its values as Python scalars, reading it in chunks of
+    `chunk_size` values so that the array is never copied nor materialized as a whole, and optionally negating them.
+    """
+
+    if isinstance(values, list):
+        for array in values:
+            for value in iter_values(array, negate=negate, chunk_size=chunk_size):
+                yield value
+
+        return
+
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+
+        if negate and chunk.dtype.kind == 'u':
+            # unsigned values wrap around when negated, so they are negated as Python `int` instead
+            for value in chunk.tolist():
+                yield -value
+
+            continue
+
+        if negate:
+            chunk = np.negative(chunk)
+
+        for value in chunk.tolist():
+            yield value
+
+
+class TrendScanner(object):
+    """
+    This class holds the state of the scan over a series of values, which is fed one value at a time, so that the
+    scan can be advanced step by step and over several series at once. The scan looks for the segments in which the
+    values keep going below the mean of the values accumulated since the segment started; and every segment longer
+    than `window_size` is considered a trend which goes from its first value until its minimum value. Note that up
+    trends are identified scanning the negated values, since the algorithm looks for decreasing segments.
+
+    This is the `reference` engine, which keeps every value of the segment and computes its mean and minimum from
+    scratch on every step, exactly as trendet always did; see :obj:`FastTrendScanner` for the `fast` one.
+    """
+
+    __slots__ = ['window_size', 'limit', 'window', 'from_trend']
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+
+        self.limit = None
+        self.window = list()
+        self.from_trend = None
+
+    def update(self, index, value):
+        """
+        This function advances the scan with the value at the introduced position, and returns the positions where
+        the trend starts and ends if the value closed a segment which is considered a trend, or None if not.
+        """
+
+        limit = self.limit
+
+        if limit and limit > value:
+            self.window.append(value)
+            self.limit = mean(self.window)
+        elif limit and limit < value:
+            window = self.window
+
+            self.limit = None
+            self.window = list()
+
+            if len(window) > self.window_size:
+                min_value = min(window)
+
+                for counter, item in enumerate(window, 0):
+                    if item == min_value:
+                        break
+
+                return self.from_trend, self.from_trend + counter
+        else:
+            self.from_trend = index
+
+            self.window.append(value)
+            self.limit = mean(self.window)
+
+        return None
+
+    def shifted(self, offset):
+        """
+        This function returns a copy of the scan whose positions are shifted by the introduced offset, so that the
+        state of the scan of a chunk can be carried over to the scan of the whole series.
+        """
+
+        scanner = TrendScanner(self.window_size)
+
+        scanner.limit = self.limit
+        scanner.window = list(self.window)
+        scanner.from_trend = None if self.from_trend is None else self.from_trend + offset
+
+        return scanner
+
+    @property
+    def empty(self):
+        """
+        This property returns whether the scan is not within a segment, which happens at its beginning and right after
+        a segment is closed, so that every empty scan behaves the same from then on.
+        """
+
+        return not self.window
+
+
+class FastTrendScanner(object):
+    """
+    This class is the `fast` engine of :obj:`TrendScanner`, which identifies the same trends while keeping just the
+    running sum, count and minimum of the segment instead of all of its values, so that every step costs O(1)
+    instead of O(segment length). The running sum is kept exact, as an integer in units of the smallest float, since
+    :obj:`statistics.mean` is exact too and a mean differing in its last bit flips the ties between a value and the
+    mean, which are common on rounded prices; non-finite values are summed apart, as :obj:`statistics.mean` does.
+    """
+
+    __slots__ = ['window_size', 'limit', 'total', 'special', 'integers', 'count', 'min_value', 'min_counter',
+                 'from_trend']
+
+    def __init__(self, window_size):
+        self.window_size = window_size
+
+        self.limit = None
+        self.total = 0
+        self.special = None
+        self.integers = True
+        self.count = 0
+        self.min_value = None
+        self.min_counter = 0
+        self.from_trend = None
+
+    def _append(self, value):
+        if self.count == 0 or value < self.min_value:
+            self.min_value = value
+            self.min_counter = self.count
+
+        self.count += 1
+
+        if isinstance(value, int):
+            self.total += value << EXACT_SHIFT
+        elif math.isfinite(value):
+            numerator, denominator = value.as_integer_ratio()
+
+            self.total += numerator << (EXACT_SHIFT + 1 - denominator.bit_length())
+            self.integers = False
+        else:
+            self.special = value if self.special is None else self.special + value
+            self.integers = False
+
+        if self.special is not None:
+            self.limit = self.special / self.count
+        elif self.integers:
+            # the mean of `int` values is an exact `int` whenever it divides evenly, as :obj:`statistics.mean` does,
+            # which a float can not hold above 2**53
+            quotient, remainder = divmod(self.total, self.count << EXACT_SHIFT)
+
+            self.limit = quotient if remainder == 0 else self.total / (self.count << EXACT_SHIFT)
+        else:
+            self.limit = self.total / (self.count << EXACT_SHIFT)
+
+    def update(self, index, value):
+        """
+        This function advances the scan with the value at the introduced position, and returns the positions where
+        the trend starts and ends if the value closed a segment which is considered a trend, or None if not.
+        """
+
+        limit = self.limit
+
+        if limit and limit > value:
+            self._append(value)
+        elif limit and limit < value:
+            count = self.count
+
+            self.limit = None
+            self.total = 0
+            self.special = None
+            self.integers = True
+            self.count = 0
+
+            if count > self.window_size:
+                return self.from_trend, self.from_trend + self.min_counter
+        else:
+            self.from_trend = index
+
+            self._append(value)
+
+        return None
+
+    def shifted(self, offset):
+        """
+        This function returns a copy of the scan whose positions are shifted by the introduced offset, so that the
+        state of the scan of a chunk can be carried over to the scan of the whole series.
+        """
+
+        scanner = FastTrendScanner(self.window_size)
+
+        scanner.limit = self.limit
+        scanner.total = self.total
+        scanner.special = self.special
+        scanner.integers = self.integers
+        scanner.count = self.count
+        scanner.min_value = self.min_value
+        scanner.min_counter = self.min_counter
+        scanner.from_trend = None if self.from_trend is None else self.from_trend + offset
+
+        return scanner
+
+    @property
+    def empty(self):
+        """
+        This property returns whether the scan is not within a segment, which happens at its beginning and right after
+        a segment is closed, so that every empty scan behaves the same from then on.
+        """
+
+        return self.count == 0
+
+
+SCANNERS = {
+    'fast': FastTrendScanner,
+    'reference': TrendScanner,
+}
+
+
+def scan_trends(values, window_size, engine='fast'):
+    """
+    This function scans the introduced values looking for the segments which are considered a trend, as explained
+    in :obj:`TrendScanner`.
+
+    Args:
+        values (:obj:`iterable`): values to scan, as Python scalars.
+        window_size (:obj:`int`): number of values from where a segment is considered a trend.
+        engine (:obj:`str`, optional): engine used to scan the values, it can either be 'fast' or 'reference'.
+
+    Returns:
+        :obj:`list` - trends:
+            The function returns a :obj:`list` of :obj:`tuple` containing the positions where every identified trend
+            starts and ends, both included.
+
+    """
+
+    scanner = SCANNERS[engine](window_size)
+
+    trends = list()
+
+    for index, value in enumerate(values, 0):
+        trend = scanner.update(index, value)
+
+        if trend is not None:
+            trends.append(trend)
+
+    return trends
+
+
+def scan_values(values, window_size, negate=False, engine='fast'):
+    """
+    This function identifies the trends of the introduced :obj:`numpy.ndarray` (or list of chunks of it) just like
+    :obj:`scan_trends` does. If the fast engine is used over a `float` array and numba is installed, the array is
+    scanned by the compiled kernel without holding the GIL; and the segments where the kernel can not compare a value
+    against the mean exactly are scanned by :obj:`FastTrendScanner` instead, until the segment is closed.
+    """
+
+    kernel = None
+
+    if engine == 'fast' and not isinstance(values, list):
+        kernel = scan_kernel(values.dtype)
+
+    if kernel is None:
+        return scan_trends(iter_values(values, negate=negate), window_size, engine)
+
+    trends = list()
+
+    length = len(values)
+    position = 0
+
+    while position < length:
+        found, stop, window_start = kernel(values, position, negate, window_size)
+
+        trends.extend(map(tuple, found.tolist()))
+
+        if stop >= length:
+            break
+
+        start = stop if window_start < 0 else window_start
+        position = length
+
+        scanner = FastTrendScanner(window_size)
+
+        for index, value in enumerate(iter_values(values[start:], negate=negate, chunk_size=1024), start):
+            trend = scanner.update(index, value)
+
+            if trend is not None:
+                trends.append(trend)
+
+            if index >= stop and scanner.empty:
+                position = index + 1
+                break
+
+    return trends
+
+
+def trend_duration(trend, dates=None):
+    """
+    This function returns the duration of the introduced trend, which is measured in days if the `dates` of the
+    scanned values are provided, or in number of positions if not.
+    """
+
+    if dates is None:
+        return trend[1] - trend[0]
+
+    delta = dates[trend[1]] - dates[trend[0]]
+
+    if isinstance(delta, np.timedelta64):
+        return int(delta // np.timedelta64(1, 'D'))
+
+    return delta.days
+
+
+def values_length(values):
+    """
+    This function returns the number of values of the introduced :obj:`numpy.ndarray`, or of the introduced
+    :obj:`list` of chunks of it.
+    """
+
+    if isinstance(values, list):
+        return sum(len(array) for array in values)
+
+    return len(values)
+
+
+def clamp_trends(trends, length):
+    """
+    This function clamps the positions where the introduced trends end to the last position of the series, which
+    needs to be done before removing the overlapping ones, so that their durations are always measured within the
+    series. The scan measures the end of a trend from the position of the last value equal to the mean of its segment
+    instead of from its first value, so the end of a trend can fall beyond the scanned values.
+    """
+
+    return [(from_trend, min(to_trend, length - 1)) for from_trend, to_trend in trends]
+
+
+def remove_overlaps(trends, others, dates=None, engine='fast'):
+    """
+    This function removes from `trends` the ones that overlap with the opposite direction `others` trends, keeping
+    just the longer trend and discarding the nested one.
+    """
+
+    if engine == 'fast':
+        # the reference loop overwrites its flag for every other trend, so just the last one decides
+        if not others:
+            return list(trends)
+
+        other = others[-1]
+        other_duration = None
+
+        kept = list()
+
+        for trend in trends:
+            if other[0] < trend[0] < other[1] or other[0] < trend[1] < other[1]:
+                # durations are just measured for overlapping trends, as the reference loop does
+                if other_duration is None:
+                    other_duration = trend_duration(other, dates)
+
+                if trend_duration(trend, dates) <= other_duration:
+                    continue
+
+            kept.append(trend)
+
+        return kept
+
+    kept = list()
+
+    for trend in trends:
+        flag = True
+
+        for other in others:
+            if other[0] < trend[0] < other[1] or other[0] < trend[1] < other[1]:
+                if trend_duration(trend, dates) > trend_duration(other, dates):
+                    flag = True
+                else:
+                    flag = False
+            else:
+                flag = True
+
+        if flag is True:
+            kept.append(trend)
+
+    return kept
+
+
+def trend_score(trend, values, rank_by):
+    """
+    This function computes the score of the introduced trend so that trends can be ranked based on either its
+    `length` (number of values), its absolute `move` or its absolute `percentage` move.
+    """
+
+    if rank_by == 'length':
+        return trend[1] - trend[0] + 1
+
+    move = abs(values[trend[1]] - values[trend[0]])
+
+    if rank_by == 'move':
+        return move
+
+    if values[trend[0]] == 0:
+        return 0.
+
+    return move / abs(values[trend[0]])
+
+
+def select_trends(trends, values=None, limit=None, rank_by=None):
+    """
+    This function selects up to `limit` trends, which are either the first ones in time order if `rank_by` is None,
+    or the strongest ones based on the `rank_by` score. The selected trends are returned in time order, and the
+    selection runs in O(n log k) via a bounded heap.
+    """
+
+    if limit is None:
+        return list(trends)
+
+    if rank_by is None:
+        return list(trends[:limit])
+
+    best = heapq.nlargest(limit, range(len(trends)), key=lambda i: trend_score(trends[i], values, rank_by))
+
+    return [trends[i] for i in sorted(best)]
+
+
+def trend_labels(count):
+    """
+    This function generates `count` labels following the spreadsheet column naming, so that after `Z` come `AA`, `AB`
+    and so on, which means that there is no limit on the amount of labels that can be generated.
+    """
+
+    letters = string.ascii_uppercase
+
+    labels = list()
+
+    for position in range(1, count + 1):
+        label = ''
+
+        while position > 0:
+            position, remainder = divmod(position - 1, len(letters))
+            label = letters[remainder] + label
+
+        labels.append(label)
+
+    return labels
+
+
+def assign_labels(df, name, trends, labels):
+    """
+    This function labels the rows of every trend in the `name` column of the introduced :obj:`pandas.DataFrame`,
+    which is created if it does not exist yet, as long as there is at least one trend to label.
+    """
+
+    pairs = list(zip(trends, labels))
+
+    if not pairs:
+        return
+
+    if name in df.columns:
+        column = df[name].to_numpy(dtype=object, copy=True)
+    else:
+        column = np.full(len(df), np.nan, dtype=object)
+
+    for (from_trend, to_trend), label in pairs:
+        column[from_trend:to_trend + 1] = label
+
+    df[name] = column
+
+
+def index_dates(index):
+    """
+    This function returns the introduced index if it contains dates, so that trend durations are measured in days,
+    or None otherwise.
+    """
+
+    if isinstance(index, pd.DatetimeIndex):
+        return index
+
+    return None
+
+
+def provider_series(data, column, name):
+    """
+    This function returns a tuple with the values and dates of the series returned by a provider, which is either a
+    :obj:`pandas.DataFrame` containing `column`, whose index holds the dates if it contains dates, or such a tuple.
+    """
+
+    if isinstance(data, pd.DataFrame):
+        if column not in data.columns:
+            raise ValueError("column " + column + " not found in series " + str(name))
+
+        dates = index_dates(data.index)
+
+        return data[column].to_numpy(), None if dates is None else dates.to_numpy()
+
+    values, dates = data
+
+    return values, dates
+
+
+def atomic_write(directory, path, write):
+    """
+    This function writes a file by calling `write` with a temporary file created in `directory`, which is then
+    atomically renamed into `path`, so that a killed process never leaves a partial file behind.
+    """
+
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            write(f)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+        raise
+
+
+def identify_positions(values, dates, window_size, identify, engine='fast'):
+    """
+    This function identifies the up and/or down trends of the introduced :obj:`numpy.ndarray`, clamping their ends via
+    :obj:`clamp_trends`, and, if both are identified, removes the ones that overlap, returning a :obj:`dict` with the
+    positions of the trends of every direction, which are named `Up Trend` and `Down Trend`.
+    """
+
+    results = dict()
+
+    length = values_length(values)
+
+    if identify in ['both', 'up']:
+        results['Up Trend'] = clamp_trends(scan_values(values, window_size, negate=True, engine=engine), length)
+
+    if identify in ['both', 'down']:
+        results['Down Trend'] = clamp_trends(scan_values(values, window_size, engine=engine), length)
+
+    if identify != 'both':
+        return results
+
+    return {
+        'Up Trend': remove_overlaps(results['Up Trend'], results['Down Trend'], dates, engine),
+        'Down Trend': remove_overlaps(results['Down Trend'], results['Up Trend'], dates, engine),
+    }
+
+
+def iter_positions(values, dates, window_size, identify, engine='fast'):
+    """
+    This function lazily identifies the same trends as `identify_positions`, yielding a tuple with the direction and
+    the positions of every trend in time order, as soon as the scan confirms it, so that the scan stops as soon as the
+    caller stops iterating. Both directions are scanned in lockstep, and a trend is yielded once no trend of any
+    direction starting before it can still be closed. If both directions are identified, a trend is confirmed once
+    it ends before every trend of the opposite direction that can still be closed, as those can not overlap it, and
+    it does not overlap the last trend of the opposite direction closed so far; while the trends overlapping it just
+    wait for another opposite trend to be closed, as just the last one decides whether a trend is removed or not.
+    """
+
+    directions = list()
+
+    if identify in ['both', 'up']:
+        directions.append(('Up Trend', True))
+
+    if identify in ['both', 'down']:
+        directions.append(('Down Trend', False))
+
+    opposite = {'Up Trend': 'Down Trend', 'Down Trend': 'Up Trend'}
+
+    scanners = {name: SCANNERS[engine](window_size) for name, _ in directions}
+    pending = {name: deque() for name, _ in directions}
+    last = {name: None for name, _ in directions}
+    # position from where every trend of every direction which can still be closed starts, at the earliest
+    bounds = {name: 0 for name, _ in directions}
+
+    def confirmed(finished):
+        while True:
+            heads = [(pending[name][0], name) for name, _ in directions if pending[name]]
+
+            if not heads:
+                return
+
+            trend, name = min(heads)
+            other = opposite[name]
+
+            if other in bounds:
+                if trend[0] >= bounds[other] or trend[1] > bounds[other]:
+                    return
+
+                if last[other] is not None and not remove_overlaps([trend], [last[other]], dates, engine):
+                    if not finished:
+                        return
+
+                    pending[name].popleft()
+                    continue
+
+            pending[name].popleft()
+
+            yield name, trend[0], trend[1]
+
+    length = values_length(values)
+
+    streams = [iter_values(values, negate=negate) for _, negate in directions]
+
+    for index, items in enumerate(zip(*streams)):
+        for (name, _), value in zip(directions, items):
+            scanner = scanners[name]
+            trend = scanner.update(index, value)
+
+            if trend is not None:
+                trend = (trend[0], min(trend[1], length - 1))
+
+                pending[name].append(trend)
+                last[name] = trend
+
+            bounds[name] = index + 1 if scanner.empty else scanner.from_trend
+
+        for result in confirmed(False):
+            yield result
+
+    for name in bounds:
+        bounds[name] = math.inf
+
+    for result in confirmed(True):
+        yield result
+
+
+def scan_chunk(values, window_size, engine='fast'):
+    """
+    This function scans the introduced chunk of a series as if the scan started at its first value, which will just
+    be right if the scan of the previous chunks ended up empty. So on, besides the trends identified within the
+    chunk, it returns the positions where the scan became empty and its final state, so that the scans of all the
+    chunks can be stitched together afterwards via :obj:`stitch_chunks`. All the positions are relative to the chunk.
+    """
+
+    scanner = SCANNERS[engine](window_size)
+
+    trends = list()
+    resets = list()
+
+    length = 0
+
+    for index, value in enumerate(values, 0):
+        trend = scanner.update(index, value)
+
+        if trend is not None:
+            trends.append(trend)
+
+        if scanner.empty:
+            resets.append(index)
+
+        length = index + 1
+
+    return {
+        'trends': trends,
+        'resets': resets,
+        'scanner': scanner,
+        'length': length,
+    }
+
+
+def stitch_chunks(chunks, window_size, fetch, engine='fast'):
+    """
+    This function stitches together the scans of consecutive chunks of a series produced by :obj:`scan_chunk`,
+    so that the result is the same as the one of a sequential scan over the whole series. The scan of every chunk is
+    just wrong until the sequential scan coming from the previous chunks becomes empty at a position where the chunk
+    scan was empty too, since both scans behave the same from then on. So on, the sequential scan is continued over
+    the values of the chunk, retrieved via `fetch(chunk)`, until that happens; which usually is within a few values.
+
+    Returns:
+        :obj:`tuple` - trends, scanner:
+            The function returns the :obj:`list` of trends of the whole series, with positions relative to its
+            beginning, and the state of the sequential scan after its last value.
+    """
+
+    scanner = SCANNERS[engine](window_size)
+
+    trends = list()
+
+    offset = 0
+
+    for number, chunk in enumerate(chunks):
+        position = -1
+        synced = scanner.empty
+
+        if not synced:
+            resets = set(chunk['resets'])
+
+            for position, value in enumerate(fetch(number), 0):
+                trend = scanner.update(offset + position, value)
+
+                if trend is not None:
+                    trends.append(trend)
+
+                if scanner.empty and position in resets:
+                    synced = True
+                    break
+
+        if synced:
+            for from_trend, to_trend in chunk['trends']:
+                if from_trend > position:
+                    trends.append((offset + from_trend, offset + to_trend))
+
+            scanner = chunk['scanner'].shifted(offset)
+
+        offset += chunk['length']
+
+    return trends, scanner
+
+
+def trend_arrays(trends, length):
+    """
+    This function returns the introduced trend positions of every direction as :obj:`numpy.ndarray` of shape (n, 2),
+    clamping the positions where trends end to the last position of the series. The scan measures the end of a trend
+    from the position of the last value equal to the mean of its segment instead of from its first value, so the end
+    of a trend can fall beyond the scanned values, which the labels of `identify_df_trends` just clip.
+    """
+
+    arrays = dict()
+
+    for name, positions in trends.items():
+        positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+
+        np.minimum(positions[:, 1], length - 1, out=positions[:, 1])
+
+        arrays[name] = positions
+
+    return arrays
+
+
+def trends_table(trends, dates=None):
+    """
+    This function returns the introduced trend positions of every direction as a :obj:`pyarrow.Table` with a row
+    per trend, containing its direction, the positions where it starts and ends and, if the `dates` of the scanned
+    values are provided, the dates where it starts and ends.
+    """
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError('pyarrow is required to return the identified trends as a `pyarrow.Table`, install it via '
+                          '`python -m pip install pyarrow`.')
+
+    names = list()
+    positions = list()
+
+    for name, trend_positions in trends.items():
+        names.extend([name] * len(trend_positions))
+        positions.extend(trend_positions)
+
+    positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+
+    columns = {
+        'trend': pa.array(names, type=pa.string()),
+        'from': pa.array(positions[:, 0]),
+        'to': pa.array(positions[:, 1]),
+    }
+
+    if dates is not None:
+        columns['from_date'] = pa.array(np.asarray(dates)[positions[:, 0]])
+        columns['to_date'] = pa.array(np.asarray(dates)[positions[:, 1]])
+
+    return pa.table(columns)
@@ -0,0 +1,79 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+import pandas as pd
+
+from .utils import identify_positions
+
+
+def check_engines(series=100, length=500, window_sizes=None, identify='both', seed=0):
+    """
+    This function checks that the fast engine identifies exactly the same trends as the reference one, over a batch of
+    randomly generated series, so that any change made to the fast engine can be validated against the original
+    implementation of the scan. Half of the series are random walks rounded to integers or to a decimal, so that
+    ties, flat stretches and means equal to zero, which are the corner cases of the scan, show up often; and a fourth
+    of them are `int` random walks above 2**53, whose means can not be held by a float. Every series is checked both
+    without dates and with a daily `pandas.DatetimeIndex`, which measures the duration of the trends when removing the
+    overlapping ones.
+
+    Args:
+        series (:obj:`int`, optional): number of random series to check.
+        length (:obj:`int`, optional): number of values of every random series.
+        window_sizes (:obj:`list`, optional): window sizes to check every series with, by default 3, 5 and 10.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        seed (:obj:`int`, optional): seed of the random generator, so that any mismatch can be reproduced.
+
+    Returns:
+        :obj:`dict` - mismatch:
+            The function returns None if both engines agree on every series, or a :obj:`dict` with the `values`,
+            `dates`, `window_size` and the trends identified by the `fast` and `reference` engines of the first
+            series where they do not.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if not isinstance(series, int) or series < 1:
+        raise ValueError('series must be an `int` equal or higher than 1!')
+
+    if not isinstance(length, int) or length < 1:
+        raise ValueError('length must be an `int` equal or higher than 1!')
+
+    if window_sizes is None:
+        window_sizes = [3, 5, 10]
+
+    if not isinstance(window_sizes, list) or not all(isinstance(size, int) and size >= 3 for size in window_sizes):
+        raise ValueError('window_sizes must be a `list` of `int` equal or higher than 3!')
+
+    if identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    generator = np.random.RandomState(seed)
+
+    index = pd.date_range('2000-01-01', periods=length, freq='D')
+
+    for number in range(series):
+        values = np.cumsum(generator.normal(size=length))
+
+        if number % 4 == 3:
+            values = 2 ** 55 + np.cumsum(generator.randint(-5, 6, size=length)).astype(np.int64)
+        elif number % 4:
+            values = np.round(values, number % 4 - 1)
+
+        for window_size in window_sizes:
+            for dates in [None, index]:
+                fast = identify_positions(values, dates, window_size, identify, 'fast')
+                reference = identify_positions(values, dates, window_size, identify, 'reference')
+
+                if fast != reference:
+                    return {
+                        'values': values,
+                        'dates': dates,
+                        'window_size': window_size,
+                        'fast': fast,
+                        'reference': reference,
+                    }
+
+    return None
@@ -0,0 +1,205 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from .utils import ENGINES, SCANNERS, as_array, iter_values, remove_overlaps, trend_arrays, clamp_trends
+
+
+def _scan_closes(values, window_size, engine):
+    scanner = SCANNERS[engine](window_size)
+
+    trends, closes = list(), list()
+    empty = np.zeros(len(values), dtype=bool)
+
+    for index, value in enumerate(values):
+        trend = scanner.update(index, value)
+
+        if trend is not None:
+            trends.append(trend)
+            closes.append(index)
+
+        empty[index] = scanner.empty
+
+    return trends, closes, empty
+
+
+def _first_segment(values, start, window_size, engine):
+    scanner = SCANNERS[engine](window_size)
+
+    for index in range(start, len(values)):
+        trend = scanner.update(index, values[index])
+
+        if scanner.empty:
+            return index, trend
+
+    return len(values), None
+
+
+def _lookback_trends(values, start, end, window_size, engine, scan, segments):
+    """
+    This function returns the trends that scanning the values from `start` until `end`, not included, identifies.
+    Since a scan is empty right after closing a segment, the scan from `start` is its first segment followed by the
+    scan from the position after it, and so on, until a position where the scan of the whole series is empty too, as
+    from there on both of them behave the same. So the trends are the ones of the chain of first segments until then,
+    which are memoized in `segments` as they are shared by the scans from close positions, followed by the ones of
+    the scan of the whole series closed from then on.
+    """
+
+    trends, closes, empty = scan
+
+    result = list()
+    position = start
+
+    while position < end and position > 0 and not empty[position - 1]:
+        if position not in segments:
+            segments[position] = _first_segment(values, position, window_size, engine)
+
+        close, trend = segments[position]
+
+        if close >= end:
+            return result
+
+        if trend is not None:
+            result.append(trend)
+
+        position = close + 1
+
+    return result + trends[bisect.bisect_left(closes, position):bisect.bisect_left(closes, end)]
+
+
+def identify_walk_forward_trends(values, lookback, dates=None, step=1, window_size=5, identify='both',
+                                 engine='fast'):
+    """
+    This function identifies the trends visible on every step of a walk-forward over the introduced values, which are
+    the ones that identifying the trends of the last `lookback` values until every step identifies, without running
+    the identification over every lookback window. The whole series is scanned just once, and the scan of every
+    lookback window is just run from its start until it is empty at a position where the scan of the whole series is
+    empty too, since from there on the trends of the lookback window are the ones of the whole series; and the
+    segments scanned until then are memoized, as consecutive lookback windows share most of them. So every step
+    costs about the length of a segment instead of the whole lookback.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values to be analysed, or any of the types supported by
+            `identify_array_trends`.
+        lookback (:obj:`int`): number of values of every lookback window.
+        dates (:obj:`numpy.ndarray`, optional): 1-D `datetime64` array with the timestamp of every value.
+        step (:obj:`int`, optional): number of values between the ends of consecutive lookback windows.
+        window_size (:obj:`window`, optional): number of days from where market behaviour is considered a trend.
+        identify (:obj:`str`, optional):
+            which trends does the user wants to be identified, it can either be 'both', 'up' or 'down'.
+        engine (:obj:`str`, optional): engine used to scan the values, it can either be 'fast' or 'reference'.
+
+    Returns:
+        :obj:`pandas.DataFrame`:
+            The function returns a :obj:`pandas.DataFrame` with a row per trend visible on every step, containing the
+            `end` position of the lookback window of the step (included), the `trend` direction and the `from` and
+            `to` positions of the trend within the whole series, both included; along with the `date` of the end of
+            the step and the `from_date` and `to_date` of the trend, if dates were specified.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    if values is None:
+        raise ValueError("values argument is mandatory and needs to be a `numpy.ndarray`.")
+
+    values = as_array(values)
+
+    if isinstance(values, list):
+        values = np.concatenate(values)
+
+    if values.ndim != 1 or values.dtype.kind not in ['i', 'u', 'f']:
+        raise ValueError("values argument needs to be a 1-D `numpy.ndarray` of `int` or `float` values.")
+
+    if dates is not None:
+        dates = np.asarray(dates).astype('datetime64[ns]')
+
+        if dates.shape != values.shape:
+            raise ValueError("dates argument needs to have the same length as values.")
+
+    if not isinstance(lookback, int) or lookback < 1:
+        raise ValueError('lookback must be an `int` equal or higher than 1!')
+
+    if not isinstance(step, int) or step < 1:
+        raise ValueError('step must be an `int` equal or higher than 1!')
+
+    if not isinstance(window_size, int):
+        raise ValueError('window_size must be an `int`')
+
+    if isinstance(window_size, int) and window_size < 3:
+        raise ValueError('window_size must be an `int` equal or higher than 3!')
+
+    if not isinstance(identify, str):
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if isinstance(identify, str) and identify not in ['both', 'up', 'down']:
+        raise ValueError('identify should be a `str` contained in [both, up, down]!')
+
+    if engine not in ENGINES:
+        raise ValueError('engine should be a `str` contained in [fast, reference]!')
+
+    directions = list()
+
+    if identify in ['both', 'up']:
+        directions.append(('Up Trend', True))
+
+    if identify in ['both', 'down']:
+        directions.append(('Down Trend', False))
+
+    series = dict()
+    scans = dict()
+    segments = dict()
+
+    for name, negate in directions:
+        series[name] = list(iter_values(values, negate=negate))
+        scans[name] = _scan_closes(series[name], window_size, engine)
+        segments[name] = dict()
+
+    ends, names, positions = list(), list(), list()
+
+    for end in range(lookback, len(values) + 1, step):
+        start = end - lookback
+
+        # trends are handled relative to the lookback window, and their ends clamped to its last position, as
+        # identifying them over its values would, so that no step reports rows it has not seen yet
+        trends = {name: clamp_trends([(from_trend - start, to_trend - start)
+                                      for from_trend, to_trend in _lookback_trends(series[name], start, end,
+                                                                                   window_size, engine, scans[name],
+                                                                                   segments[name])], lookback)
+                  for name, _ in directions}
+
+        if identify == 'both':
+            window_dates = dates[start:end] if dates is not None else None
+
+            trends = {
+                'Up Trend': remove_overlaps(trends['Up Trend'], trends['Down Trend'], window_dates, engine),
+                'Down Trend': remove_overlaps(trends['Down Trend'], trends['Up Trend'], window_dates, engine),
+            }
+
+        trends = trend_arrays(trends, lookback)
+
+        for name, trend_positions in trends.items():
+            ends.extend([end - 1] * len(trend_positions))
+            names.extend([name] * len(trend_positions))
+            positions.append(trend_positions + start)
+
+    positions = np.concatenate(positions) if positions else np.empty((0, 2), dtype=np.int64)
+
+    df = pd.DataFrame({
+        'end': np.array(ends, dtype=np.int64),
+        'trend': names,
+        'from': positions[:, 0],
+        'to': positions[:, 1],
+    })
+
+    if dates is not None:
+        df['date'] = dates[df['end'].to_numpy()]
+        df['from_date'] = dates[positions[:, 0]]
+        df['to_date'] = dates[positions[:, 1]]
+
+    return df
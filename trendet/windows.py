@@ -0,0 +1,126 @@
+# Copyright 2019-2020 Alvaro Bartolome
+# See LICENSE for details.
+
+import numpy as np
+
+from numpy.lib.stride_tricks import as_strided
+
+from .utils import as_array
+
+
+ANCHORS = ['from', 'to']
+
+PADS = ['nan', 'edge']
+
+NORMALIZATIONS = ['anchor', 'zscore']
+
+
+class TrendWindows(object):
+    """
+    This class exposes the fixed-length windows of values around every introduced trend, e.g. to build the samples
+    of a machine learning dataset, as a read-only strided view over the values where every row is the window starting
+    at a certain position, so that no window is copied until it is read. Every trend is anchored either at the
+    position where it starts or where it ends, and its window spans `before` values before the anchor, the anchor
+    itself and `after` values after it. Trends whose window does not fit within the series are discarded, unless
+    `pad` is specified, in which case the series is padded once at both ends either with NaN or with its edge values.
+
+    Windows are read by indexing the instance, e.g. `windows[:256]` returns the windows of the first 256 trends as a
+    2-D :obj:`numpy.ndarray`, optionally normalized either dividing them by their anchor value (`anchor`) or by
+    subtracting their mean and dividing them by their standard deviation (`zscore`); while `view`, `rows` and `index`
+    expose the underlying strided view, the row of the window of every kept trend within it, and the position of every
+    kept trend within the introduced ones.
+
+    Args:
+        values (:obj:`numpy.ndarray`):
+            1-D array containing the `int` or `float` values where trends were identified, or any of the types
+            supported by `identify_array_trends`.
+        trends (:obj:`numpy.ndarray`):
+            positions of the trends of a direction, as returned by `identify_array_trends`, of shape (n, 2).
+        before (:obj:`int`, optional): number of values of every window before its anchor.
+        after (:obj:`int`, optional): number of values of every window after its anchor.
+        anchor (:obj:`str`, optional): position every window is anchored at, it can either be 'from' or 'to'.
+        pad (:obj:`str`, optional): how the series is padded, it can either be None, 'nan' or 'edge'.
+        normalize (:obj:`str`, optional): how windows are normalized, it can either be None, 'anchor' or 'zscore'.
+
+    Raises:
+        ValueError: raised if any of the introduced arguments errored.
+    """
+
+    def __init__(self, values, trends, before=20, after=20, anchor='from', pad=None, normalize=None):
+        if values is None:
+            raise ValueError("values argument is mandatory and needs to be a `numpy.ndarray`.")
+
+        values = as_array(values)
+
+        if isinstance(values, list):
+            values = np.concatenate(values)
+
+        if values.ndim != 1 or values.dtype.kind not in ['i', 'u', 'f']:
+            raise ValueError("values argument needs to be a 1-D `numpy.ndarray` of `int` or `float` values.")
+
+        trends = np.asarray(trends, dtype=np.int64)
+
+        if trends.ndim != 2 or trends.shape[1] != 2:
+            raise ValueError("trends argument needs to be a `numpy.ndarray` of shape (n, 2).")
+
+        if not isinstance(before, int) or before < 0:
+            raise ValueError('before must be an `int` equal or higher than 0!')
+
+        if not isinstance(after, int) or after < 0:
+            raise ValueError('after must be an `int` equal or higher than 0!')
+
+        if anchor not in ANCHORS:
+            raise ValueError('anchor should be a `str` contained in [from, to]!')
+
+        if pad is not None and pad not in PADS:
+            raise ValueError('pad is neither None or a `str` contained in [nan, edge]!')
+
+        if normalize is not None and normalize not in NORMALIZATIONS:
+            raise ValueError('normalize is neither None or a `str` contained in [anchor, zscore]!')
+
+        self.before = before
+        self.after = after
+        self.normalize = normalize
+
+        size = before + after + 1
+
+        anchors = trends[:, ANCHORS.index(anchor)]
+
+        if pad is None:
+            series = values
+            rows = anchors - before
+            kept = (rows >= 0) & (anchors + after < len(values))
+        else:
+            if pad == 'nan':
+                series = np.pad(values.astype(np.result_type(values.dtype, np.float64)), (before, after),
+                                mode='constant', constant_values=np.nan)
+            else:
+                series = np.pad(values, (before, after), mode='edge' if len(values) else 'constant')
+
+            rows = anchors
+            kept = np.ones(len(anchors), dtype=bool)
+
+        self.index = np.flatnonzero(kept)
+        self.trends = trends[kept]
+        self.rows = rows[kept]
+
+        self.view = as_strided(series,
+                               shape=(max(len(series) - size + 1, 0), size),
+                               strides=(series.strides[0], series.strides[0]),
+                               writeable=False)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, item):
+        windows = self.view[self.rows[item]]
+
+        if self.normalize == 'anchor':
+            windows = windows / windows[..., self.before:self.before + 1]
+        elif self.normalize == 'zscore':
+            mean = np.nanmean(windows, axis=-1, keepdims=True)
+            std = np.nanstd(windows, axis=-1, keepdims=True)
+
+            windows = (windows - mean) / np.where(std > 0, std, 1)
+
+        return windows